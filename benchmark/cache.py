@@ -0,0 +1,71 @@
+"""
+Benchmark generating fresh queries, with and without the statement cache
+
+    python benchmark/cache.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import test_query
+
+
+class UNCACHED(test_query.SELECT):
+
+    CACHED = None
+
+
+def base(SELECT, size, value):
+    """
+    SELECT with size fields, size predicates, and a size IN, all with value in the args
+    """
+
+    return SELECT(
+        *[f"field{index}" for index in range(size)]
+    ).FROM(
+        "people"
+    ).WHERE(
+        stuff__in=[value] * size, **{f"things{index}__gt": value for index in range(size)}
+    ).ORDER_BY(
+        "id"
+    ).LIMIT(
+        value
+    )
+
+
+def generate(SELECT, size, count):
+    """
+    Builds then generates count queries of the same shape but different values, returning
+    the seconds spent generating and the last sql and args
+    """
+
+    queries = [base(SELECT, size, value) for value in range(count)]
+
+    start = timeit.default_timer()
+
+    for query in queries:
+        query.generate()
+
+    return timeit.default_timer() - start, query.sql, query.args
+
+
+def main(count=1000, number=5):
+
+    for size in [1, 10, 100]:
+
+        assert generate(UNCACHED, size, 2)[1:] == generate(test_query.SELECT, size, 2)[1:]
+
+        old = min(generate(UNCACHED, size, count)[0] for _ in range(number))
+        new = min(generate(test_query.SELECT, size, count)[0] for _ in range(number))
+
+        print(f"{count} queries of {size} fields and predicates: uncached {old*1000:.1f}ms cached {new*1000:.1f}ms ({old/new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
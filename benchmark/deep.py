@@ -0,0 +1,98 @@
+"""
+Benchmark stepping through criteria against recursing through them
+
+    python benchmark/deep.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import test_criterion
+import test_criteria
+
+
+class RECURSED_AND(test_criteria.AND):
+
+    def generate(self, **kwargs):
+        super().generate(**kwargs)
+
+
+class RECURSED_OR(test_criteria.OR):
+
+    def generate(self, **kwargs):
+        super().generate(**kwargs)
+
+
+class RECURSED_EQ(test_criterion.EQ):
+
+    def generate(self, **kwargs):
+        super().generate(**kwargs)
+
+
+def deep(depth, AND, OR, EQ):
+    """
+    Criteria nested depth deep, alternating AND and OR
+    """
+
+    criteria = EQ("totes", "maigoats")
+
+    for level in range(depth):
+        criteria = (AND if level % 2 else OR)(EQ("toast", level), criteria)
+
+    return criteria
+
+
+def wide(width, AND, OR, EQ):
+    """
+    Criteria a few deep, width wide
+    """
+
+    return AND(*[OR(EQ("toast", level), AND(EQ("yin", level), EQ("yang", level))) for level in range(width)])
+
+
+def generated(criteria, indent):
+    """
+    Generates and returns the sql
+    """
+
+    criteria.generate(indent=indent)
+
+    return criteria.sql
+
+
+def main(number=5):
+
+    for name, build, size in [("200 deep", deep, 200), ("2500 wide", wide, 2500)]:
+        for indent in [0, 2]:
+
+            stepped = build(size, test_criteria.AND, test_criteria.OR, test_criterion.EQ)
+            recursed = build(size, RECURSED_AND, RECURSED_OR, RECURSED_EQ)
+
+            assert generated(stepped, indent) == generated(recursed, indent)
+            assert stepped.args == recursed.args
+
+            old = min(timeit.repeat(lambda: generated(recursed, indent), number=1, repeat=number))
+            new = min(timeit.repeat(lambda: generated(stepped, indent), number=1, repeat=number))
+
+            print(f"{name} indent={indent}: recursed {old*1000:.1f}ms stepped {new*1000:.1f}ms ({old/new:.2f}x)")
+
+    stepped = deep(10000, test_criteria.AND, test_criteria.OR, test_criterion.EQ)
+    recursed = deep(10000, RECURSED_AND, RECURSED_OR, RECURSED_EQ)
+
+    try:
+        generated(recursed, 0)
+        print("10000 deep: recursed fine")
+    except RecursionError:
+        print("10000 deep: recursed RecursionError")
+
+    print(f"10000 deep: stepped {len(generated(stepped, 0))} characters")
+
+
+if __name__ == "__main__":
+    main()
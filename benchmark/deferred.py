@@ -0,0 +1,62 @@
+"""
+Benchmark deep OFFSET pages against SQLite, with and without deferring the join
+
+    python benchmark/deferred.py
+"""
+
+import os
+import sys
+import timeit
+import sqlite3
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import test_query
+
+
+def connect(rows, width):
+    """
+    In memory people with wide rows and an index to order by
+    """
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY, `name` TEXT, `bio` TEXT)")
+    connection.execute("CREATE INDEX `people_name` ON `people` (`name`)")
+    connection.executemany("INSERT INTO `people` VALUES (?,?,?)", [
+        (id, f"name{id % 997:04d}", "x" * width) for id in range(rows)
+    ])
+
+    return connection
+
+
+def fetch(connection, query):
+    """
+    Rows for a query
+    """
+
+    compiled = query.compile()
+    return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+
+def main(rows=100000, width=2000, per=20, number=5):
+
+    connection = connect(rows, width)
+
+    for offset in [1000, 10000, 90000]:
+
+        query = test_query.SELECT("*").FROM("people").ORDER_BY("name", "id").LIMIT(per, offset)
+        deferred = query.deferred()
+
+        assert fetch(connection, query) == fetch(connection, deferred)
+
+        old = min(timeit.repeat(lambda: fetch(connection, query), number=1, repeat=number))
+        new = min(timeit.repeat(lambda: fetch(connection, deferred), number=1, repeat=number))
+
+        print(f"OFFSET {offset} of {rows} {width} byte rows: direct {old*1000:.1f}ms deferred {new*1000:.1f}ms ({old/new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark generating through nested strings against writing one buffer
+
+Classes that override generate build their own string for whatever they're under
+to copy, so nested overrides it on every class in the WHERE and VALUES. Clause
+records are off for both, so every generate writes everything again.
+
+    python benchmark/generate.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import test_expression
+import test_criterion
+import test_criteria
+import test_clause
+import test_query
+
+
+class SELECT(test_query.SELECT):
+
+    CACHED = None
+
+
+class INSERT(test_query.INSERT):
+
+    CACHED = None
+
+
+class NESTED:
+
+    __slots__ = ()
+
+    def generate(self, **kwargs):
+        super().generate(**kwargs)
+
+
+class VALUE(NESTED, test_expression.VALUE):
+
+    __slots__ = ()
+
+
+class COLUMN_NAME(NESTED, test_expression.COLUMN_NAME):
+
+    __slots__ = ()
+
+
+class GT(NESTED, test_criterion.GT):
+
+    __slots__ = ()
+
+    LEFT = COLUMN_NAME
+    RIGHT = VALUE
+
+
+class OP(test_criteria.OP):
+
+    CRITERIONS = {**test_criteria.OP.CRITERIONS, "gt": GT}
+
+
+class LIST(NESTED, test_expression.LIST):
+
+    __slots__ = ()
+
+    ARG = VALUE
+
+
+class WHERE(test_clause.WHERE):
+
+    __slots__ = ()
+
+    RECORDED = False
+
+
+class VALUES(test_clause.VALUES):
+
+    __slots__ = ()
+
+    RECORDED = False
+
+
+class NESTED_WHERE(NESTED, WHERE):
+
+    __slots__ = ()
+
+    ARGS = VALUE
+    KWARGS = OP
+
+
+class NESTED_VALUES(NESTED, VALUES):
+
+    __slots__ = ()
+
+    ARGS = LIST
+
+
+def where(size, nested=False):
+    """
+    SELECT with size predicates in its WHERE
+    """
+
+    query = SELECT("*").FROM("people")
+    query.WHERE = (NESTED_WHERE if nested else WHERE)(**{f"stuff{index}__gt": index for index in range(size)})
+
+    return query
+
+
+def values(size, nested=False):
+    """
+    INSERT with size rows in its VALUES
+    """
+
+    query = INSERT("people", COLUMNS=["stuff", "things"], VALUES=NESTED_VALUES() if nested else VALUES())
+
+    for index in range(size):
+        query.VALUES(index, str(index))
+
+    return query
+
+
+def generated(query, indent):
+    """
+    Generates and returns the sql
+    """
+
+    query.generate(indent=indent)
+
+    return query.sql
+
+
+def main(number=5):
+
+    for name, build, size in [("10k predicate WHERE", where, 10000), ("5k row VALUES", values, 5000)]:
+        for indent in [0, 2]:
+
+            nested = build(size, nested=True)
+            buffered = build(size)
+
+            assert generated(nested, indent) == generated(buffered, indent)
+
+            old = min(timeit.repeat(lambda: generated(nested, indent), number=1, repeat=number))
+            new = min(timeit.repeat(lambda: generated(buffered, indent), number=1, repeat=number))
+
+            print(f"{name} indent={indent}: nested {old*1000:.1f}ms buffered {new*1000:.1f}ms ({old/new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
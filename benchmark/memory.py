@@ -0,0 +1,124 @@
+"""
+Reports memory per node, and for a large IN and VALUES
+
+    python benchmark/memory.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+]
+
+import relations_sql
+
+
+class SQL:
+
+    __slots__ = ()
+
+    QUOTE = '`'
+    STR = "'"
+    SEPARATOR = '.'
+    PLACEHOLDER = "%s"
+    JSONIFY = "JSON(%s)"
+    PATH = "%s#>>%s"
+
+
+class VALUE(SQL, relations_sql.VALUE):
+
+    __slots__ = ()
+
+
+class LIST(SQL, relations_sql.LIST):
+
+    __slots__ = ()
+
+    ARG = VALUE
+
+
+class TABLE_NAME(SQL, relations_sql.TABLE_NAME):
+
+    __slots__ = ()
+
+
+class COLUMN_NAME(SQL, relations_sql.COLUMN_NAME):
+
+    __slots__ = ()
+
+    TABLE_NAME = TABLE_NAME
+
+
+class EQ(SQL, relations_sql.EQ):
+
+    __slots__ = ()
+
+    LEFT = COLUMN_NAME
+    RIGHT = VALUE
+
+
+class IN(SQL, relations_sql.IN):
+
+    __slots__ = ()
+
+    LEFT = COLUMN_NAME
+    RIGHT = LIST
+    VALUE = VALUE
+
+
+class VALUES(SQL, relations_sql.VALUES):
+
+    __slots__ = ()
+
+    ARGS = LIST
+
+
+def measure(build, number=1):
+    """
+    Bytes still allocated after build, per number
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del kept
+
+    return (after - before) / number
+
+
+def values(rows):
+    """
+    VALUES of rows rows
+    """
+
+    clause = VALUES()
+
+    for row in range(rows):
+        clause.add(row, row, row)
+
+    return clause
+
+
+def main(number=100000):
+
+    ints = list(range(number))
+
+    for name, build, count in [
+        ("VALUE", lambda: [VALUE(value) for value in ints], number),
+        ("COLUMN_NAME", lambda: [COLUMN_NAME("stuff") for _ in ints], number),
+        ("EQ", lambda: [EQ("stuff", value) for value in ints], number),
+        ("100k IN", lambda: IN("stuff", ints), 1),
+        ("5k row VALUES", lambda: values(5000), 1)
+    ]:
+        print(f"{name}: {measure(build, count):,.0f} bytes")
+
+    print(f"dict per node: {hasattr(VALUE(1), '__dict__')}")
+
+
+if __name__ == "__main__":
+    main()
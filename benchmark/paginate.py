@@ -0,0 +1,105 @@
+"""
+Benchmark paging through a query, with and without reusing untouched clauses
+
+    python benchmark/paginate.py
+"""
+
+import os
+import sys
+import timeit
+import collections
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import test_clause
+import test_query
+
+
+class FIELDS(test_clause.FIELDS):
+
+    RECORDED = False
+
+
+class FROM(test_clause.FROM):
+
+    RECORDED = False
+
+
+class WHERE(test_clause.WHERE):
+
+    RECORDED = False
+
+
+class ORDER_BY(test_clause.ORDER_BY):
+
+    RECORDED = False
+
+
+class LIMIT(test_clause.LIMIT):
+
+    RECORDED = False
+
+
+class SELECT(test_query.SELECT):
+
+    CLAUSES = collections.OrderedDict([
+        ("OPTIONS", test_clause.OPTIONS),
+        ("FIELDS", FIELDS),
+        ("FROM", FROM),
+        ("JOIN", test_clause.JOIN),
+        ("WHERE", WHERE),
+        ("GROUP_BY", test_clause.GROUP_BY),
+        ("HAVING", test_clause.HAVING),
+        ("ORDER_BY", ORDER_BY),
+        ("LIMIT", LIMIT)
+    ])
+
+
+def base(SELECT, size):
+    """
+    SELECT with size fields, size predicates, and a size IN
+    """
+
+    return SELECT(
+        *[f"field{index}" for index in range(size)]
+    ).FROM(
+        "people"
+    ).WHERE(
+        stuff__in=list(range(size)), **{f"things{index}__gt": index for index in range(size)}
+    ).ORDER_BY(
+        "id"
+    )
+
+
+def paginate(query, pages, per):
+    """
+    Generates query for each page, returning the last sql and args
+    """
+
+    for page in range(pages):
+        query.LIMIT = query.CLAUSES["LIMIT"](per, page*per).bind(query)
+        query.generate()
+
+    return query.sql, query.args
+
+
+def main(pages=100, per=20, number=5):
+
+    for size in [10, 100]:
+
+        regenerated = base(SELECT, size)
+        recorded = base(test_query.SELECT, size)
+
+        assert paginate(regenerated, pages, per) == paginate(recorded, pages, per)
+
+        old = min(timeit.repeat(lambda: paginate(regenerated, pages, per), number=1, repeat=number))
+        new = min(timeit.repeat(lambda: paginate(recorded, pages, per), number=1, repeat=number))
+
+        print(f"{pages} pages of {size} fields and predicates: regenerated {old*1000:.1f}ms recorded {new*1000:.1f}ms ({old/new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
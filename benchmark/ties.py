@@ -0,0 +1,171 @@
+"""
+Benchmark each TIES strategy for tie criteria against SQLite
+
+    python benchmark/ties.py
+"""
+
+import os
+import sys
+import random
+import timeit
+import sqlite3
+
+sys.path[0:0] = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "test_relations_sql")
+]
+
+import relations.unittest
+
+import test_query
+import test_source
+
+STRATEGIES = ["IN", "EXISTS", "JOIN", "INTERSECT", "AUTO"]
+
+
+def connect(sisters, brothers, ties):
+    """
+    In memory sisters and brothers, each sister tied to ties random brothers
+    """
+
+    randomly = random.Random(7)
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("ATTACH DATABASE ':memory:' AS `test`")
+    connection.execute("CREATE TABLE `sis` (`id` INTEGER PRIMARY KEY, `name` TEXT)")
+    connection.execute("CREATE TABLE `test`.`bro` (`id` INTEGER PRIMARY KEY, `name` TEXT)")
+    connection.execute("CREATE TABLE `test`.`sis_bro` (`bro_id` INTEGER, `sis_id` INTEGER)")
+    connection.execute("CREATE UNIQUE INDEX `test`.`sis_bro_bro_sis` ON `sis_bro` (`bro_id`, `sis_id`)")
+    connection.execute("CREATE INDEX `test`.`sis_bro_sis` ON `sis_bro` (`sis_id`)")
+
+    connection.executemany("INSERT INTO `sis` VALUES (?,?)", [(id, f"sis{id}") for id in range(sisters)])
+    connection.executemany("INSERT INTO `test`.`bro` VALUES (?,?)", [(id, f"bro{id % 100}") for id in range(brothers)])
+    connection.executemany("INSERT INTO `test`.`sis_bro` VALUES (?,?)", [
+        (bro_id, sis_id) for sis_id in range(sisters) for bro_id in randomly.sample(range(brothers), ties)
+    ])
+
+    return connection
+
+
+def query(strategy, merge=False, stage=None, stages=None, unstages=None, attrs="JOIN", **criteria):
+    """
+    SELECT of the sisters' ids for tie criteria, DISTINCT if the strategy needs it, adding
+    what to run first to stages, and after to unstages
+    """
+
+    source = test_source.Source()
+    source.TIES = strategy
+    source.TIES_MERGE = merge
+    source.TIES_STAGE = stage
+    source.TIES_ATTRS = attrs
+
+    model = test_source.Sis.many(**criteria)
+    select = test_query.SELECT("sis.id").FROM("sis").ORDER_BY("sis.id")
+
+    source.collate_ties_query(model, select)
+
+    if model._distinct:
+        select.OPTIONS("DISTINCT")
+
+    if stages is not None:
+        stages.extend(model._stages)
+
+    if unstages is not None:
+        unstages.extend(model._unstages)
+
+    return select.compile()
+
+
+def fetch(connection, compiled, stages=None, unstages=None):
+    """
+    Rows for compiled sql, running any stages first and unstages after
+    """
+
+    for stage in stages or []:
+        connection.execute(stage.sql.replace("%s", "?"), stage.args)
+
+    rows = connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+    for unstage in unstages or []:
+        connection.execute(unstage.sql, unstage.args)
+
+    return rows
+
+
+def main(sisters=50000, brothers=1000, ties=10, number=3):
+
+    relations.unittest.MockSource("TieTest")
+
+    connection = connect(sisters, brothers, ties)
+
+    for name, criteria in [
+        ("any of 1", {"bro_id__any": [7]}),
+        ("any of 10", {"bro_id__any": list(range(10))}),
+        ("any of 200", {"bro_id__any": list(range(200))}),
+        ("all of 2", {"bro_id__all": [1, 2]}),
+        ("all of 10", {"bro_id__all": list(range(10))}),
+        ("not has 1", {"bro_id__not_has": 7})
+    ]:
+
+        compileds = {strategy: query(strategy, **criteria) for strategy in STRATEGIES}
+        expected = fetch(connection, compileds["IN"])
+
+        timings = []
+
+        for strategy in STRATEGIES:
+            assert fetch(connection, compileds[strategy]) == expected, strategy
+            took = min(timeit.repeat(lambda: fetch(connection, compileds[strategy]), number=1, repeat=number))
+            timings.append(f"{strategy} {took*1000:.1f}ms")
+
+        print(f"{name} ({len(expected)} rows): {', '.join(timings)}")
+
+    for name, criteria in [
+        ("has 1 and any of 10", {"bro_id__has": 7, "bro_id__any": list(range(10))}),
+        ("any of 200 and all of 2", {"bro_id__any": list(range(200)), "bro_id__all": [1, 2]}),
+        ("all of 2 and not any of 10", {"bro_id__all": [1, 2], "bro_id__not_any": list(range(10, 20))})
+    ]:
+
+        separate, merged = query("IN", **criteria), query("IN", merge=True, **criteria)
+        expected = fetch(connection, separate)
+
+        assert fetch(connection, merged) == expected
+
+        old = min(timeit.repeat(lambda: fetch(connection, separate), number=1, repeat=number))
+        new = min(timeit.repeat(lambda: fetch(connection, merged), number=1, repeat=number))
+
+        print(f"{name} ({len(expected)} rows): IN {old*1000:.1f}ms merged {new*1000:.1f}ms")
+
+    for count in [1000, 10000]:
+
+        stages, unstages = [], []
+        inlined = query("IN", bro_id__any=list(range(count)))
+        staged = query("IN", stage=1000, stages=stages, unstages=unstages, bro_id__any=list(range(count)))
+        expected = fetch(connection, inlined)
+
+        assert fetch(connection, staged, stages, unstages) == expected
+
+        old = min(timeit.repeat(lambda: fetch(connection, inlined), number=1, repeat=number))
+        new = min(timeit.repeat(lambda: fetch(connection, staged, stages, unstages), number=1, repeat=number))
+
+        print(f"any of {count} ({len(expected)} rows, {len(inlined.args)} args): inlined {old*1000:.1f}ms staged {new*1000:.1f}ms, staging included")
+
+    for name, criteria in [
+        ("bro name", {"bro__name": "bro7"}),
+        ("bro name and id", {"bro__name__in": ["bro7", "bro8"], "bro__id__gt": 500})
+    ]:
+
+        compileds = {attrs: query("IN", attrs=attrs, **criteria) for attrs in ["JOIN", "IN", "EXISTS"]}
+        expected = fetch(connection, compileds["JOIN"])
+
+        timings = []
+
+        for attrs, compiled in compileds.items():
+            assert fetch(connection, compiled) == expected, attrs
+            took = min(timeit.repeat(lambda: fetch(connection, compiled), number=1, repeat=number))
+            timings.append(f"{attrs} {took*1000:.1f}ms")
+
+        print(f"{name} ({len(expected)} rows): {', '.join(timings)}")
+
+
+if __name__ == "__main__":
+    main()
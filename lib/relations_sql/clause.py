@@ -18,10 +18,17 @@ class CLAUSE(relations_sql.CRITERIA):
     PARENTHESES = False
     NAME = None
 
-    query = None
+    RECORDED = True # reuse what was written while nothing under's been touched, falsy to turn it off
+
+    __slots__ = {
+        "query": "query this is bound to, if any",
+        "record": "shape, args, and sql by indent as of a stamp",
+        "dirty": "STAMPS from the last touch of this or anything under it"
+    }
 
     def __init__(self, *args, **kwargs):
 
+        self.parent = None
         self.expressions = []
         self(*args, **kwargs)
 
@@ -36,6 +43,8 @@ class CLAUSE(relations_sql.CRITERIA):
         Add expressiona
         """
 
+        self.touch()
+
         if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
             kwargs = args[0]
             args = []
@@ -47,7 +56,7 @@ class CLAUSE(relations_sql.CRITERIA):
                 expression = kwargs[key]
             else:
                 expression = self.KWARG(kwargs[key])
-            self.expressions.append(self.KWARGS(key, expression))
+            self.expressions.append(self.adopt(self.KWARGS(key, expression)))
 
         return self.query or self
 
@@ -57,23 +66,92 @@ class CLAUSE(relations_sql.CRITERIA):
         """
 
         self.query = query
+        query.adopt(self)
+
         return self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def recorded(self):
         """
-        Concats the values
+        The record, started over if anything under's been touched since, None if not RECORDED
+
+        Only add, set, and call touch, so change anything else by replacing it
         """
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        if not self.RECORDED:
+            return None
+
+        if self.record is None or max(self.dirty, relations_sql.SHARED.dirty) > self.record["stamp"]:
+            self.record = {"stamp": next(relations_sql.STAMPS)}
+
+        return self.record
+
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
+
+        if not self:
+            return []
+
+        record = self.recorded() if not kwargs else None
+        key = (indent, count, pad)
+
+        if record is not None and key in record:
+            args.extend(record["args"])
+            return [record[key]]
+
+        one = pad * indent
+        next = pad * ((count + 1) * indent)
+        line = "\n" if indent else ' '
+
+        start = len(sql)
+        begin = len(args)
+
+        def empty(sql):
+
+            if not any(sql[start+1:]):
+                del sql[start:]
 
-        if self.sql:
+            if record is not None:
+                record["args"] = args[begin:]
+                record[key] = "".join(sql[start:])
 
-            one = pad * indent
-            current = pad * (count * indent)
-            next = current + one
-            line = "\n" if indent else ' '
+        return [
+            f"{self.NAME}{line}{next}" if self.NAME else one,
+            *super().steps(sql, args, indent=indent, count=count, pad=pad, **kwargs),
+            empty
+        ]
 
-            self.sql = f"{self.NAME}{line}{next}{self.sql}" if self.NAME else f"{one}{self.sql}"
+    def outline(self, args):
+
+        record = self.recorded()
+
+        if record is None:
+            return (yield from super().outline(args))
+
+        if "shape" in record:
+            args.extend(record["args"])
+            return record["shape"]
+
+        begin = len(args)
+        shape = yield from super().outline(args)
+
+        record["args"] = args[begin:]
+        record["shape"] = shape
+
+        return shape
+
+    def normalize(self):
+        """
+        Normal of the shape, kept with the record till something under's touched
+        """
+
+        record = self.recorded()
+
+        if record is None:
+            return super().normalize()
+
+        if "normal" not in record:
+            record["normal"] = self.normals(self.shape([]))
+
+        return record["normal"]
 
 
 class ARGS(CLAUSE):
@@ -81,6 +159,8 @@ class ARGS(CLAUSE):
     Clauses that never have keyword arguments
     """
 
+    __slots__ = ()
+
     def __call__(self, *args):
         """
         Shorthand for add
@@ -93,6 +173,8 @@ class OPTIONS(ARGS):
     Beginning of a SELECT query
     """
 
+    __slots__ = ()
+
     ARGS = relations_sql.SQL
 
     DELIMITTER = ' '
@@ -103,6 +185,8 @@ class FIELDS(CLAUSE):
     FIELDS part of SELECT query
     """
 
+    __slots__ = ()
+
     ARGS = relations_sql.COLUMN_NAME
     KWARG = relations_sql.COLUMN_NAME
     KWARGS = relations_sql.AS
@@ -113,6 +197,8 @@ class FROM(CLAUSE):
     Clause for FROM
     """
 
+    __slots__ = ()
+
     NAME = "FROM"
 
     ARGS = relations_sql.TABLE_NAME
@@ -120,11 +206,123 @@ class FROM(CLAUSE):
     KWARGS = relations_sql.AS
 
 
+class ON(CLAUSE):
+    """
+    Clause for ON, after the kind of join and the table being joined if any
+    """
+
+    NAME = "ON"
+
+    ARGS = relations_sql.VALUE
+    KWARGS = relations_sql.OP
+
+    DELIMITTER = " AND "
+
+    RECORDED = False # the JOIN it's in records it all
+
+    __slots__ = {
+        "kind": "kind of join, JOIN or LEFT JOIN, if any",
+        "table": "table being joined, if any"
+    }
+
+    def __len__(self):
+
+        return len(self.expressions) + (self.table is not None)
+
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
+
+        if self.table is None:
+            return super().steps(sql, args, indent=indent, count=count, pad=pad, **kwargs)
+
+        steps = [f"{self.kind} "] if self.kind else []
+        steps.append((self.table, {"indent": indent, "count": count, "pad": pad, **kwargs}))
+
+        if self.expressions:
+            steps.append("\n" + pad * (count * indent) if indent else " ")
+            steps.extend(super().steps(sql, args, indent=indent, count=count, pad=pad, **kwargs))
+
+        return steps
+
+    def outline(self, args):
+
+        table = yield self.table
+
+        return (self.__class__, self.kind, *table, *(yield self.expressions))
+
+
+class JOIN(CLAUSE):
+    """
+    Clause for all the joins, JOIN's and LEFT JOIN's alike, each table with its ON, in the
+    order they're added
+    """
+
+    __slots__ = ()
+
+    ARGS = relations_sql.TABLE_NAME
+    KWARG = relations_sql.TABLE_NAME
+    KWARGS = relations_sql.AS
+
+    ON = ON
+
+    KIND = "JOIN"
+    LEFT = "LEFT JOIN"
+
+    DELIMITTER = " "
+
+    def add(self, *args, **kwargs):
+        """
+        Add a table, a {label: table} to AS it, and what's after is for its ON, as KIND
+        """
+        return self.join(self.KIND, *args, **kwargs)
+
+    def left(self, *args, **kwargs):
+        """
+        Add like add, but as a LEFT JOIN
+        """
+        return self.join(self.LEFT, *args, **kwargs)
+
+    def join(self, kind, *args, **kwargs):
+        """
+        Add a table, a {label: table} to AS it, and what's after is for its ON, as kind
+        """
+
+        self.touch()
+
+        if not args:
+            if kwargs:
+                raise relations_sql.SQLError(self, f"need a table to join on {kwargs}")
+            return self.query or self
+
+        table, *criteria = args
+
+        if isinstance(table, dict):
+
+            if len(table) != 1:
+                raise relations_sql.SQLError(self, f"need single pair in {table}")
+
+            label, table = list(table.items())[0]
+            table = self.KWARGS(label, table if isinstance(table, relations_sql.SQL) else self.KWARG(table))
+
+        elif not isinstance(table, relations_sql.SQL):
+
+            table = self.ARGS(table)
+
+        on = self.ON(*criteria, **kwargs)
+        on.kind = kind
+        on.table = on.adopt(table)
+
+        self.expressions.append(self.adopt(on))
+
+        return self.query or self
+
+
 class WHERE(CLAUSE):
     """
     Clause for WHERE
     """
 
+    __slots__ = ()
+
     NAME = "WHERE"
 
     ARGS = relations_sql.VALUE
@@ -138,6 +336,8 @@ class GROUP_BY(ARGS):
     Clasuse for GROUP BY
     """
 
+    __slots__ = ()
+
     NAME = "GROUP BY"
 
     ARGS = relations_sql.COLUMN_NAME
@@ -148,6 +348,8 @@ class HAVING(CLAUSE):
     Clause for HAVING
     """
 
+    __slots__ = ()
+
     NAME = "HAVING"
 
     ARGS = relations_sql.VALUE
@@ -161,17 +363,64 @@ class ORDER_BY(CLAUSE):
     Clause for the bORDER
     """
 
+    __slots__ = ()
+
     NAME = "ORDER BY"
 
     ARGS = relations_sql.ORDER
     KWARGS = relations_sql.ORDER
 
+    AND = relations_sql.AND
+    OR = relations_sql.OR
+    EQ = relations_sql.EQ
+    GT = relations_sql.GT
+    LT = relations_sql.LT
+    LIST = relations_sql.LIST
+    ROW = relations_sql.ROW # row values when every column goes the same way, None to always expand
+
+    def seek(self, values, expand=False):
+        """
+        Criterion for the rows after values, the last row's, for keyset pagination
+
+        Compares as row values if every column goes the same way, else expands
+        to (a>x) OR (a=x AND b>y), going < for DESC
+        """
+
+        if not self.expressions:
+            raise relations_sql.SQLError(self, "need ORDER BY to seek")
+
+        if len(values) != len(self.expressions):
+            raise relations_sql.SQLError(self, f"need {len(self.expressions)} values to seek, not {len(values)}")
+
+        if any(value is None for value in values):
+            raise relations_sql.SQLError(self, f"cannot seek past NULL in {values}")
+
+        columns = [expression.expression for expression in self.expressions]
+        afters = [self.LT if expression.order == relations_sql.DESC else self.GT for expression in self.expressions]
+
+        if len(columns) == 1:
+            return afters[0](columns[0], values[0])
+
+        if self.ROW is not None and not expand and len(set(afters)) == 1:
+            return afters[0](self.ROW(columns), self.LIST(values))
+
+        ors = []
+
+        for index, column in enumerate(columns):
+            ands = [self.EQ(columns[before], values[before]) for before in range(index)]
+            ands.append(afters[index](column, values[index]))
+            ors.append(self.AND(ands) if index else ands[0])
+
+        return self.OR(ors)
+
 
 class LIMIT(CLAUSE):
     """
     Base class for clauses
     """
 
+    __slots__ = ()
+
     NAME = "LIMIT"
 
     ARGS = relations_sql.VALUE
@@ -183,6 +432,8 @@ class LIMIT(CLAUSE):
         Add total and offset
         """
 
+        self.touch()
+
         if len(args) == 1 and isinstance(args[0], dict) and total is None and offset is None:
 
             total = args[0].get("total")
@@ -208,19 +459,16 @@ class LIMIT(CLAUSE):
             raise relations_sql.SQLError(self, "LIMIT offset must be int")
 
         if total is not None:
-            self.expressions.append(self.ARGS(total))
+            self.expressions.append(self.adopt(self.ARGS(total)))
 
         if offset is not None:
-            self.expressions.append(self.ARGS(offset))
+            self.expressions.append(self.adopt(self.ARGS(offset)))
 
         return self.query or self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
-        """
-        Concats the values
-        """
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
 
-        super().generate(**kwargs)
+        return super().steps(sql, args, **kwargs)
 
 
 class SET(CLAUSE):
@@ -228,6 +476,8 @@ class SET(CLAUSE):
     relations_sql.CRITERIA for SET
     """
 
+    __slots__ = ()
+
     NAME = "SET"
 
     KWARGS = relations_sql.ASSIGN
@@ -244,7 +494,9 @@ class VALUES(CLAUSE):
 
     DELIMITTER = None
 
-    columns = None
+    __slots__ = {
+        "columns": "columns for the values"
+    }
 
     def column(self, columns):
         """
@@ -270,6 +522,8 @@ class VALUES(CLAUSE):
         Add a row to VALUES
         """
 
+        self.touch()
+
         if kwargs.get("COLUMNS"):
             self.column(kwargs.pop("COLUMNS"))
 
@@ -295,24 +549,17 @@ class VALUES(CLAUSE):
             if self.columns is not None and len(args) != len(self.columns):
                 raise relations_sql.SQLError(self, f"wrong values {args} for columns {self.columns}")
 
-            self.expressions.append(self.ARGS(args))
+            self.expressions.append(self.adopt(self.ARGS(args)))
 
         return self.query or self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
-        """
-        Concats the values
-        """
-
-        sql = []
-        self.args = []
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
 
         count += 1
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ' '
         left, right = (f"(\n{next}", f"\n{current})") if indent else ('(', ')')
-        delimitter = f"{right},{left}"
+        kwargs = {"indent": indent, "count": count+1, "pad": pad, **kwargs}
 
-        self.express(self.expressions, sql, indent=indent, count=count+1, pad=pad, **kwargs)
-        self.sql = f"{self.NAME}{line}{current}{left}{delimitter.join(sql)}{right}"
+        return [f"{self.NAME}{line}{current}{left}", *self.delimit(self.expressions, f"{right},{left}", kwargs), right]
@@ -15,10 +15,11 @@ class CRITERIA(relations_sql.LIST):
     DELIMITTER = None
     PARENTHESES = True
 
-    expressions = None
+    __slots__ = ()
 
     def __init__(self, *args):
 
+        self.parent = None
         self.expressions = []
         self(*args)
 
@@ -33,6 +34,8 @@ class CRITERIA(relations_sql.LIST):
         Add expressiona
         """
 
+        self.touch()
+
         expressions = []
 
         if len(args) == 1 and isinstance(args[0], list):
@@ -41,30 +44,43 @@ class CRITERIA(relations_sql.LIST):
             expressions.extend(args)
 
         for expression in expressions:
-            if isinstance(expression, relations_sql.SQL):
-                self.expressions.append(expression)
-            else:
-                self.expressions.append(self.ARGS(expression))
+            if not isinstance(expression, relations_sql.SQL):
+                expression = self.ARGS(expression)
+            self.expressions.append(self.adopt(expression))
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
-        """
-        Concats the values
-        """
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
+
+        if not self:
+            return []
 
         current = pad * (count * indent)
         next = current + (indent * pad)
 
         line = "\n" if indent else ''
         delimitter = f"{self.DELIMITTER.rstrip()}{line}{next}" if indent else self.DELIMITTER
-        left, right = (f"({line}{next}", f"{line}{current})") if self.PARENTHESES else ('', '')
 
-        sql = []
-        self.sql = ""
-        self.args = []
+        steps = self.delimit(self.expressions, delimitter, {"indent": indent, "count": count+1, "pad": ' ', **kwargs})
+
+        if self.PARENTHESES:
+            steps = [f"({line}{next}", *steps, f"{line}{current})"]
+
+        return steps
+
+    @classmethod
+    def normal(cls, shape, normals=None):
+        """
+        Sorted if AND'd or OR'd, as the order doesn't change what matches
+        """
+
+        if normals is None:
+            normals = [cls.normals(each) for each in shape[1:]]
 
-        if self:
-            self.express(self.expressions, sql, indent=indent, count=count+1, pad=' ', **kwargs)
-            self.sql = f"{left}{delimitter.join(sql)}{right}"
+        normals = cls.items((shape[0], *normals))
+
+        if cls.DELIMITTER is not None and cls.DELIMITTER.strip() in ("AND", "OR"):
+            normals.sort(key=relations_sql.NORMAL.of)
+
+        return (cls.__name__, *normals)
 
 
 class AND(CRITERIA):
@@ -72,6 +88,8 @@ class AND(CRITERIA):
     CLAUSE for AND
     """
 
+    __slots__ = ()
+
     ARGS = relations_sql.VALUE
 
     DELIMITTER = ' AND '
@@ -82,30 +100,45 @@ class OR(CRITERIA):
     CLAUSE for OR
     """
 
+    __slots__ = ()
+
     ARGS = relations_sql.VALUE
 
     DELIMITTER = ' OR '
 
 
+class ROW(CRITERIA):
+    """
+    Row value, for comparing columns all at once
+    """
+
+    __slots__ = ()
+
+    ARGS = relations_sql.COLUMN_NAME
+
+    DELIMITTER = ','
+
+
 class SETS(relations_sql.CRITERION):
     """
     For comparing sets with each other
     """
 
-    expression = None
+    __slots__ = {
+        "expression": "the criteria comparing the sets"
+    }
 
     def __len__(self):
 
         return 1
 
-    def generate(self, **kwargs):
-        """
-        Concats the values
-        """
+    def steps(self, sql, args, **kwargs):
 
-        self.expression.generate(**kwargs)
-        self.sql = self.expression.sql
-        self.args = self.expression.args
+        return [(self.expression, kwargs)]
+
+    def outline(self, args):
+
+        return (self.__class__, *(yield self.expression))
 
     @staticmethod
     def ensure(value):
@@ -124,6 +157,8 @@ class HAS(SETS):
     For if the left has all the members of right
     """
 
+    __slots__ = ()
+
     CONTAINS = relations_sql.CONTAINS
 
     def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
@@ -133,7 +168,8 @@ class HAS(SETS):
 
         right = self.ensure(right)
 
-        self.expression = self.CONTAINS(left, right, invert=invert, jsonify=jsonify, extracted=extracted)
+        self.parent = None
+        self.expression = self.adopt(self.CONTAINS(left, right, invert=invert, jsonify=jsonify, extracted=extracted))
 
 
 class ANY(SETS):
@@ -141,6 +177,8 @@ class ANY(SETS):
     For if the left has any the members of right
     """
 
+    __slots__ = ()
+
     OR = OR
     LEFT = relations_sql.COLUMN_NAME
     VALUE = relations_sql.VALUE
@@ -156,7 +194,8 @@ class ANY(SETS):
 
         right = self.ensure(right)
 
-        self.expression = self.OR([self.CONTAINS(left, self.VALUE([value])) for value in right])
+        self.parent = None
+        self.expression = self.adopt(self.OR([self.CONTAINS(left, self.VALUE([value])) for value in right]))
 
 
 class ALL(SETS):
@@ -164,6 +203,8 @@ class ALL(SETS):
     For if the left and right have the same members
     """
 
+    __slots__ = ()
+
     AND = AND
     CONTAINS = relations_sql.CONTAINS
     LENGTHS = relations_sql.LENGTHS
@@ -172,10 +213,11 @@ class ALL(SETS):
 
         right = self.ensure(right)
 
-        self.expression = self.AND(
+        self.parent = None
+        self.expression = self.adopt(self.AND(
             self.CONTAINS(left, right, invert=invert, jsonify=jsonify, extracted=extracted, **kwargs),
             self.LENGTHS(left, right, invert=invert, jsonify=jsonify, extracted=extracted, **kwargs)
-        )
+        ))
 
 
 class OP:
@@ -185,6 +227,8 @@ class OP:
 
     NOT = relations_sql.NOT
 
+    ALONE = ["exists"] # operands that go without a field when given a subquery, like exists=SELECT(...) or not_exists=
+
     CRITERIONS = {
         'null': relations_sql.NULL,
         'eq': relations_sql.EQ,
@@ -196,6 +240,7 @@ class OP:
         'start': relations_sql.START,
         'end': relations_sql.END,
         'in': relations_sql.IN,
+        'exists': relations_sql.EXISTS,
         'has': HAS,
         'any': ANY,
         'all': ALL
@@ -218,6 +263,11 @@ class OP:
 
         operand = "eq"
 
+        alone = field.split('not_', 1)[-1] if field.startswith('not_') else field
+
+        if alone in cls.ALONE and cls.subquery(value):
+            return cls.CRITERIONS[alone](value, invert=field.startswith('not_') or invert)
+
         if '__' in field:
             pieces = field.rsplit('__', 1)
             if pieces[-1] in cls.CRITERIONS:
@@ -233,3 +283,12 @@ class OP:
             return cls.NOT(cls.CRITERIONS[operand](field, value, jsonify=jsonify, extracted=extracted))
 
         return cls.CRITERIONS[operand](field, value, invert=invert, jsonify=jsonify, extracted=extracted)
+
+    @staticmethod
+    def subquery(value):
+        """
+        Whether the value's a query or raw SQL, so exists=True is still just a field named exists
+        """
+        return isinstance(value, relations_sql.QUERY) or (
+            isinstance(value, relations_sql.SQL) and not isinstance(value, relations_sql.EXPRESSION)
+        )
@@ -21,8 +21,11 @@ class CRITERION(relations_sql.EXPRESSION):
     REVERSE = False
     CAST = None
 
-    left = None    # Left expression
-    right = None   # Right expression
+    __slots__ = {
+        "left": "Left expression",
+        "right": "Right expression",
+        "invert": "Whether to use INVERT"
+    }
 
     def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
 
@@ -41,42 +44,43 @@ class CRITERION(relations_sql.EXPRESSION):
         if not isinstance(right, relations_sql.SQL):
             right = self.RIGHT(right, jsonify=jsonify)
 
-        self.left = left
-        self.right = right
+        self.parent = None
+        self.left = self.adopt(left)
+        self.right = self.adopt(right)
         self.invert = invert
 
     def __len__(self):
 
         return len(self.left) + len(self.right)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
-        """
-        Generate the left and right with operand in between
-        """
-
-        sql = []
-        self.args = []
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
         left, right = ('', '') if isinstance(self.right, self.RIGHT) and not self.PARENTHESES else (f"({line}{next}", f"{line}{current})")
 
+        operand = self.pieces(self.INVERT if self.invert else self.OPERAND, 2)
+        cast = self.pieces(self.CAST, 1) if self.CAST else ('', '')
+        kwargs = {"indent": indent, "count": count+1, **kwargs}
+
+        sides = [[cast[0], (self.left, kwargs), cast[1]], [cast[0], left, (self.right, kwargs), right, cast[1]]]
+
         if self.REVERSE:
-            self.express(self.right, sql, indent=indent, count=count+1, **kwargs)
-            self.express(self.left, sql, indent=indent, count=count+1, **kwargs)
-            sql[0] = f"{left}{sql[0]}{right}"
-        else:
-            self.express(self.left, sql, indent=indent, count=count+1, **kwargs)
-            self.express(self.right, sql, indent=indent, count=count+1, **kwargs)
-            sql[1] = f"{left}{sql[1]}{right}"
+            sides.reverse()
+
+        return [operand[0], *sides[0], operand[1], *sides[1], operand[2]]
 
-        operand = self.INVERT if self.invert else self.OPERAND
+    def outline(self, args):
 
-        if self.CAST:
-            sql = [self.CAST % expression for expression in sql]
+        if self.REVERSE:
+            right = yield self.right
+            left = yield self.left
+        else:
+            left = yield self.left
+            right = yield self.right
 
-        self.sql = operand % tuple(sql)
+        return (self.__class__, self.invert, *left, *right)
 
 
 class NULL(CRITERION):
@@ -84,6 +88,8 @@ class NULL(CRITERION):
     For IS NULL and IS NOT NULL
     """
 
+    __slots__ = ()
+
     OPERAND = "%s IS NULL"
     INVERT = "%s IS NOT NULL"
     JSONNULL = None
@@ -92,19 +98,19 @@ class NULL(CRITERION):
 
         return 1
 
-    def generate(self, **kwargs):
-
-        sql = []
-        self.args = []
+    def steps(self, sql, args, **kwargs):
 
-        self.express(self.left, sql, **kwargs)
+        operand = self.pieces(self.INVERT if bool(self.right.value) == bool(self.invert) else self.OPERAND, 1)
+        jsonnull = ('', '')
 
         if isinstance(self.left, relations_sql.COLUMN_NAME) and self.left.path and self.JSONNULL is not None:
-            sql[0] = self.JSONNULL % sql[0]
+            jsonnull = self.pieces(self.JSONNULL, 1)
 
-        OPERAND = self.INVERT if bool(self.right.value) == bool(self.invert) else self.OPERAND
+        return [operand[0], jsonnull[0], (self.left, kwargs), jsonnull[1], operand[1]]
 
-        self.sql = OPERAND % tuple(sql)
+    def outline(self, args):
+
+        return (self.__class__, bool(self.right.value) == bool(self.invert), *(yield self.left))
 
 
 class EQ(CRITERION):
@@ -112,6 +118,8 @@ class EQ(CRITERION):
     For =
     """
 
+    __slots__ = ()
+
     OPERAND = "%s=%s"
     INVERT = "%s!=%s"
 
@@ -121,6 +129,8 @@ class GT(CRITERION):
     For >
     """
 
+    __slots__ = ()
+
     OPERAND = "%s>%s"
 
 
@@ -129,6 +139,8 @@ class GTE(CRITERION):
     For >=
     """
 
+    __slots__ = ()
+
     OPERAND = "%s>=%s"
 
 
@@ -137,6 +149,8 @@ class LT(CRITERION):
     For <
     """
 
+    __slots__ = ()
+
     OPERAND = "%s<%s"
 
 
@@ -145,6 +159,8 @@ class LTE(CRITERION):
     For <=
     """
 
+    __slots__ = ()
+
     OPERAND = "%s<=%s"
 
 
@@ -153,6 +169,8 @@ class LIKE(CRITERION):
     For fuzzy matching
     """
 
+    __slots__ = ()
+
     OPERAND = "%s LIKE %s"
     INVERT = "%s NOT LIKE %s"
 
@@ -175,6 +193,8 @@ class START(LIKE):
     For fuzzy matching end of string
     """
 
+    __slots__ = ()
+
     BEFORE = ""
 
 
@@ -183,6 +203,8 @@ class END(LIKE):
     For fuzzy matching end of string
     """
 
+    __slots__ = ()
+
     AFTER = ""
 
 
@@ -191,6 +213,8 @@ class IN(CRITERION):
     For IN
     """
 
+    __slots__ = ()
+
     RIGHT = relations_sql.LIST
     VALUE = relations_sql.VALUE
 
@@ -199,27 +223,227 @@ class IN(CRITERION):
     OPERAND = "%s IN %s"
     INVERT = "%s NOT IN %s"
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    STRATEGY = None     # for lists THRESHOLD or longer, "CHUNKS", "ARRAY", or "VALUES", None for one IN regardless
+    THRESHOLD = 1000    # length of list that switches to STRATEGY
+    CHUNK = 1000        # most values in each IN for CHUNKS, OR'd together, AND'd if NOT IN
+    ARRAY = None        # (OPERAND, INVERT) comparing to one array placeholder, like ("%s=ANY(%s)", "%s!=ALL(%s)")
+    ROWS = "VALUES %s"  # row source for VALUES
+    ROW = "(%s)"        # each row in ROWS
+
+    BUCKETS = None      # BUCKETS for the list, so the placeholders only come in so many lengths
+
+    def __init__(self, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+
+        if self.BUCKETS and isinstance(self.right, relations_sql.LIST):
+            self.right.buckets = self.BUCKETS
+
+    def strategy(self):
         """
-        Generate the left and right with operand in between
+        STRATEGY if the list's long enough and all plain values, else None
         """
 
-        if self.right:
+        if (
+            self.STRATEGY is None or
+            not isinstance(self.right, relations_sql.LIST) or
+            len(self.right.expressions) < self.THRESHOLD
+        ):
+            return None
 
-            super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        for expression in self.right.expressions:
+            if not isinstance(expression, relations_sql.VALUE) or expression.jsonify:
+                return None
 
-        else:
+        if self.STRATEGY == "ARRAY" and self.ARRAY is None:
+            raise relations_sql.SQLError(self, "no ARRAY strategy without ARRAY operands")
+
+        if self.STRATEGY not in ["CHUNKS", "ARRAY", "VALUES"]:
+            raise relations_sql.SQLError(self, f"unknown STRATEGY {self.STRATEGY}")
+
+        return self.STRATEGY
+
+    def chunks(self):
+        """
+        The list split into lists of CHUNK values, each padded out to its bucket, but never past CHUNK
+        """
+
+        expressions = self.right.expressions
+        buckets = self.right.buckets or self.right.BUCKETS
+
+        chunks = []
+
+        for index in range(0, len(expressions), self.CHUNK):
+
+            chunk = expressions[index:index + self.CHUNK]
+
+            if buckets:
+                chunk += chunk[-1:] * (min(self.right.bucket(len(chunk), buckets), self.CHUNK) - len(chunk))
+
+            chunks.append(self.right.__class__(chunk))
+
+        return chunks
+
+    def array(self):
+        """
+        The list as one array placeholder
+        """
+
+        return relations_sql.SQL(self.PLACEHOLDER, [[expression.argument() for expression in self.right.expressions]])
+
+    def rows(self):
+        """
+        The list as ROWS with its args, padded out to its bucket
+        """
+
+        expressions = self.right.padded()
+        row = self.ROW % self.PLACEHOLDER
+
+        return relations_sql.SQL(
+            self.ROWS % ",".join([row] * len(expressions)),
+            [expression.argument() for expression in expressions]
+        )
+
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
+
+        if not self.right:
+            return [(self.VALUE(self.invert), {"indent": indent, "count": count, "pad": pad, **kwargs})]
+
+        strategy = self.strategy()
+
+        if strategy is None:
+            return super().steps(sql, args, indent=indent, count=count, pad=pad, **kwargs)
+
+        current = pad * (count * indent)
+        line = "\n" if indent else ''
+        left, right = (f"({line}{current}{indent * pad}", f"{line}{current})")
+        kwargs = {"indent": indent, "count": count+1, **kwargs}
+
+        if strategy == "ARRAY":
+            operand = self.pieces(self.ARRAY[1] if self.invert else self.ARRAY[0], 2)
+            return [operand[0], (self.left, kwargs), operand[1], (self.array(), kwargs), operand[2]]
+
+        operand = self.pieces(self.INVERT if self.invert else self.OPERAND, 2)
+
+        if strategy == "VALUES":
+            return [operand[0], (self.left, kwargs), operand[1], left, (self.rows(), kwargs), right, operand[2]]
+
+        steps = []
+
+        for chunk in self.chunks():
+            steps.extend([
+                " AND " if self.invert else " OR ",
+                operand[0], (self.left, kwargs), operand[1], left, (chunk, kwargs), right, operand[2]
+            ])
+
+        return ["(", *steps[1:], ")"]
+
+    def outline(self, args):
+
+        if not self.right:
+            return (self.__class__, *(yield self.VALUE(self.invert)))
+
+        strategy = self.strategy()
+
+        if strategy is None:
+            return (yield from super().outline(args))
+
+        if strategy == "ARRAY":
+            left = yield self.left
+            args.extend(self.array().args)
+            return (self.__class__, self.invert, strategy, *left)
+
+        if strategy == "VALUES":
+            left = yield self.left
+            rows = self.rows()
+            args.extend(rows.args)
+            return (self.__class__, self.invert, strategy, len(rows.args), *left)
+
+        chunks = []
+
+        for chunk in self.chunks():
+            chunks.append((*(yield self.left), *(yield chunk)))
+
+        return (self.__class__, self.invert, strategy, *chunks)
+
+    @classmethod
+    def normal(cls, shape, normals=None):
+        """
+        Without the number of VALUES, and runs of CHUNKS collapsed to one, so IN's of every
+        length normalize the same whatever the STRATEGY
+        """
+
+        if normals is None:
+            normals = [cls.normals(each) for each in shape[1:]]
+
+        if len(shape) > 2 and shape[2] == "VALUES":
+            return (cls.__name__, *normals[:2], *normals[3:])
+
+        if len(shape) > 2 and shape[2] == "CHUNKS" and len(set(map(relations_sql.NORMAL.of, normals[2:]))) == 1:
+            return (cls.__name__, *normals[:2], "*", normals[2])
+
+        return (cls.__name__, *normals)
+
+
+class EXISTS(CRITERION):
+    """
+    For EXISTS and NOT EXISTS, a subquery, correlated or not, with nothing on the left
+    """
+
+    __slots__ = ()
+
+    OPERAND = "EXISTS %s"
+    INVERT = "NOT EXISTS %s"
+
+    def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
+
+        if kwargs:
+            left, right = list(kwargs.items())[0]
+
+        if right is None:
+            left, right = None, left
+
+        if left is not None:
+            raise relations_sql.SQLError(self, f"nothing goes on the left of EXISTS, not {left}")
+
+        if not isinstance(right, relations_sql.SQL):
+            raise relations_sql.SQLError(self, f"need a subquery not {right}")
+
+        self.parent = None
+        self.left = None
+        self.right = self.adopt(right)
+        self.invert = invert
+
+    def __len__(self):
+
+        return len(self.right)
+
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
+
+        current = pad * (count * indent)
+        next = current + (indent * pad)
+        line = "\n" if indent else ''
+
+        operand = self.pieces(self.INVERT if self.invert else self.OPERAND, 1)
+
+        return [
+            f"{operand[0]}({line}{next}",
+            (self.right, {"indent": indent, "count": count+1, "pad": pad, **kwargs}),
+            f"{line}{current}){operand[1]}"
+        ]
+
+    def outline(self, args):
+
+        return (self.__class__, self.invert, *(yield self.right))
 
-            value = self.VALUE(self.invert)
-            value.generate(indent=indent, count=count, pad=pad, **kwargs)
-            self.sql = value.sql
-            self.args = value.args
 
 class CONTAINS(CRITERION):
     """
     Wether one set contains another
     """
 
+    __slots__ = ()
+
     LEFT = relations_sql.COLUMN_NAME
     RIGHT = relations_sql.VALUE
 
@@ -231,6 +455,8 @@ class LENGTHS(CRITERION):
     Wether one set contains another
     """
 
+    __slots__ = ()
+
     LEFT = relations_sql.COLUMN_NAME
     RIGHT = relations_sql.VALUE
 
@@ -7,12 +7,17 @@ import collections.abc
 
 import relations_sql
 
+MARK = "\0"
+TEMPLATES = {}
+
 
 class EXPRESSION(relations_sql.SQL):
     """
     Base class for expressions
     """
 
+    __slots__ = ()
+
     def __len__(self):
 
         return 1
@@ -29,16 +34,47 @@ class EXPRESSION(relations_sql.SQL):
 
     def express(self, expression, sql, **kwargs):
         """
-        Add this expression's generation to our own
+        Add this expression's sql to our own, args too unless they're already in the args
+        passed down to every level, written rather than generated, so it's left as it was
         """
 
         if isinstance(expression, collections.abc.Iterable):
             for each in expression:
                 self.express(each, sql, **kwargs)
         elif expression:
-            expression.generate(**kwargs)
-            sql.append(expression.sql)
-            self.args.extend(expression.args)
+            pieces = []
+            args = kwargs.pop("args", [])
+            expression.write(pieces, args, **kwargs)
+            sql.append("".join(pieces))
+            if args is not self.args:
+                self.args.extend(args)
+
+    @staticmethod
+    def delimit(expressions, delimitter, kwargs):
+        """
+        Steps for whatever express would, with delimitters in between
+        """
+
+        steps = []
+
+        for expression in expressions:
+            if expression:
+                if steps:
+                    steps.append(delimitter)
+                steps.append((expression, kwargs))
+
+        return steps
+
+    @staticmethod
+    def pieces(template, count):
+        """
+        Split a % template into what goes around its count values
+        """
+
+        if (template, count) not in TEMPLATES:
+            TEMPLATES[(template, count)] = (template % ((MARK,) * count)).split(MARK)
+
+        return TEMPLATES[(template, count)]
 
 
 class VALUE(EXPRESSION):
@@ -46,22 +82,53 @@ class VALUE(EXPRESSION):
     Class for storing a value that will need to be escaped
     """
 
-    value = None # the value
-    jsonify = None # whether this value will be used with JSON
+    __slots__ = {
+        "value": "the value",
+        "jsonify": "whether this value will be used with JSON"
+    }
 
     def __init__(self, value, jsonify=False):
 
+        self.parent = None
         self.value = value
-        self.jsonify = jsonify or (value is not None and not isinstance(value, (bool, int, float, str)))
+        self.jsonify = jsonify or self.jsonifies(value)
+
+    @staticmethod
+    def jsonifies(value):
+        """
+        Whether a value can only be passed as JSON
+        """
 
-    def generate(self, **kwargs):
+        return value is not None and not isinstance(value, (bool, int, float, str))
 
-        if self.jsonify:
-            self.sql = self.JSONIFY % self.PLACEHOLDER
-            self.args = [json.dumps(sorted(list(self.value)) if isinstance(self.value, set) else self.value)]
-        else:
-            self.sql = self.PLACEHOLDER
-            self.args = [self.value]
+    @staticmethod
+    def arg(value, jsonify):
+        """
+        The arg for a value's placeholder, without needing a VALUE
+        """
+
+        if jsonify:
+            return json.dumps(sorted(list(value)) if isinstance(value, set) else value)
+
+        return value
+
+    def argument(self):
+        """
+        The arg for the placeholder
+        """
+
+        return self.arg(self.value, self.jsonify)
+
+    def steps(self, sql, args, **kwargs):
+
+        sql.append(self.JSONIFY % self.PLACEHOLDER if self.jsonify else self.PLACEHOLDER)
+        args.append(self.argument())
+
+    def outline(self, args):
+
+        args.append(self.argument())
+
+        return (self.__class__, self.jsonify)
 
 
 class NOT(EXPRESSION):
@@ -71,18 +138,22 @@ class NOT(EXPRESSION):
 
     VALUE = VALUE
 
-    expression = None
+    __slots__ = {
+        "expression": "what's being negated"
+    }
 
     def __init__(self, expression):
 
-        self.expression = expression if isinstance(expression, relations_sql.SQL) else self.VALUE(expression)
+        self.parent = None
+        self.expression = self.adopt(expression if isinstance(expression, relations_sql.SQL) else self.VALUE(expression))
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
-        self.args = []
+        return ["NOT ", (self.expression, {"indent": indent, "count": count+1, "pad": pad, **kwargs})]
 
-        self.express(self.expression, [], indent=indent, count=count+1, pad=pad, **kwargs)
-        self.sql = f"NOT {self.expression.sql}"
+    def outline(self, args):
+
+        return (self.__class__, *(yield self.expression))
 
 
 class LIST(EXPRESSION):
@@ -92,35 +163,108 @@ class LIST(EXPRESSION):
 
     ARG = VALUE
 
-    expressions = None
+    BUCKETS = None # pad to the next of these lengths repeating the last value, "POWERS" for powers of two
+
+    __slots__ = {
+        "expressions": "the values",
+        "jsonify": "whether the values will be used with JSON",
+        "buckets": "BUCKETS for just this list"
+    }
 
     def __init__(self, expressions, jsonify=False):
 
+        self.parent = None
         self.expressions = []
         self.jsonify = jsonify
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
-                self.expressions.append(expression)
+                self.expressions.append(self.adopt(expression))
             else:
-                self.expressions.append(self.ARG(expression, jsonify=jsonify))
+                expression = self.ARG(expression, jsonify=jsonify)
+                expression.parent = self
+                self.expressions.append(expression)
 
     def __len__(self):
 
         return len(self.expressions)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    @staticmethod
+    def bucket(length, buckets):
+        """
+        The bucket a length falls in, the next power of two for POWERS, else the next
+        of the buckets, or the next multiple of the last one past them all
+        """
 
-        sql = []
-        self.args = []
+        if not buckets or not length:
+            return length
+
+        if buckets == "POWERS":
+            return 1 << (length - 1).bit_length()
+
+        for bucket in buckets:
+            if bucket >= length:
+                return bucket
+
+        return -(-length // buckets[-1]) * buckets[-1]
+
+    def padded(self):
+        """
+        The expressions padded out to their bucket by repeating the last
+        """
+
+        buckets = self.buckets or self.BUCKETS
+
+        if not buckets:
+            return self.expressions
+
+        return self.expressions + self.expressions[-1:] * (self.bucket(len(self.expressions), buckets) - len(self.expressions))
+
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
         current = pad * (count * indent)
         line = "\n" if indent else ''
 
-        for expression in self.expressions:
-            self.express(expression, sql, indent=indent, count=count+1, pad=pad, **kwargs)
+        return self.delimit(self.padded(), f",{line}{current}", {"indent": indent, "count": count+1, "pad": pad, **kwargs})
+
+    def outline(self, args):
+        """
+        Runs of the same shape, like most IN and VALUES, are kept as a count
+        """
+
+        shapes = yield self.padded()
 
-        self.sql = f",{line}{current}".join(sql)
+        if len(shapes) > 1 and shapes.count(shapes[0]) == len(shapes):
+            return (self.__class__, len(shapes), shapes[0])
+
+        return (self.__class__, *shapes)
+
+    @staticmethod
+    def items(shape):
+        """
+        Shapes of each item in a shape, runs and all
+        """
+
+        if len(shape) == 3 and isinstance(shape[1], int):
+            return [shape[2]] * shape[1]
+
+        return list(shape[1:])
+
+    @classmethod
+    def normal(cls, shape, normals=None):
+        """
+        Runs collapse to one, so IN's of every length normalize the same
+        """
+
+        if normals is None:
+            normals = [cls.normals(each) for each in shape[1:]]
+
+        normals = cls.items((shape[0], *normals))
+
+        if len(set(map(relations_sql.NORMAL.of, normals))) == 1:
+            return (cls.__name__, "*", normals[0])
+
+        return (cls.__name__, *normals)
 
 
 class NAME(EXPRESSION):
@@ -128,10 +272,13 @@ class NAME(EXPRESSION):
     For anything that needs to be quote
     """
 
-    name = None
+    __slots__ = {
+        "name": "the name to quote"
+    }
 
     def __init__(self, name):
 
+        self.parent = None
         self(name)
 
     def __len__(self):
@@ -146,12 +293,17 @@ class NAME(EXPRESSION):
         """
         Set the NAME explicitly
         """
+
+        self.touch()
         self.name = name
 
-    def generate(self, **kwargs):
+    def steps(self, sql, args, **kwargs):
+
+        sql.append(self.quote(self.name))
 
-        self.sql = self.quote(self.name)
-        self.args = []
+    def outline(self, args):
+
+        return (self.__class__, self.name)
 
 
 class SCHEMA_NAME(NAME):
@@ -159,6 +311,8 @@ class SCHEMA_NAME(NAME):
     For schemas
     """
 
+    __slots__ = ()
+
 
 class TABLE_NAME(SCHEMA_NAME):
     """
@@ -167,12 +321,14 @@ class TABLE_NAME(SCHEMA_NAME):
 
     SCHEMA_NAME = SCHEMA_NAME
 
-    schema = None
-
-    prefix = None
+    __slots__ = {
+        "schema": "schema of the table",
+        "prefix": "what goes before the table, like FROM"
+    }
 
     def __init__(self, name, schema=None, prefix=None):
 
+        self.parent = None
         self(name, schema, prefix)
 
     def __call__(self, name, schema=None, prefix=None):
@@ -181,36 +337,39 @@ class TABLE_NAME(SCHEMA_NAME):
 
     def set(self, name, schema=None, prefix=None):
 
+        self.touch()
+
         pieces = name.split(self.SEPARATOR)
 
         self.name = pieces.pop(-1)
 
         if schema is not None:
-            self.schema = schema if isinstance(schema, relations_sql.SQL) else self.SCHEMA_NAME(schema)
+            self.schema = self.adopt(schema if isinstance(schema, relations_sql.SQL) else self.SCHEMA_NAME(schema))
         elif len(pieces) == 1:
-            self.schema = self.SCHEMA_NAME(pieces[0])
+            self.schema = self.adopt(self.SCHEMA_NAME(pieces[0]))
 
         self.prefix = prefix
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
-        sql = []
-        self.args = []
+        if self.prefix is not None:
+
+            one = pad * indent
+            current = pad * (count * indent)
+            next = current + (indent * pad)
+            line = "\n" if indent else ' '
+
+            sql.append(f"{self.prefix}{line}{next}" if self.prefix else one)
 
         if self.schema:
-            self.express(self.schema, sql, **kwargs)
+            self.schema.write(sql, args, **kwargs)
+            sql.append(self.SEPARATOR)
 
         sql.append(self.quote(self.name))
 
-        self.sql = self.SEPARATOR.join(sql)
-
-        one = pad * indent
-        current = pad * (count * indent)
-        next = current + (indent * pad)
-        line = "\n" if indent else ' '
+    def outline(self, args):
 
-        if self.prefix is not None:
-            self.sql = f"{self.prefix}{line}{next}{self.sql}" if self.prefix else f"{one}{self.sql}"
+        return (self.__class__, self.name, self.prefix, *(yield self.schema))
 
 
 class COLUMN_NAME(TABLE_NAME):
@@ -220,13 +379,15 @@ class COLUMN_NAME(TABLE_NAME):
 
     TABLE_NAME = TABLE_NAME
 
-    table = None  # name of the table
-
-    jsonify = None # whether we need to cast this column as JSON
-    path = None     # path to use in the JSON
+    __slots__ = {
+        "table": "name of the table",
+        "jsonify": "whether we need to cast this column as JSON",
+        "path": "path to use in the JSON"
+    }
 
     def __init__(self, name, table=None, schema=None, jsonify=False, extracted=False):
 
+        self.parent = None
         self(name, table, schema, jsonify, extracted)
 
     def __call__(self, name, table=None, schema=None, jsonify=False, extracted=False):
@@ -235,6 +396,8 @@ class COLUMN_NAME(TABLE_NAME):
 
     def set(self, name, table=None, schema=None, jsonify=False, extracted=False):
 
+        self.touch()
+
         pieces = name.split(self.SEPARATOR)
 
         self.name, self.path = self.split(pieces.pop(-1)) if not extracted else (pieces.pop(-1), [])
@@ -250,7 +413,7 @@ class COLUMN_NAME(TABLE_NAME):
                 schema = piece
 
         if table is not None:
-            self.table = table if isinstance(table, relations_sql.SQL) else self.TABLE_NAME(table, schema)
+            self.table = self.adopt(table if isinstance(table, relations_sql.SQL) else self.TABLE_NAME(table, schema))
 
         self.jsonify = jsonify
 
@@ -268,23 +431,54 @@ class COLUMN_NAME(TABLE_NAME):
 
         return self.SEPARATOR.join(sql)
 
-    def generate(self, **kwargs):
+    def steps(self, sql, args, **kwargs):
+
+        path = self.pieces(self.PATH, 2) if self.path else None
+        jsonify = self.pieces(self.JSONIFY, 1) if self.jsonify else None
+
+        if jsonify:
+            sql.append(jsonify[0])
+
+        if path:
+            sql.append(path[0])
+
+        if self.table:
+            self.table.write(sql, args, **kwargs)
+            sql.append(self.SEPARATOR)
+
+        sql.append('*' if self.name == '*' else self.quote(self.name))
+
+        if path:
+            sql.extend([path[1], self.PLACEHOLDER, path[2]])
+            args.append(self.walk(self.path))
+
+        if jsonify:
+            sql.append(jsonify[1])
+
+    def outline(self, args):
         """
-        Generates the sql and args
+        Plain, rather than a generator, without a table
         """
 
-        self.args = []
+        if self.table:
+            return self.tabled(args)
+
+        if self.path:
+            args.append(self.walk(self.path))
+
+        return (self.__class__, self.name, bool(self.path), self.jsonify)
 
-        column = self.column(**kwargs)
+    def tabled(self, args):
+        """
+        Outline with the table
+        """
+
+        shape = (self.__class__, self.name, bool(self.path), self.jsonify, *(yield self.table))
 
         if self.path:
-            self.sql = self.PATH % (column, self.PLACEHOLDER)
-            self.args.append(self.walk(self.path))
-        else:
-            self.sql = column
+            args.append(self.walk(self.path))
 
-        if self.jsonify:
-            self.sql = self.JSONIFY % self.sql
+        return shape
 
 
 class NAMES(LIST):
@@ -292,17 +486,22 @@ class NAMES(LIST):
     Holds a list of column names only, with table
     """
 
+    __slots__ = ()
+
     ARG = NAME
 
     def __init__(self, expressions):
 
+        self.parent = None
         self.expressions = []
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
-                self.expressions.append(expression)
+                self.expressions.append(self.adopt(expression))
             else:
-                self.expressions.append(self.ARG(expression))
+                expression = self.ARG(expression)
+                expression.parent = self
+                self.expressions.append(expression)
 
 
 class COLUMN_NAMES(NAMES):
@@ -310,22 +509,24 @@ class COLUMN_NAMES(NAMES):
     Holds a list of column names only, with table
     """
 
+    __slots__ = ()
+
     ARG = COLUMN_NAME
 
     def __init__(self, expressions):
 
+        self.parent = None
         self.expressions = []
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
-                self.expressions.append(expression)
+                self.expressions.append(self.adopt(expression))
             else:
-                self.expressions.append(self.ARG(expression, extracted=True))
+                expression = self.ARG(expression, extracted=True)
+                expression.parent = self
+                self.expressions.append(expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
-        """
-        Generates the sql and args
-        """
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
         count += 1
         current = pad * (count * indent)
@@ -333,14 +534,9 @@ class COLUMN_NAMES(NAMES):
 
         one = pad * indent
         line = "\n" if indent else ''
-        delimitter = f",{line}{next}"
-        left, right = (f"{one}({line}{next}", f"{line}{current})")
-
-        sql = []
-        self.args = []
+        kwargs = {"indent": indent, "count": count+1, "pad": ' ', **kwargs}
 
-        self.express(self.expressions, sql, indent=indent, count=count+1, pad=' ', **kwargs)
-        self.sql = f"{left}{delimitter.join(sql)}{right}"
+        return [f"{one}({line}{next}", *self.delimit(self.expressions, f",{line}{next}", kwargs), f"{line}{current})"]
 
 
 class AS(EXPRESSION):
@@ -350,35 +546,37 @@ class AS(EXPRESSION):
 
     NAME = NAME
 
-    label = None
-    expression = None
+    __slots__ = {
+        "label": "what it's called",
+        "expression": "what's being called that"
+    }
 
     def __init__(self, label, expression):
 
-        self.label = label if isinstance(label, relations_sql.SQL) else self.NAME(label)
-        self.expression = expression
+        self.parent = None
+        self.label = self.adopt(label if isinstance(label, relations_sql.SQL) else self.NAME(label))
+        self.expression = self.adopt(expression)
 
     def __len__(self):
 
         return len(self.label) + len(self.expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
-        """
-        Generates the sql and args
-        """
-
-        sql = []
-        self.args = []
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
         left, right = (f"({line}{next}", f"{line}{current})") if isinstance(self.expression, relations_sql.SELECT) else ('', '')
 
-        self.express(self.expression, sql, indent=indent, count=count+1, **kwargs)
-        self.express(self.label, sql, indent=indent, count=count+1, **kwargs)
+        kwargs = {"indent": indent, "count": count+1, **kwargs}
+
+        return [left, (self.expression, kwargs), f"{right} AS ", (self.label, kwargs)]
+
+    def outline(self, args):
 
-        self.sql = f"{left}{sql[0]}{right} AS {sql[1]}"
+        expression = yield self.expression
+
+        return (self.__class__, *expression, *(yield self.label))
 
 
 ASC = -1
@@ -391,8 +589,10 @@ class ORDER(EXPRESSION):
 
     EXPRESSION = COLUMN_NAME
 
-    expression = None
-    order = None
+    __slots__ = {
+        "expression": "what's being ordered",
+        "order": "ASC, DESC, or None"
+    }
 
     ORDER = {
         ASC: "ASC",
@@ -409,24 +609,30 @@ class ORDER(EXPRESSION):
         if order is not None and order not in self.ORDER:
             raise relations_sql.SQLError(self, f"order {order} must be in {list(self.ORDER.keys())}")
 
-        self.expression = expression if isinstance(expression, relations_sql.SQL) else self.EXPRESSION(expression)
+        self.parent = None
+        self.expression = self.adopt(expression if isinstance(expression, relations_sql.SQL) else self.EXPRESSION(expression))
         self.order = order
 
     def __len__(self):
 
         return len(self.expression)
 
-    def generate(self, **kwargs):
+    def steps(self, sql, args, **kwargs):
 
-        sql = []
-        self.args = []
+        if not self.expression:
+            return None
+
+        if self.ORDER.get(self.order) is None:
+            return [(self.expression, kwargs)]
+
+        return [(self.expression, kwargs), f" {self.ORDER[self.order]}"]
+
+    def outline(self, args):
 
-        if self.expression:
-            self.express(self.expression, sql, **kwargs)
-            if self.ORDER.get(self.order) is not None:
-                sql.append(self.ORDER[self.order])
+        if not self.expression:
+            return (self.__class__,)
 
-        self.sql = " ".join(sql)
+        return (self.__class__, *(yield self.expression), self.ORDER.get(self.order))
 
 
 class ASSIGN(EXPRESSION):
@@ -437,32 +643,34 @@ class ASSIGN(EXPRESSION):
     COLUMN_NAME = COLUMN_NAME
     EXPRESSION = VALUE
 
-    column = None
-    expression = None
+    __slots__ = {
+        "column": "what's being set",
+        "expression": "what it's being set to"
+    }
 
     def __init__(self, column, expression):
 
-        self.column = column if isinstance(column, relations_sql.SQL) else self.COLUMN_NAME(column)
-        self.expression = expression if isinstance(expression, relations_sql.SQL) else self.EXPRESSION(expression)
+        self.parent = None
+        self.column = self.adopt(column if isinstance(column, relations_sql.SQL) else self.COLUMN_NAME(column))
+        self.expression = self.adopt(expression if isinstance(expression, relations_sql.SQL) else self.EXPRESSION(expression))
 
     def __len__(self):
 
         return len(self.column) + len(self.expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
-        """
-        Generates the sql and args
-        """
-
-        sql = []
-        self.args = []
+    def steps(self, sql, args, indent=0, count=0, pad=' ', **kwargs):
 
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
         left, right = (f"({line}{next}", f"{line}{current})") if isinstance(self.expression, relations_sql.SELECT) else ('', '')
 
-        self.express(self.column, sql, indent=indent, count=count+1, **kwargs)
-        self.express(self.expression, sql, indent=indent, count=count+1, **kwargs)
+        kwargs = {"indent": indent, "count": count+1, **kwargs}
+
+        return [(self.column, kwargs), f"={left}", (self.expression, kwargs), right]
+
+    def outline(self, args):
+
+        column = yield self.column
 
-        self.sql = f"{sql[0]}={left}{sql[1]}{right}"
+        return (self.__class__, *column, *(yield self.expression))
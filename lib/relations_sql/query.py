@@ -2,10 +2,78 @@
 Module for all Relations SQL Queries.
 """
 
+import copy
+import threading
+import itertools
 import collections
+import collections.abc
 
 import relations_sql
 
+LOCK = threading.Lock()
+
+
+class CACHE:
+    """
+    LRU of generated sql, keyed by the shape of the query
+    """
+
+    size = None         # most statements to keep
+    hits = None         # times sql was found
+    misses = None       # times sql had to be generated
+    statements = None   # sql by shape, oldest first
+
+    def __init__(self, size):
+
+        self.size = size
+        self.lock = threading.Lock()
+        self.clear()
+
+    def __len__(self):
+
+        return len(self.statements)
+
+    def clear(self):
+        """
+        Empty out the statements and counters
+        """
+
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.statements = collections.OrderedDict()
+
+    def get(self, key):
+        """
+        Get the sql for a shape, if any
+        """
+
+        with self.lock:
+
+            sql = self.statements.get(key)
+
+            if sql is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.statements.move_to_end(key)
+
+        return sql
+
+    def set(self, key, sql):
+        """
+        Store the sql for a shape, dropping the least recently used
+        """
+
+        with self.lock:
+
+            self.statements[key] = sql
+            self.statements.move_to_end(key)
+
+            while len(self.statements) > self.size:
+                self.statements.popitem(last=False)
+
+
 class QUERY(relations_sql.EXPRESSION):
     """
     Base query
@@ -14,6 +82,13 @@ class QUERY(relations_sql.EXPRESSION):
     NAME = None
     PREFIX = None
 
+    CACHED = 256 # size of the statement cache, falsy to turn it off
+
+    MAX_ARGS = None         # most args in a statement, None for no limit
+    MAX_SQL_BYTES = None    # most bytes of sql and args in a statement, None for no limit
+
+    SPLITS = ["GROUP_BY", "HAVING", "ORDER_BY", "LIMIT"] # clauses that'd mean something else split up
+
     CLAUSES = None
     clauses = None
 
@@ -21,6 +96,7 @@ class QUERY(relations_sql.EXPRESSION):
 
     def __init__(self, **kwargs):
 
+        self.parent = None
         self.check(kwargs)
 
         for clause in self.CLAUSES:
@@ -40,15 +116,16 @@ class QUERY(relations_sql.EXPRESSION):
         if name in self.CLAUSES:
             return self.clauses[name]
 
-        raise AttributeError(f"'{self}' object has no attribute '{name}'")
+        return super().__getattr__(name)
 
     def __setattr__(self, name, value):
         """
-        Used to gset clauses directly
+        Used to gset clauses directly, touching this so whatever it's under writes it again
         """
 
         if name in self.CLAUSES:
-            self.clauses[name] = value
+            self.clauses[name] = self.adopt(value)
+            self.touch()
         else:
             object.__setattr__(self, name, value)
 
@@ -75,6 +152,22 @@ class QUERY(relations_sql.EXPRESSION):
         self.model = model
         return self
 
+    @classmethod
+    def cache(cls):
+        """
+        Statement cache for this class, None if it's off
+        """
+
+        if not cls.CACHED or cls.generate is not relations_sql.SQL.generate:
+            return None
+
+        if "statements" not in cls.__dict__:
+            with LOCK:
+                if "statements" not in cls.__dict__:
+                    cls.statements = CACHE(cls.CACHED)
+
+        return cls.statements
+
     def create(self, *args, **kwargs):
         """
         Create on the Model
@@ -117,20 +210,168 @@ class QUERY(relations_sql.EXPRESSION):
 
         self.model.delete(query=self, *args, **kwargs)
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    @staticmethod
+    def estimate(arg):
+        """
+        Rough bytes an arg takes up
+        """
+
+        if isinstance(arg, (str, bytes)):
+            return len(arg)
+
+        return 8
+
+    def fits(self, compiled):
+        """
+        Whether compiled sql and args are within MAX_ARGS and MAX_SQL_BYTES
+        """
+
+        if self.MAX_ARGS is not None and len(compiled.args) > self.MAX_ARGS:
+            return False
+
+        if self.MAX_SQL_BYTES is not None:
+            if len(compiled.sql.encode()) + sum(self.estimate(arg) for arg in compiled.args) > self.MAX_SQL_BYTES:
+                return False
+
+        return True
+
+    def fitted(self, **kwargs):
+        """
+        Compiled statements, just the one if it fits, else as many smaller ones as it takes
+        to fit that together do the same
+        """
+
+        compiled = self.compile(**kwargs)
+
+        if self.fits(compiled):
+            return [compiled]
+
+        statements = []
+
+        for query in self.splits():
+            statements.extend(query.fitted(**kwargs))
+
+        return statements
+
+    def copy(self, **clauses):
+        """
+        Copy with some clauses swapped out, leaving this as is
+
+        Each clause is copied with its own list of expressions and bound to the copy, so adding
+        to the copy's clauses doesn't change these. The expressions themselves are shared.
+        """
+
+        query = copy.copy(self)
+        query.parent = None
+        query.clauses = collections.OrderedDict()
+
+        for name, clause in self.clauses.items():
+
+            if name in clauses:
+                clause = clauses[name]
+            else:
+                clause = copy.copy(clause)
+                clause.parent = None
+                if "expressions" in clause.SLOTS:
+                    clause.expressions = [clause.adopt(expression) for expression in clause.expressions]
+
+            if isinstance(clause, relations_sql.CLAUSE):
+                clause.bind(query)
+
+            query.clauses[name] = query.adopt(clause)
+
+        return query
+
+    def splits(self):
+        """
+        Two queries that together do the same as this, halving the longest IN in WHERE
+        """
+
+        if "WHERE" not in self.CLAUSES:
+            raise relations_sql.SQLError(self, "too big to fit and nothing to split")
+
+        for name in self.SPLITS:
+            if name in self.CLAUSES and self.clauses[name]:
+                raise relations_sql.SQLError(self, f"too big to fit and can't split with {name}")
+
+        ins = [
+            (index, expression) for index, expression in enumerate(self.WHERE.expressions)
+            if isinstance(expression, relations_sql.IN) and not expression.invert
+            and isinstance(expression.right, relations_sql.LIST) and len(expression.right.expressions) > 1
+        ]
+
+        if not ins:
+            raise relations_sql.SQLError(self, "too big to fit and no IN to split")
+
+        index, criterion = max(ins, key=lambda each: len(each[1].right.expressions))
+        values = criterion.right.expressions
+
+        if all(isinstance(value, relations_sql.VALUE) for value in values):
+            values = list({value.argument(): value for value in values}.values())
+
+        if len(values) < 2:
+            raise relations_sql.SQLError(self, "too big to fit and no IN to split")
+
+        queries = []
+
+        for half in [values[:len(values)//2], values[len(values)//2:]]:
+
+            where = self.CLAUSES["WHERE"]()
+            where.expressions = [where.adopt(expression) for expression in self.WHERE.expressions]
+            where.expressions[index] = where.adopt(criterion.__class__(criterion.left, criterion.right.__class__(half)))
+
+            queries.append(self.copy(WHERE=where))
+
+        return queries
+
+    def steps(self, sql, args, indent=0, count=0, pad=" ", **kwargs):
         """
-        Generate the sql and args
+        Steps for the sql and args, reusing the sql of any query shaped the same
         """
 
-        sql = []
-        self.args = []
+        cache = self.cache()
+
+        if cache is not None:
+
+            values = []
+            key = (self.shape(values, flat=True), indent, count, pad)
+            cached = cache.get(key)
+
+            if cached is not None:
+                args.extend(values)
+                return [cached]
+
+        start = len(sql)
 
         current = pad * (count * indent)
         line = "\n" if indent else ' '
-        delimitter = f"{line}{current}"
 
-        self.express(self.clauses.values(), sql, indent=indent, count=count, pad=" ", **kwargs)
-        self.sql = f"{self.NAME}{line}{current}{delimitter.join(sql)}"
+        steps = [f"{self.NAME}{line}{current}"]
+        steps.extend(self.delimit(self.clauses.values(), f"{line}{current}", {"indent": indent, "count": count, "pad": " ", **kwargs}))
+
+        if cache is not None:
+            steps.append(lambda sql: cache.set(key, "".join(sql[start:])))
+
+        return steps
+
+    def outline(self, args):
+
+        return (self.__class__, *(yield self.clauses.values()))
+
+    def normalize(self):
+        """
+        Normal from the normal of each clause, so recorded clauses aren't walked again
+        """
+
+        normals = []
+
+        for clause in self.clauses.values():
+            if clause and clause.__class__.generate is not relations_sql.SQL.generate:
+                normals.append(self.normals(relations_sql.SQL.outline(clause, [])))
+            elif clause:
+                normals.append(clause.normalize())
+
+        return self.normal((self.__class__,), normals)
 
 
 class SELECT(QUERY):
@@ -140,10 +381,17 @@ class SELECT(QUERY):
 
     NAME = "SELECT"
 
+    WINDOW = True # whether there's COUNT(*) OVER (), else totaled falls back to counted
+
+    EQ = relations_sql.EQ
+    TABLE_NAME = relations_sql.TABLE_NAME
+    COLUMN_NAME = relations_sql.COLUMN_NAME
+
     CLAUSES = collections.OrderedDict([
         ("OPTIONS", relations_sql.OPTIONS),
         ("FIELDS", relations_sql.FIELDS),
         ("FROM", relations_sql.FROM),
+        ("JOIN", relations_sql.JOIN),
         ("WHERE", relations_sql.WHERE),
         ("GROUP_BY", relations_sql.GROUP_BY),
         ("HAVING", relations_sql.HAVING),
@@ -162,6 +410,167 @@ class SELECT(QUERY):
         """
         return self.FIELDS(*args, **kwargs)
 
+    def LEFT_JOIN(self, *args, **kwargs):
+        """
+        LEFT JOIN into JOIN, so it goes in the order added among the JOIN's
+        """
+        return self.JOIN.left(*args, **kwargs)
+
+    def seek(self, values, expand=False):
+        """
+        Only rows after values, the last row's ORDER BY, instead of an OFFSET
+        """
+        return self.WHERE(self.ORDER_BY.seek(values, expand=expand))
+
+    @staticmethod
+    def qualify(expression, table, aliases=()):
+        """
+        Copy of a column, AS'd column, or ORDER'd column with the table, if it has none, and
+        isn't one of the aliases, which are labels of the fields rather than columns of the table
+        """
+
+        if isinstance(expression, relations_sql.COLUMN_NAME) and not expression.table and expression.name not in aliases:
+            expression = copy.copy(expression)
+            expression.parent = None
+            expression.table = expression.adopt(table)
+        elif isinstance(expression, relations_sql.AS):
+            expression = expression.__class__(expression.label, SELECT.qualify(expression.expression, table, aliases))
+        elif isinstance(expression, relations_sql.ORDER):
+            expression = expression.__class__(SELECT.qualify(expression.expression, table, aliases), expression.order)
+
+        return expression
+
+    def deferred(self, key="id", label="deferred"):
+        """
+        Same rows, but with a subquery picking just the keys to ORDER BY and LIMIT, joined
+        back to the table for the rest, so an OFFSET skips past keys instead of whole rows
+        """
+
+        for name in ["JOIN", "GROUP_BY", "HAVING"]:
+            if name in self.CLAUSES and self.clauses[name]:
+                raise relations_sql.SQLError(self, f"can't defer with {name}")
+
+        if not self.LIMIT:
+            raise relations_sql.SQLError(self, "need LIMIT to defer")
+
+        tables = self.FROM.expressions
+
+        if len(tables) == 1 and isinstance(tables[0], relations_sql.TABLE_NAME):
+            table = tables[0]
+        elif len(tables) == 1 and isinstance(tables[0], relations_sql.AS) and isinstance(tables[0].expression, relations_sql.TABLE_NAME):
+            table = self.TABLE_NAME(tables[0].label.name)
+        else:
+            raise relations_sql.SQLError(self, "need a single table to defer")
+
+        aliases = {expression.label.name: expression for expression in self.FIELDS.expressions if isinstance(expression, relations_sql.AS)}
+        orders = [
+            expression.expression if isinstance(expression, relations_sql.ORDER) else expression
+            for expression in self.ORDER_BY.expressions
+        ]
+
+        keys = self.copy(
+            OPTIONS=self.CLAUSES["OPTIONS"](),
+            FIELDS=self.CLAUSES["FIELDS"](key, *[
+                aliases[order.name] for order in orders
+                if isinstance(order, relations_sql.COLUMN_NAME) and not order.table and order.name in aliases
+            ])
+        )
+
+        return self.copy(
+            FIELDS=self.CLAUSES["FIELDS"](*[self.qualify(expression, table) for expression in self.FIELDS.expressions]),
+            FROM=self.CLAUSES["FROM"](tables[0], **{label: keys}),
+            WHERE=self.CLAUSES["WHERE"](self.EQ(self.COLUMN_NAME(key, table), self.COLUMN_NAME(key, self.TABLE_NAME(label)))),
+            ORDER_BY=self.CLAUSES["ORDER_BY"](*[self.qualify(expression, table, aliases) for expression in self.ORDER_BY.expressions]),
+            LIMIT=self.CLAUSES["LIMIT"]()
+        )
+
+    def distinct(self):
+        """
+        Whether the OPTIONS have DISTINCT
+        """
+
+        return any(
+            isinstance(expression, relations_sql.SQL) and isinstance(expression.sql, str) and expression.sql.upper() == "DISTINCT"
+            for expression in self.OPTIONS.expressions
+        )
+
+    def splits(self):
+        """
+        Splits as QUERY does, but only if the FIELDS are all columns, as anything else, like
+        an aggregate, wouldn't add up the same, nor would DISTINCT
+        """
+
+        if self.distinct():
+            raise relations_sql.SQLError(self, "too big to fit and can't split with DISTINCT")
+
+        for expression in self.FIELDS.expressions:
+
+            if isinstance(expression, relations_sql.AS):
+                expression = expression.expression
+
+            if not isinstance(expression, relations_sql.COLUMN_NAME):
+                raise relations_sql.SQLError(self, "too big to fit and can't split with FIELDS that aren't columns")
+
+        return super().splits()
+
+    def counted(self, key=None, label="total"):
+        """
+        Query counting the rows, without the ORDER BY and LIMIT, or the fields if not needed
+
+        Counts DISTINCT key if there's one, distinct fields or groups in a subquery
+        """
+
+        if key is not None:
+            column = self.COLUMN_NAME(key)
+            column.generate()
+            count = relations_sql.SQL(f"COUNT(DISTINCT {column.sql})", column.args)
+        else:
+            count = relations_sql.SQL("COUNT(*)")
+
+        if not self.GROUP_BY and (key is not None or not self.distinct()):
+            return self.copy(
+                OPTIONS=self.CLAUSES["OPTIONS"](),
+                FIELDS=self.CLAUSES["FIELDS"](**{label: count}),
+                ORDER_BY=self.CLAUSES["ORDER_BY"](),
+                LIMIT=self.CLAUSES["LIMIT"]()
+            )
+
+        rows = self.copy(
+            ORDER_BY=self.CLAUSES["ORDER_BY"](),
+            LIMIT=self.CLAUSES["LIMIT"]()
+        )
+
+        if not self.HAVING and not self.distinct():
+            rows.clauses["FIELDS"] = rows.adopt(self.CLAUSES["FIELDS"](relations_sql.SQL("1")))
+
+        return self.__class__(**{label: relations_sql.SQL("COUNT(*)")}).FROM(counted=rows)
+
+    def totaled(self, label="total"):
+        """
+        Queries for the page and the total, just the one with the total in a label column
+        if there's a WINDOW, else this and counted
+        """
+
+        if not self.WINDOW or self.distinct():
+            return [self, self.counted(label=label)]
+
+        return [self.copy(
+            FIELDS=self.CLAUSES["FIELDS"](*self.FIELDS.expressions, **{label: relations_sql.SQL("COUNT(*) OVER ()")})
+        )]
+
+
+class INTERSECT(relations_sql.CRITERIA):
+    """
+    Rows every one of the SELECT's has
+    """
+
+    __slots__ = ()
+
+    ARGS = SELECT
+
+    DELIMITTER = " INTERSECT "
+    PARENTHESES = False
+
 
 class INSERT(QUERY):
     """
@@ -171,6 +580,8 @@ class INSERT(QUERY):
     NAME = "INSERT"
     PREFIX = "INTO"
 
+    BATCH = 1000 # rows per batch when batches isn't told otherwise
+
     CLAUSES = collections.OrderedDict([
         ("OPTIONS", relations_sql.OPTIONS),
         ("TABLE", relations_sql.TABLE_NAME),
@@ -188,23 +599,24 @@ class INSERT(QUERY):
         if args:
             kwargs["VALUES"] = args
 
+        self.parent = None
         self.check(kwargs)
 
         for clause in self.CLAUSES:
             if clause == "TABLE":
                 if isinstance(TABLE, self.CLAUSES["TABLE"]):
-                    self.clauses[clause] = TABLE
+                    self.clauses[clause] = self.adopt(TABLE)
                     self.clauses[clause].prefix = self.PREFIX
                 else:
-                    self.clauses[clause] = self.CLAUSES[clause](TABLE, prefix=self.PREFIX)
+                    self.clauses[clause] = self.adopt(self.CLAUSES[clause](TABLE, prefix=self.PREFIX))
             elif clause == "COLUMNS":
                 if "COLUMNS" in kwargs:
                     if isinstance(kwargs["COLUMNS"], self.CLAUSES["COLUMNS"]):
-                        self.clauses[clause] = kwargs["COLUMNS"]
+                        self.clauses[clause] = self.adopt(kwargs["COLUMNS"])
                     else:
-                        self.clauses[clause] = self.CLAUSES[clause](kwargs["COLUMNS"])
+                        self.clauses[clause] = self.adopt(self.CLAUSES[clause](kwargs["COLUMNS"]))
                 else:
-                    self.clauses[clause] = self.CLAUSES[clause]([])
+                    self.clauses[clause] = self.adopt(self.CLAUSES[clause]([]))
             elif clause == "VALUES":
                 if "VALUES" in kwargs:
                     if isinstance(kwargs["VALUES"], self.CLAUSES["VALUES"]):
@@ -235,15 +647,217 @@ class INSERT(QUERY):
 
         self.COLUMNS = self.CLAUSES["COLUMNS"](columns)
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def row(self, row, columns):
+        """
+        Values of a row, dict or list, in the order of columns
+        """
+
+        if isinstance(row, dict):
+
+            for column in columns:
+                if column not in row:
+                    raise relations_sql.SQLError(self, f"missing column {column} in {row}")
+
+            return [row[column] for column in columns]
+
+        if len(row) != len(columns):
+            raise relations_sql.SQLError(self, f"wrong values {row} for columns {columns}")
+
+        return row
+
+    def prepare(self, rows, jsonify=None):
+        """
+        Columns, whether each is JSON, and an iterator of a tuple of args per row, going
+        through rows only as the iterator's used, without making expressions for any
+
+        Columns are COLUMNS, else the keys of the first row, else none if there's no rows
+        at all, so there's nothing to do rather than something wrong. Columns are JSON if they're in
+        jsonify, or their value in the first row has to be. Rows can also be a dict of columns,
+        see columnar.
+        """
+
+        if isinstance(rows, collections.abc.Mapping):
+            return self.columnar(rows, jsonify)
+
+        VALUE = self.CLAUSES["VALUES"].ARGS.ARG
+
+        rows = iter(rows)
+        first = next(rows, None)
+
+        if self.COLUMNS:
+            columns = [expression.name for expression in self.COLUMNS.expressions]
+        elif isinstance(first, dict):
+            columns = sorted(first.keys())
+        elif first is None:
+            return [], [], iter(())
+        else:
+            raise relations_sql.SQLError(self, "rows need COLUMNS or to be dicts")
+
+        jsonify = jsonify or []
+        jsonifies = [column in jsonify for column in columns]
+
+        if first is not None:
+
+            jsonifies = [
+                jsonified or VALUE.jsonifies(value)
+                for jsonified, value in zip(jsonifies, self.row(first, columns))
+            ]
+
+            rows = itertools.chain([first], rows)
+
+        def tuples():
+
+            for row in rows:
+
+                values = self.row(row, columns)
+
+                for column, value, jsonified in zip(columns, values, jsonifies):
+                    if not jsonified and VALUE.jsonifies(value):
+                        raise relations_sql.SQLError(self, f"column {column} needs jsonify for {value}")
+
+                yield tuple(VALUE.arg(value, jsonified) for value, jsonified in zip(values, jsonifies))
+
+        return columns, jsonifies, tuples()
+
+    def columnar(self, data, jsonify=None):
+        """
+        Same as prepare but for data that's a dict of columns, each a list or anything else
+        with a length like a NumPy array, so the checks are once per column, not per row
+
+        Anything with tolist has it called, so NumPy types come out as Python's, and those that
+        aren't objects aren't checked for JSON at all.
+        """
+
+        VALUE = self.CLAUSES["VALUES"].ARGS.ARG
+
+        if self.COLUMNS:
+            columns = [expression.name for expression in self.COLUMNS.expressions]
+        else:
+            columns = sorted(data.keys())
+
+        for column in columns:
+            if column not in data:
+                raise relations_sql.SQLError(self, f"missing column {column} in {sorted(data.keys())}")
+
+        if len({len(data[column]) for column in columns}) > 1:
+            raise relations_sql.SQLError(self, f"columns {columns} not all the same length")
+
+        jsonify = jsonify or []
+        jsonifies = []
+        values = []
+
+        for column in columns:
+
+            checked = getattr(getattr(data[column], "dtype", None), "kind", "O") != "O"
+            value = data[column].tolist() if hasattr(data[column], "tolist") else data[column]
+            jsonified = column in jsonify or (len(value) > 0 and VALUE.jsonifies(value[0]))
+
+            if jsonified:
+                value = [VALUE.arg(each, True) for each in value]
+            elif not checked and any(map(VALUE.jsonifies, value)):
+                raise relations_sql.SQLError(self, f"column {column} needs jsonify")
+
+            jsonifies.append(jsonified)
+            values.append(value)
+
+        return columns, jsonifies, zip(*values)
+
+    def template(self, columns, jsonifies):
         """
-        Generate the sql and args
+        The sql up to the first row of VALUES, and the sql inside each row
         """
 
+        VALUES = self.CLAUSES["VALUES"]
+
+        template = self.copy(VALUES=VALUES())
+
+        if not self.COLUMNS:
+            template.COLUMNS = self.CLAUSES["COLUMNS"](columns)
+
+        row = VALUES.ARGS([VALUES.ARGS.ARG(None, jsonify=jsonified) for jsonified in jsonifies]).compile().sql
+
+        return f"{template.compile().sql} {VALUES.NAME} ", row
+
+    def many(self, rows, jsonify=None):
+        """
+        Single row sql and a tuple of args per row, for executemany, in one pass over rows
+        """
+
+        columns, jsonifies, tuples = self.prepare(rows, jsonify)
+        head, row = self.template(columns, jsonifies)
+
+        return relations_sql.COMPILED(f"{head}({row})", tuple(tuples))
+
+    def batches(self, rows, total=None, params=None, size=None, jsonify=None):
+        """
+        Multi row sql and args for rows in batches of at most total rows, params args, and
+        size estimated bytes, total of BATCH if none are set. Rows are only gone through as
+        batches are, so there's only ever a batch's worth held.
+        """
+
+        columns, jsonifies, tuples = self.prepare(rows, jsonify)
+        head, row = self.template(columns, jsonifies)
+
+        if total is None and params is None and size is None:
+            total = self.BATCH
+
+        if params is not None:
+            total = min(total or params, max(1, params // max(1, len(columns))))
+
+        batch = []
+        weight = len(head)
+
+        for values in tuples:
+
+            estimate = len(row) + 3 + sum(self.estimate(arg) for arg in values) if size else 0
+
+            if batch and ((total and len(batch) >= total) or (size and weight + estimate > size)):
+                yield self.batch(head, row, batch)
+                batch = []
+                weight = len(head)
+
+            batch.append(values)
+            weight += estimate
+
+        if batch:
+            yield self.batch(head, row, batch)
+
+    @staticmethod
+    def batch(head, row, batch):
+        """
+        Multi row sql and args for a batch of arg tuples
+        """
+
+        return relations_sql.COMPILED(f"{head}({'),('.join([row] * len(batch))})", tuple(itertools.chain.from_iterable(batch)))
+
+    def steps(self, sql, args, **kwargs):
+
         if self.VALUES and self.SELECT:
             raise relations_sql.SQLError(self, "set VALUES or SELECT but not both")
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        return super().steps(sql, args, **kwargs)
+
+    def splits(self):
+        """
+        Two queries that together do the same as this, halving the VALUES
+        """
+
+        rows = self.VALUES.expressions
+
+        if len(rows) < 2:
+            raise relations_sql.SQLError(self, "too big to fit and no VALUES to split")
+
+        queries = []
+
+        for half in [rows[:len(rows)//2], rows[len(rows)//2:]]:
+
+            values = self.CLAUSES["VALUES"]()
+            values.columns = self.VALUES.columns
+            values.expressions = [values.adopt(row) for row in half]
+
+            queries.append(self.copy(VALUES=values))
+
+        return queries
 
 
 class LIMITED(QUERY):
@@ -253,16 +867,17 @@ class LIMITED(QUERY):
 
     def __init__(self, TABLE, **kwargs):
 
+        self.parent = None
         self.check(kwargs)
 
         for clause in self.CLAUSES:
             if clause == "TABLE":
                 if isinstance(TABLE, self.CLAUSES["TABLE"]):
-                    self.clauses[clause] = TABLE
+                    self.clauses[clause] = self.adopt(TABLE)
                     if self.PREFIX:
                         TABLE.prefix = self.PREFIX
                 else:
-                    self.clauses[clause] = self.CLAUSES[clause](TABLE, prefix=self.PREFIX)
+                    self.clauses[clause] = self.adopt(self.CLAUSES[clause](TABLE, prefix=self.PREFIX))
             else:
                 if clause in kwargs:
                     if isinstance(kwargs[clause], self.CLAUSES[clause]):
@@ -272,15 +887,12 @@ class LIMITED(QUERY):
                 else:
                     self.clauses[clause] = self.CLAUSES[clause]().bind(self)
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
-        """
-        Generate the sql and args
-        """
+    def steps(self, sql, args, **kwargs):
 
         if len(self.LIMIT) > 1:
             raise relations_sql.SQLError(self, "LIMIT can only be total")
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        return super().steps(sql, args, **kwargs)
 
 
 class UPDATE(LIMITED):
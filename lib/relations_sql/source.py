@@ -3,10 +3,13 @@ SQL source mixin for Relations.
 
 Provides the SQL-side resolution of many-to-many tie criteria, shared by every
 SQL backend (sqlite3, pymysql, psycopg2). A consuming source must provide the
-SELECT, TABLE_NAME and SQL expression classes plus a `schema` attribute.
+SELECT, TABLE_NAME and SQL expression classes plus a `schema` attribute, and
+INSERT to stage ties.
 """
 
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals,too-many-arguments
+
+import relations_sql
 
 
 class SOURCE:
@@ -14,6 +17,18 @@ class SOURCE:
     Mixin adding in-database resolution of tie-field set criteria.
     """
 
+    TIES = "IN"             # tie criteria as "IN", "EXISTS", "JOIN", or "INTERSECT", or "AUTO" to pick by the values
+    TIES_THRESHOLD = 10     # with AUTO, this many values or fewer are JOIN'd, more IN'd
+    TIES_MERGE = False      # True to resolve several criteria on the same tie in one grouped subquery
+    TIES_STAGE = None       # values this many or more are staged in a temporary table, None to always inline them
+    TIES_ATTRS = "JOIN"     # sibling attribute criteria as a "JOIN", marking the model _distinct, or "IN" or "EXISTS" semi-joins
+    TIES_STAGED = None      # (DROP, CREATE) sql for a stage and its column, like
+                            # ("DROP TABLE IF EXISTS %s", "CREATE TEMPORARY TABLE %s (%s BIGINT)")
+
+    INTERSECT = relations_sql.INTERSECT
+
+    tied = None             # tie metadata by model class, with the relations it was resolved from
+
     def collate_ties(self, model):
         """
         SQL sources resolve ties inside the query (see collate_ties_query), so the
@@ -22,29 +37,23 @@ class SOURCE:
 
     def collate_ties_query(self, model, query):
         """
-        Resolves tie-field set criteria (has/any/all and their not_ variants) into
-        IN (subquery) clauses, so the database does has/any/all in a single query
-        instead of reading the ties into Python.
+        Resolves tie-field set criteria (has/any/all and their not_ variants) in the
+        query, so the database does has/any/all in a single query instead of reading
+        the ties into Python, each the way ties_strategy picks.
         """
 
-        sides = [
-            (relation, relation.brother_sister_ref, relation.tie_brother_ref, relation.tie_sister_ref)
-            for relation in model.SISTERS.values()
-        ] + [
-            (relation, relation.sister_brother_ref, relation.tie_sister_ref, relation.tie_brother_ref)
-            for relation in model.BROTHERS.values()
-        ]
+        distinct = False
+        model._stages = []
+        model._unstages = []
 
-        for relation, field_ref, tie_self_ref, tie_sibling_ref in sides:
+        for field_ref, tie_table in self.ties_metadata(model)["sides"]:
 
             field = model._record._names[field_ref]
 
             if not field.criteria:
                 continue
 
-            tie = relation.Tie.thy()
-            tie_schema = getattr(tie, "SCHEMA", None) or self.schema
-            tie_store = getattr(tie, "STORE", None) or tie.NAME
+            criteria = []
 
             for criterion, values in field.criteria.items():
 
@@ -52,59 +61,344 @@ class SOURCE:
                 operator = criterion.split("not_", 1)[-1] if negate else criterion
                 values = sorted(set(values if isinstance(values, (list, set, tuple)) else [values]))
 
-                subquery = self.SELECT(tie_self_ref).FROM(
-                    self.TABLE_NAME(tie_store, schema=tie_schema)
-                ).WHERE(**{f"{tie_sibling_ref}__in": values})
+                criteria.append((operator, negate, values))
 
-                if operator == "all":
-                    subquery.GROUP_BY(tie_self_ref).HAVING(
-                        self.SQL(f"COUNT(DISTINCT {tie_sibling_ref}) = {len(values)}")
-                    )
+            field.criteria = {}
+
+            if self.TIES_MERGE and len(criteria) > 1 and not any(self.ties_staging(values) for _, _, values in criteria):
+                self.ties_merged(model, query, tie_table, criteria)
+                continue
 
-                query.WHERE(**{f"{model._id}__{'not_in' if negate else 'in'}": subquery})
+            for criterion in criteria:
 
-            field.criteria = {}
+                strategy = self.ties_strategy(*criterion)
+
+                if strategy not in ["IN", "EXISTS", "JOIN", "INTERSECT"]:
+                    raise relations_sql.SQLError(self, f"unknown TIES {strategy}")
+
+                distinct = getattr(self, f"ties_{strategy.lower()}")(model, query, tie_table, criterion) or distinct
 
         self.collate_attr_query(model, query)
 
-    def collate_attr_query(self, model, query):
+        model._distinct = model._distinct or distinct
+
+    def ties_metadata(self, model):
         """
-        Resolves sibling-attribute criteria (bro__name=..., grouped per relation on model._ties)
-        into a flat join: the tie table and the sibling table are added to the outer query's FROM
-        and the model->tie + tie->sibling joins plus the sibling criteria to its WHERE. Every
-        sibling field operator (name, name__like, name__in, name__gt, ...) lands in WHERE, and
-        criteria on the same relation filter the same tied sibling. Because a model tied to several
-        matching siblings would repeat, it is marked _distinct (count and retrieve honor it with
-        COUNT(DISTINCT id) / SELECT DISTINCT).
+        Resolves a model's ties once per model class, the refs, stores, and (store, schema)
+        of tables for both collate_ties_query and collate_attr_query, again only if its store,
+        its relations, their tie and sibling stores and schemas, or the schema change.
+
+        Tables are kept as plain tuples, and ties_table makes a TABLE_NAME of one for each
+        use, so no query holds on to another, or has its records started over by another.
         """
 
-        model_store = getattr(model, "STORE", None) or model.NAME
-        model._distinct = False
+        if self.tied is None:
+            self.tied = {}
 
-        for name, criteria in getattr(model, "_ties", {}).items():
+        relations = self.ties_key(type(model))
 
-            relation = model.SISTERS[name] if name in model.SISTERS else model.BROTHERS[name]
+        cached = self.tied.get(type(model))
 
-            if name in model.SISTERS:
-                tie_self_ref, tie_sibling_ref = relation.tie_brother_ref, relation.tie_sister_ref
-                sibling, sibling_id = relation.Sister.thy(), relation.sister_id
-            else:
-                tie_self_ref, tie_sibling_ref = relation.tie_sister_ref, relation.tie_brother_ref
-                sibling, sibling_id = relation.Brother.thy(), relation.brother_id
+        if cached is not None and cached[0] == relations:
+            return cached[1]
+
+        metadata = {
+            "store": getattr(model, "STORE", None) or model.NAME,
+            "sides": [],
+            "siblings": {}
+        }
+
+        sides = [
+            (name, relation, relation.brother_sister_ref, relation.tie_brother_ref, relation.tie_sister_ref,
+             relation.Sister, relation.sister_id)
+            for name, relation in model.SISTERS.items()
+        ] + [
+            (name, relation, relation.sister_brother_ref, relation.tie_sister_ref, relation.tie_brother_ref,
+             relation.Brother, relation.brother_id)
+            for name, relation in model.BROTHERS.items()
+        ]
+
+        for name, relation, field_ref, tie_self_ref, tie_sibling_ref, sibling_model, sibling_id in sides:
 
             tie = relation.Tie.thy()
             tie_store = getattr(tie, "STORE", None) or tie.NAME
+            tie_table = ((tie_store, getattr(tie, "SCHEMA", None) or self.schema), tie_store, tie_self_ref, tie_sibling_ref)
+
+            sibling = sibling_model.thy()
             sib_store = getattr(sibling, "STORE", None) or sibling.NAME
+            sib_table = (sib_store, getattr(sibling, "SCHEMA", None) or self.schema)
+
+            metadata["sides"].append((field_ref, tie_table))
+            metadata["siblings"][name] = (tie_table, sib_table, sib_store, sibling_id)
+
+        self.tied[type(model)] = (relations, metadata)
+
+        return metadata
+
+    def ties_key(self, cls):
+        """
+        What a model class's tie metadata comes from, read off the classes rather than a
+        model, as that's quicker, its own store and each relation with its tie and sibling's
+        stores and schemas
+        """
+
+        return (self.schema, getattr(cls, "STORE", None), *(
+            (relation, getattr(relation.Tie, attr, None), getattr(relation.Sister, attr, None))
+            for relation in (cls.SISTERS or {}).values() for attr in ("STORE", "SCHEMA")
+        ), *(
+            (relation, getattr(relation.Tie, attr, None), getattr(relation.Brother, attr, None))
+            for relation in (cls.BROTHERS or {}).values() for attr in ("STORE", "SCHEMA")
+        ))
+
+    def ties_table(self, table):
+        """
+        A new TABLE_NAME for a (store, schema) from ties_metadata
+        """
+
+        return self.TABLE_NAME(table[0], schema=table[1])
+
+    def ties_strategy(self, operator, negate, values):
+        """
+        TIES, but with AUTO, NOT EXISTS for negations, as NULL safe, JOIN for few values,
+        as selective enough to start from the tie, else IN. What can't go JOIN or
+        INTERSECT, staged values included, goes EXISTS or IN
+        """
+
+        strategy = self.TIES
+        staging = self.ties_staging(values)
+
+        if strategy == "AUTO":
+            strategy = "JOIN" if negate or len(values) <= self.TIES_THRESHOLD else "IN"
+
+        if strategy == "JOIN" and negate:
+            return "EXISTS"
+
+        if (strategy == "JOIN" and staging) or (strategy == "INTERSECT" and (operator != "all" or staging)):
+            return "IN"
+
+        return strategy
+
+    def ties_staging(self, values):
+        """
+        Whether there's enough values to stage
+        """
+
+        return self.TIES_STAGE is not None and len(values) >= self.TIES_STAGE
+
+    def ties_stage(self, model, tie_table, values):
+        """
+        Name of a temporary table for the values, if there's enough of them, adding the sql to
+        make and fill it, in batches of INSERT.BATCH, to the model's _stages to run before the
+        query, and to drop it to its _unstages to run after, else None
+        """
+
+        if not self.ties_staging(values):
+            return None
+
+        if self.TIES_STAGED is None:
+            raise relations_sql.SQLError(self, "no staging ties without TIES_STAGED sql")
+
+        stage = f"{tie_table[1]}_staged_{len(model._unstages)}"
+
+        table = self.TABLE_NAME(stage).compile().sql
+        column = self.COLUMN_NAME("value").compile().sql
+
+        model._stages.extend([
+            relations_sql.COMPILED(self.TIES_STAGED[0] % table, ()),
+            relations_sql.COMPILED(self.TIES_STAGED[1] % (table, column), ()),
+            *self.INSERT(stage).batches({"value": values})
+        ])
+
+        model._unstages.append(relations_sql.COMPILED(self.TIES_STAGED[0] % table, ()))
+
+        return stage
+
+    def ties_subquery(self, tie_table, operator, values, stage=None):
+        """
+        SELECT of the tie's self ref for the values, JOIN'd on their stage if staged, grouped
+        to have them all if all
+        """
+
+        table, tie_store, tie_self_ref, tie_sibling_ref = tie_table
+
+        subquery = self.SELECT(tie_self_ref).FROM(self.ties_table(table))
+
+        if stage is None:
+            subquery.WHERE(**{f"{tie_sibling_ref}__in": values})
+        else:
+            subquery.JOIN(stage, {f"{stage}.value": self.COLUMN_NAME(tie_sibling_ref, table=tie_store)})
 
-            tie_table = self.TABLE_NAME(tie_store, schema=getattr(tie, "SCHEMA", None) or self.schema)
-            sib_table = self.TABLE_NAME(sib_store, schema=getattr(sibling, "SCHEMA", None) or self.schema)
+        if operator == "all":
+            subquery.GROUP_BY(tie_self_ref).HAVING(
+                self.SQL(f"COUNT(DISTINCT {tie_sibling_ref}) = {len(values)}")
+            )
+
+        return subquery
+
+    def ties_in(self, model, query, tie_table, criterion):
+        """
+        id IN (SELECT self ref FROM tie WHERE sibling ref IN (...)), NOT IN if negated
+        """
+
+        operator, negate, values = criterion
+
+        subquery = self.ties_subquery(tie_table, operator, values, self.ties_stage(model, tie_table, values))
+
+        query.WHERE(**{f"{model._id}__{'not_in' if negate else 'in'}": subquery})
+
+    def ties_exists(self, model, query, tie_table, criterion):
+        """
+        EXISTS (SELECT ... FROM tie WHERE ... AND tie.self ref=model.id), NOT EXISTS if negated,
+        which stays fast on big ties and, unlike NOT IN, can't be thrown by a NULL
+        """
+
+        operator, negate, values = criterion
+
+        model_store = getattr(model, "STORE", None) or model.NAME
+        _, tie_store, tie_self_ref, _ = tie_table
+
+        subquery = self.ties_subquery(tie_table, operator, values, self.ties_stage(model, tie_table, values))
+        subquery.WHERE(**{f"{tie_store}.{tie_self_ref}": self.COLUMN_NAME(model._id, table=model_store)})
+
+        query.WHERE(**{"not_exists" if negate else "exists": subquery})
+
+    def ties_join(self, model, query, tie_table, criterion):
+        """
+        JOIN the tie ON the model's id and the values, once per value for all, so
+        it's distinct unless every JOIN is just one value
+        """
+
+        operator, _, values = criterion
+
+        model_store = getattr(model, "STORE", None) or model.NAME
+        table, tie_store, tie_self_ref, tie_sibling_ref = tie_table
+
+        groups = [[value] for value in values] if operator == "all" else [values]
+
+        for group in groups:
+
+            label = f"{tie_store}_{len(query.JOIN.expressions)}"
+
+            query.JOIN({label: self.ties_table(table)}, {
+                f"{label}.{tie_self_ref}": self.COLUMN_NAME(model._id, table=model_store),
+                f"{label}.{tie_sibling_ref}__in": group
+            })
+
+        return any(len(group) > 1 for group in groups)
+
+    def ties_intersect(self, model, query, tie_table, criterion):
+        """
+        id IN (SELECT self ref FROM tie WHERE sibling ref=value INTERSECT ...) with one SELECT per value,
+        NOT IN if negated
+        """
+
+        _, negate, values = criterion
+
+        table, _, tie_self_ref, tie_sibling_ref = tie_table
+
+        subquery = self.INTERSECT([
+            self.SELECT(tie_self_ref).FROM(self.ties_table(table)).WHERE(**{tie_sibling_ref: value}) for value in values
+        ])
+
+        query.WHERE(**{f"{model._id}__{'not_in' if negate else 'in'}": subquery})
+
+    def ties_merged(self, model, query, tie_table, criteria):
+        """
+        Every criterion on the tie in one id IN (SELECT self ref FROM tie ... GROUP BY self ref
+        HAVING ...), each a COUNT(DISTINCT CASE WHEN ...) of its values, so the tie's read
+        once. Negations have none or not all of theirs, unless there's only negations, then
+        it's NOT IN the OR of them, as a model without ties isn't in the GROUP BY
+        """
+
+        table, _, tie_self_ref, tie_sibling_ref = tie_table
+
+        sibling = self.COLUMN_NAME(tie_sibling_ref)
+        sibling.generate()
+
+        negations = all(negate for _, negate, _ in criteria)
+
+        havings = []
+
+        for operator, negate, values in criteria:
+
+            within = self.OP(**{f"{tie_sibling_ref}__in": values})
+            within.generate()
+
+            count = f"COUNT(DISTINCT CASE WHEN {within.sql} THEN {sibling.sql} END)"
+
+            if operator == "all":
+                having = f"{count} < {len(values)}" if negate and not negations else f"{count} = {len(values)}"
+            else:
+                having = f"{count} = 0" if negate and not negations else f"{count} > 0"
+
+            havings.append(self.SQL(having, within.args))
+
+        everything = sorted({value for _, _, values in criteria for value in values})
+
+        subquery = self.SELECT(tie_self_ref).FROM(self.ties_table(table))
+        subquery.WHERE(**{f"{tie_sibling_ref}__in": everything}).GROUP_BY(tie_self_ref)
+
+        if negations:
+            subquery.HAVING(self.OR(havings))
+        else:
+            subquery.HAVING(*havings)
+
+        query.WHERE(**{f"{model._id}__{'not_in' if negations else 'in'}": subquery})
+
+    def collate_attr_query(self, model, query):
+        """
+        Resolves sibling-attribute criteria (bro__name=..., grouped per relation on model._ties)
+        the way TIES_ATTRS says. With JOIN, a flat join: the tie table and the sibling table are
+        JOIN'd onto the outer query, ON the model->tie and tie->sibling keys, and the sibling
+        criteria added to its WHERE. Because a model tied to several matching siblings would
+        repeat, it is marked _distinct (count and retrieve honor it with COUNT(DISTINCT id) /
+        SELECT DISTINCT). With IN or EXISTS, the tie JOIN sibling goes in a semi-join subquery
+        instead, id IN (...) or EXISTS (...) correlated on the model's id, which can't repeat
+        a model, so there's no DISTINCT. A dialect whose SELECT has no JOIN clause gets the
+        tie and sibling tables in FROM instead, and their keys in WHERE. Either way, every
+        sibling field operator (name, name__like, name__in, name__gt, ...) lands in WHERE,
+        and criteria on the same relation filter the same tied sibling.
+        """
+
+        metadata = self.ties_metadata(model)
+        model_store = metadata["store"]
+        model._distinct = False
+
+        ties = getattr(model, "_ties", {})
+
+        if ties and self.TIES_ATTRS not in ["JOIN", "IN", "EXISTS"]:
+            raise relations_sql.SQLError(self, f"unknown TIES_ATTRS {self.TIES_ATTRS}")
+
+        for name, criteria in ties.items():
+
+            (tie_table, tie_store, tie_self_ref, tie_sibling_ref), sib_table, sib_store, sibling_id = metadata["siblings"][name]
+            tie_table, sib_table = self.ties_table(tie_table), self.ties_table(sib_table)
 
             # model -> tie -> sibling joins, then the sibling field criteria (same tied sibling)
             model_join = self.OP(**{f"{model_store}.{model._id}": self.COLUMN_NAME(tie_self_ref, table=tie_store)})
             sibling_join = self.OP(**{f"{tie_store}.{tie_sibling_ref}": self.COLUMN_NAME(sibling_id, table=sib_store)})
             matches = [self.OP(**{f"{sib_store}.{predicate}": value}) for predicate, value in criteria.items()]
 
-            query.FROM(tie_table, sib_table).WHERE(model_join, sibling_join, *matches)
-            model._distinct = True
+            joins = "JOIN" in self.SELECT.CLAUSES
+
+            if self.TIES_ATTRS == "JOIN":
+                if joins:
+                    query.JOIN(tie_table, model_join).JOIN(sib_table, sibling_join).WHERE(*matches)
+                else:
+                    query.FROM(tie_table, sib_table).WHERE(model_join, sibling_join, *matches)
+                model._distinct = True
+                continue
+
+            subquery = self.SELECT(f"{tie_store}.{tie_self_ref}")
+
+            if joins:
+                subquery.FROM(tie_table).JOIN(sib_table, sibling_join).WHERE(*matches)
+            else:
+                subquery.FROM(tie_table, sib_table).WHERE(sibling_join, *matches)
+
+            if self.TIES_ATTRS == "EXISTS":
+                query.WHERE(exists=subquery.WHERE(model_join))
+            else:
+                query.WHERE(**{f"{model._id}__in": subquery})
 
         model._ties = {}
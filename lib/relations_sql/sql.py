@@ -2,8 +2,24 @@
 Base SQL module for all of Relations
 """
 
+import copy
+import types
+import hashlib
+import itertools
+import collections
+import collections.abc
+
 import overscore
 
+STAMPS = itertools.count(1) # ever increasing, for telling what's been touched since
+
+GENERATOR = types.GeneratorType # what an outline with anything under it returns
+
+OPEN = object() # where a tuple starts in a flattened shape
+CLOSE = object() # and where it ends
+
+COMPILED = collections.namedtuple("COMPILED", ["sql", "args"]) # what compile returns, args as a tuple
+
 class SQLError(Exception):
     """
     SQL Error class that captures the sql
@@ -15,23 +31,143 @@ class SQLError(Exception):
         super().__init__(self.message)
 
 
+class SHARING:
+    """
+    Stands in as the parent of anything under more than one expression, so touching
+    any of those starts every record over
+    """
+
+    __slots__ = {
+        "dirty": "STAMPS from the last touch of anything shared"
+    }
+
+    SLOTS = frozenset(__slots__)
+
+    parent = None
+
+    def __init__(self):
+
+        self.dirty = 0
+
+
+SHARED = SHARING()
+
+
+class NORMAL(tuple):
+    """
+    A normal, with a digest worked out once from the digests of what's in it, so sorting
+    and fingerprinting them never has to walk all the way down
+    """
+
+    def __new__(cls, normal):
+
+        self = super().__new__(cls, normal)
+        self.digest = hashlib.blake2b(f"({','.join(cls.digests(self))})".encode(), digest_size=16).hexdigest()
+
+        return self
+
+    @staticmethod
+    def digests(normal):
+        """
+        Digest of each in a normal, the repr of anything that isn't a tuple
+        """
+
+        for each in normal:
+            if isinstance(each, tuple):
+                yield f"#{each.digest if isinstance(each, NORMAL) else NORMAL(each).digest}"
+            else:
+                yield repr(each)
+
+    @staticmethod
+    def of(normal):
+        """
+        Digest of any normal, for sorting by
+        """
+
+        if isinstance(normal, NORMAL):
+            return normal.digest
+
+        if isinstance(normal, tuple):
+            return NORMAL(normal).digest
+
+        return repr(normal)
+
+
 class SQL:
     """
     Base class for every SQL expression
     """
 
-    sql = None  # The text for a query
-    args = None # The args for interpolation
+    __slots__ = {
+        "sql": "The text for a query",
+        "args": "The args for interpolation",
+        "parent": "expression this is under, SHARED if more than one, None if none"
+    }
+
+    SLOTS = frozenset(__slots__) # every slot, unset ones default to None
+
+    DEEP = 100 # how deep shapes nest before shape flattens them when asked
 
     def __init__(self, sql=None, args=None):
 
         self.sql = sql
         self.args = args or []
+        self.parent = None
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Gathers every slot of every class, for __getattr__
+        """
+
+        super().__init_subclass__(**kwargs)
+
+        cls.SLOTS = frozenset(name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ()))
+
+    def __getattr__(self, name):
+        """
+        Unset slots are None, as the class attributes they replaced were
+        """
+
+        if name in self.SLOTS:
+            return None
+
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
     def __len__(self):
 
         return 1 if self.sql else 0
 
+    def touch(self):
+        """
+        Mark this and every clause it's under as changed
+        """
+
+        stamp = next(STAMPS)
+        expression = self
+
+        while expression is not None:
+
+            if "dirty" in expression.SLOTS:
+                setattr(expression, "dirty", stamp)
+
+            expression = expression.parent
+
+    def adopt(self, expression):
+        """
+        Put the expression under this one, or under SHARED if it's already under another
+        """
+
+        if isinstance(expression, SQL):
+
+            parent = expression.parent
+
+            if parent is None:
+                expression.parent = self
+            elif parent is not self:
+                expression.parent = SHARED
+
+        return expression
+
     @staticmethod
     def split(column):
         """
@@ -46,5 +182,262 @@ class SQL:
 
     def generate(self, **kwargs):
         """
-        Generate the sql and args
+        Generate the sql and args, everything under written into one buffer joined once at the end
+
+        Pass args=[] to have the args appended to that list instead. Only this gets sql and args
+        set, not anything under it.
+        """
+
+        sql = []
+        args = kwargs.pop("args", [])
+
+        self.render(sql, args, **kwargs)
+
+        self.sql = "".join(sql)
+        self.args = args
+
+    def shape(self, args, flat=False):
+        """
+        Structural key for the sql, adding the args to args, from the outlines of this and
+        everything under it, on a stack rather than recursing, so there's no limit to how
+        deep they nest. If flat, shapes nesting past DEEP come back flattened, so hashing
+        and comparing them won't recurse too far either.
+        """
+
+        shape = self.outline(args)
+
+        if shape.__class__ is not GENERATOR:
+            return shape
+
+        stack = [[shape, [], None]]
+        deep = False
+
+        while True:
+
+            frame = stack[-1]
+            outline, unders, shapes = frame
+
+            if unders:
+
+                under = unders.pop()
+
+                if under.__class__.generate is SQL.generate:
+                    shape = under.outline(args)
+                else:
+                    shape = SQL.outline(under, args)
+
+                if shape.__class__ is GENERATOR:
+                    stack.append([shape, [], None])
+                    deep = deep or len(stack) > self.DEEP
+                else:
+                    shapes.append(shape)
+
+                continue
+
+            try:
+                frame[1] = self.unders(outline.send(shapes))
+                frame[2] = []
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return self.flatten(stop.value) if flat and deep else stop.value
+                stack[-1][2].append(stop.value)
+
+    @staticmethod
+    def flatten(shape):
+        """
+        Shape as one flat tuple, with OPEN and CLOSE where tuples in it start and end
+        """
+
+        flat = []
+        stack = [shape]
+
+        while stack:
+
+            each = stack.pop()
+
+            if each.__class__ is tuple:
+                flat.append(OPEN)
+                stack.append(CLOSE)
+                stack.extend(reversed(each))
+            else:
+                flat.append(each)
+
+        return tuple(flat)
+
+    def outline(self, args):
+        """
+        Shape of just this, by what's compiled, adding the args to args
+
+        Anything with expressions under it makes this a generator instead, yielding what's
+        under, an expression, None, or an iterable of them, to get back a list of their shapes,
+        and returning its own shape, so shape can walk them all without recursing
+        """
+
+        compiled = self.compile()
+        args.extend(compiled.args)
+
+        return (self.__class__, compiled.sql)
+
+    @staticmethod
+    def unders(expression):
+        """
+        Every expression in what an outline yielded, iterables flattened and empties skipped,
+        last first, for popping
+        """
+
+        if expression is None:
+            return []
+
+        if isinstance(expression, SQL):
+            return [expression] if expression else []
+
+        unders = []
+        stack = [expression]
+
+        while stack:
+
+            each = stack.pop()
+
+            if isinstance(each, SQL):
+                if each:
+                    unders.append(each)
+            elif isinstance(each, (list, tuple, collections.abc.Iterable)):
+                stack.extend(each)
+
+        return unders
+
+    @classmethod
+    def normal(cls, shape, normals=None):
+        """
+        Shape with class names for classes, so it's the same from run to run, given the
+        normals of everything after the class, if they're already in hand
+        """
+
+        if normals is None:
+            normals = [cls.normals(each) for each in shape[1:]]
+
+        return (cls.__name__, *normals)
+
+    @staticmethod
+    def normals(shape):
+        """
+        Normal of any shape, by whatever class it's the shape of, on a stack rather than
+        recursing, so there's no limit to how deep it nests, every tuple in it a NORMAL
         """
+
+        done = []
+        stack = [(shape, False)]
+
+        while stack:
+
+            each, ready = stack.pop()
+
+            if not isinstance(each, tuple):
+                done.append(each)
+            elif not ready:
+                stack.append((each, True))
+                stack.extend((item, False) for item in reversed(each))
+            else:
+
+                normals = done[len(done) - len(each):]
+                del done[len(done) - len(each):]
+
+                if each and isinstance(each[0], type) and issubclass(each[0], SQL):
+                    done.append(NORMAL(each[0].normal(each, normals[1:])))
+                else:
+                    done.append(NORMAL(normals))
+
+        return done[0]
+
+    def normalize(self):
+        """
+        Normal of the shape of this
+        """
+
+        return self.normals(self.shape([]))
+
+    def fingerprint(self):
+        """
+        Digest of the normal of the shape, the same for anything that only differs by values,
+        lengths of IN's, or the order of AND's and OR's
+        """
+
+        return NORMAL.of(self.normalize())
+
+    def steps(self, sql, args, **kwargs): # pylint: disable=unused-argument
+        """
+        What to write in order, sql strings, (expression, kwargs) to write in turn, and
+        callables to call with sql after. Anything that goes before all of those can be
+        written straight to sql and args instead, and nothing returned if that's everything.
+        """
+
+        if self.sql is not None:
+            sql.append(self.sql)
+
+        args.extend(self.args)
+
+        return []
+
+    def compile(self, **kwargs):
+        """
+        The sql and args as a COMPILED, without setting them on this or anything under it
+
+        Everything's built in locals, so it's safe to call on the same expression from many
+        threads at once, so long as nobody's adding to it. What's shared, clause records and
+        the statement cache, only ever gets the same sql and args put in it.
+        """
+
+        sql = []
+        args = []
+
+        self.write(sql, args, **kwargs)
+
+        return COMPILED("".join(sql), tuple(args))
+
+    def write(self, sql, args, **kwargs):
+        """
+        Write the sql as pieces to sql and the args to args, through generate for
+        classes that override it, as their steps can't know what it'd do, on a copy,
+        so this isn't left with sql and args some other thread could be reading
+        """
+
+        if self.__class__.generate is SQL.generate:
+            self.render(sql, args, **kwargs)
+            return
+
+        generated = copy.copy(self)
+        generated.generate(args=args, **kwargs)
+        sql.append(generated.sql)
+
+        if generated.args is not args:
+            args.extend(generated.args)
+
+    def render(self, sql, args, **kwargs):
+        """
+        Write the steps of this and everything under it, on a stack rather than
+        recursing, so there's no limit to how deep they nest
+        """
+
+        steps = self.steps(sql, args, **kwargs)
+        stack = list(reversed(steps)) if steps else []
+
+        while stack:
+
+            step = stack.pop()
+
+            if step.__class__ is str:
+                sql.append(step)
+            elif step.__class__ is tuple:
+
+                expression, kwargs = step
+
+                if expression.__class__.generate is SQL.generate:
+                    steps = expression.steps(sql, args, **kwargs)
+                    if steps:
+                        stack.extend(reversed(steps))
+                else:
+                    expression.write(sql, args, **kwargs)
+
+            else:
+                step(sql)
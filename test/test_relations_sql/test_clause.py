@@ -64,6 +64,42 @@ class TestCLAUSE(unittest.TestCase):
         self.assertEqual(clause.bind(query), clause)
         self.assertEqual(clause.query, query)
 
+    def test_recorded(self):
+
+        clause = KNOWN("people")
+
+        record = clause.recorded()
+        self.assertEqual(list(record.keys()), ["stamp"])
+        self.assertIs(clause.recorded(), record)
+
+        clause.expressions[0].set("stuff")
+        self.assertIsNot(clause.recorded(), record)
+
+        record = clause.recorded()
+        clause.add("things")
+        self.assertIsNot(clause.recorded(), record)
+
+        inner = KNOWN("people")
+        clause = UNKNOWN(relations_sql.NOT(inner))
+
+        record = clause.recorded()
+        inner.add("stuff")
+        self.assertIsNot(clause.recorded(), record)
+
+        shared = test_expression.COLUMN_NAME("id")
+        clause = KNOWN(shared)
+        KNOWN(shared)
+        self.assertEqual(shared.parent, relations_sql.SHARED)
+
+        record = clause.recorded()
+        shared.set("things")
+        self.assertIsNot(clause.recorded(), record)
+
+        class UNRECORDED(KNOWN):
+            RECORDED = False
+
+        self.assertIsNone(UNRECORDED("people").recorded())
+
     def test_add(self):
 
         clause = UNKNOWN()
@@ -181,6 +217,100 @@ class TestCLAUSE(unittest.TestCase):
         `toast`!=%s
       )""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(KNOWN().shape(args), (KNOWN,))
+
+        clause = KNOWN(test_criterion.EQ("totes", "maigoats"))
+        shape = clause.shape(args)
+        self.assertEqual(args, ["maigoats"])
+
+        clause.expressions[0].right.value = "untracked"
+        self.assertIs(clause.shape(args), shape)
+        self.assertEqual(args, ["maigoats", "maigoats"])
+
+        clause.add(test_criterion.EQ("toast", "myghost"))
+        self.assertIsNot(clause.shape(args), shape)
+        self.assertEqual(args, ["maigoats", "maigoats", "untracked", "myghost"])
+
+        args = []
+
+        self.assertEqual(KNOWN("people", stuff="things").shape(args), (KNOWN,
+            (test_expression.COLUMN_NAME, "people", False, False),
+            (test_expression.AS, (test_expression.COLUMN_NAME, "things", False, False), (test_expression.NAME, "stuff"))
+        ))
+        self.assertEqual(args, [])
+
+    def test_normalize(self):
+
+        clause = KNOWN(test_criterion.EQ("totes", "maigoats"))
+
+        normal = clause.normalize()
+        self.assertEqual(normal, clause.normals(clause.shape([])))
+        self.assertIs(clause.recorded()["normal"], normal)
+        self.assertIs(clause.normalize(), normal)
+
+        clause.add(test_criterion.EQ("toast", "myghost"))
+        self.assertNotEqual(clause.normalize(), normal)
+
+        class UNRECORDED(KNOWN):
+            RECORDED = False
+
+        self.assertEqual(UNRECORDED("people").normalize(), ("UNRECORDED", ("COLUMN_NAME", "people", False, False)))
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        UNKNOWN().write(sql, args)
+        self.assertEqual(sql, [])
+
+        UNKNOWN(relations_sql.SQL("")).write(sql, args)
+        self.assertEqual(sql, [])
+
+        UNKNOWN("people", "stuff", "things").write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """  people,
+    stuff,
+    things""")
+
+        sql = []
+
+        KNOWN("people", stuff="things").write(sql, args)
+        self.assertEqual("".join(sql), """CLAUSE `people`,`things` AS `stuff`""")
+        self.assertEqual(args, [])
+
+        clause = KNOWN(test_criterion.EQ("totes", "maigoats"))
+
+        sql = []
+        args = []
+
+        clause.write(sql, args)
+        self.assertEqual("".join(sql), "CLAUSE `totes`=%s")
+        self.assertEqual(args, ["maigoats"])
+        self.assertEqual(clause.record[(0, 0, " ")], "CLAUSE `totes`=%s")
+        self.assertEqual(clause.record["args"], ["maigoats"])
+
+        clause.expressions[0].right.value = "untracked"
+
+        sql = []
+        args = []
+
+        clause.write(sql, args)
+        self.assertEqual(sql, ["CLAUSE `totes`=%s"])
+        self.assertEqual(args, ["maigoats"])
+
+        clause.expressions[0].left.set("toast")
+
+        sql = []
+        args = []
+
+        clause.write(sql, args)
+        self.assertEqual("".join(sql), "CLAUSE `toast`=%s")
+        self.assertEqual(args, ["untracked"])
+
 
 class ARGS(relations_sql.ARGS):
 
@@ -383,6 +513,153 @@ class TestFROM(unittest.TestCase):
       `things` AS `stuff`""")
 
 
+class ON(relations_sql.ON):
+
+    ARGS = test_expression.VALUE
+    KWARGS = test_criteria.OP
+
+class TestON(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___len__(self):
+
+        clause = ON()
+        self.assertEqual(len(clause), 0)
+
+        clause.table = test_expression.TABLE_NAME("people")
+        self.assertEqual(len(clause), 1)
+
+        clause(stuff="things")
+        self.assertEqual(len(clause), 2)
+
+    def test_generate(self):
+
+        clause = ON(stuff="things")
+
+        clause.generate()
+        self.assertEqual(clause.sql, """ON `stuff`=%s""")
+        self.assertEqual(clause.args, ["things"])
+
+        clause.table = test_expression.TABLE_NAME("people")
+
+        clause.generate()
+        self.assertEqual(clause.sql, """`people` ON `stuff`=%s""")
+        self.assertEqual(clause.args, ["things"])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """`people`
+ON
+  `stuff`=%s""")
+
+        clause = ON()
+        clause.table = test_expression.TABLE_NAME("people")
+
+        clause.generate()
+        self.assertEqual(clause.sql, """`people`""")
+        self.assertEqual(clause.args, [])
+
+        clause = ON(stuff="things")
+        clause.kind = "LEFT JOIN"
+        clause.table = test_expression.TABLE_NAME("people")
+
+        clause.generate()
+        self.assertEqual(clause.sql, """LEFT JOIN `people` ON `stuff`=%s""")
+        self.assertEqual(clause.args, ["things"])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """LEFT JOIN `people`
+ON
+  `stuff`=%s""")
+
+    def test_shape(self):
+
+        clause = ON(stuff="things")
+        clause.table = test_expression.TABLE_NAME("people")
+
+        args = []
+        self.assertEqual(clause.shape(args), (ON, None, (test_expression.TABLE_NAME, "people", None), clause.expressions[0].shape([])))
+        self.assertEqual(args, ["things"])
+
+        clause.kind = "LEFT JOIN"
+        self.assertEqual(clause.shape([])[:2], (ON, "LEFT JOIN"))
+
+
+class JOIN(relations_sql.JOIN):
+
+    ARGS = test_expression.TABLE_NAME
+    KWARG = test_expression.TABLE_NAME
+    KWARGS = test_expression.AS
+
+    ON = ON
+
+class TestJOIN(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_add(self):
+
+        clause = JOIN()
+        self.assertFalse(clause)
+
+        self.assertEqual(clause.add("people", {"people.id": test_expression.COLUMN_NAME("stuff.people_id")}), clause)
+        self.assertIsInstance(clause.expressions[0], ON)
+        self.assertEqual(clause.expressions[0].kind, "JOIN")
+        self.assertIsInstance(clause.expressions[0].table, test_expression.TABLE_NAME)
+        self.assertEqual(len(clause.expressions[0].expressions), 1)
+
+        clause.add({"things": "stuff.things"}, test_expression.VALUE("1=1"), yin="yang")
+        self.assertIsInstance(clause.expressions[1].table, test_expression.AS)
+        self.assertEqual(len(clause.expressions[1].expressions), 2)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need a table to join on", clause.add, yin="yang")
+        self.assertRaisesRegex(relations_sql.SQLError, "need single pair in", clause.add, {"a": "b", "c": "d"})
+
+    def test_left(self):
+
+        clause = JOIN()
+
+        self.assertEqual(clause.left("people", {"people.id": test_expression.COLUMN_NAME("stuff.people_id")}), clause)
+        self.assertEqual(clause.expressions[0].kind, "LEFT JOIN")
+        self.assertEqual(len(clause.expressions[0].expressions), 1)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need a table to join on", clause.left, yin="yang")
+
+    def test_generate(self):
+
+        clause = JOIN("people", {"people.id": test_expression.COLUMN_NAME("stuff.people_id")})
+        clause({"things": "stuff.things"}, {"things.stuff_id": test_expression.COLUMN_NAME("stuff.id")})
+
+        clause.generate()
+        self.assertEqual(clause.sql,
+            """JOIN `people` ON `people`.`id`=(`stuff`.`people_id`) """
+            """JOIN `stuff`.`things` AS `things` ON `things`.`stuff_id`=(`stuff`.`id`)"""
+        )
+        self.assertEqual(clause.args, [])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """  JOIN `people`
+  ON
+    `people`.`id`=(
+      `stuff`.`people_id`
+    )
+  JOIN `stuff`.`things` AS `things`
+  ON
+    `things`.`stuff_id`=(
+      `stuff`.`id`
+    )""")
+
+        clause = JOIN()
+        clause.left("things", {"things.stuff_id": test_expression.COLUMN_NAME("stuff.id")})
+        clause("stuff", {"stuff.people_id": test_expression.COLUMN_NAME("people.id")})
+
+        clause.generate()
+        self.assertEqual(clause.sql,
+            """LEFT JOIN `things` ON `things`.`stuff_id`=(`stuff`.`id`) """
+            """JOIN `stuff` ON `stuff`.`people_id`=(`people`.`id`)"""
+        )
+
+
 class WHERE(relations_sql.WHERE):
 
     ARGS = test_expression.VALUE
@@ -557,6 +834,18 @@ class ORDER_BY(relations_sql.ORDER_BY):
     ARGS = test_expression.ORDER
     KWARGS = test_expression.ORDER
 
+    AND = test_criteria.AND
+    OR = test_criteria.OR
+    EQ = test_criterion.EQ
+    GT = test_criterion.GT
+    LT = test_criterion.LT
+    LIST = test_expression.LIST
+    ROW = test_criteria.ROW
+
+class EXPANDED(ORDER_BY):
+
+    ROW = None
+
 class TestORDER_BY(unittest.TestCase):
 
     maxDiff = None
@@ -615,6 +904,42 @@ class TestORDER_BY(unittest.TestCase):
       `stuff` ASC,
       `things` DESC""")
 
+    def test_seek(self):
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need ORDER BY to seek", ORDER_BY().seek, [1])
+        self.assertRaisesRegex(relations_sql.SQLError, "need 2 values to seek, not 1", ORDER_BY("people", "stuff").seek, [1])
+        self.assertRaisesRegex(relations_sql.SQLError, "cannot seek past NULL", ORDER_BY("people").seek, [None])
+
+        criterion = ORDER_BY("people").seek([1])
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`people`>%s""")
+        self.assertEqual(criterion.args, [1])
+
+        criterion = ORDER_BY(people=DESC).seek([1])
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`people`<%s""")
+        self.assertEqual(criterion.args, [1])
+
+        criterion = ORDER_BY("people", stuff=ASC).seek([1, 2])
+        criterion.generate()
+        self.assertEqual(criterion.sql, """(`people`,`stuff`)>(%s,%s)""")
+        self.assertEqual(criterion.args, [1, 2])
+
+        criterion = ORDER_BY("people", stuff=ASC).seek([1, 2], expand=True)
+        criterion.generate()
+        self.assertEqual(criterion.sql, """(`people`>%s OR (`people`=%s AND `stuff`>%s))""")
+        self.assertEqual(criterion.args, [1, 1, 2])
+
+        criterion = EXPANDED("people", stuff=DESC, things=ASC).seek([1, 2, 3])
+        criterion.generate()
+        self.assertEqual(criterion.sql, """(`people`>%s OR (`people`=%s AND `stuff`<%s) OR (`people`=%s AND `stuff`=%s AND `things`>%s))""")
+        self.assertEqual(criterion.args, [1, 1, 2, 1, 2, 3])
+
+        criterion = ORDER_BY("people", stuff=DESC).seek([1, 2])
+        criterion.generate()
+        self.assertEqual(criterion.sql, """(`people`>%s OR (`people`=%s AND `stuff`<%s))""")
+        self.assertEqual(criterion.args, [1, 1, 2])
+
 
 class LIMIT(relations_sql.LIMIT):
 
@@ -693,6 +1018,22 @@ class TestLIMIT(unittest.TestCase):
         clause.generate(indent=2, count=2)
         self.assertEqual(clause.sql, """LIMIT %s OFFSET %s""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(LIMIT(10, 5).shape(args), (LIMIT, 2, (test_expression.VALUE, False)))
+        self.assertEqual(args, [10, 5])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        LIMIT(10, 5).write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """LIMIT %s OFFSET %s""")
+        self.assertEqual(args, [10, 5])
+
 
 class SET(relations_sql.SET):
 
@@ -899,3 +1240,40 @@ class TestVALUES(unittest.TestCase):
         %s,
         %s
       )""")
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(VALUES(fee="fie", foe="fum").shape(args), (VALUES,
+            (test_expression.LIST, 2, (test_expression.VALUE, False))
+        ))
+        self.assertEqual(args, ["fie", "fum"])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        clause = VALUES(fee="fie", foe="fum")
+
+        clause.write(sql, args)
+        self.assertEqual("".join(sql), """VALUES (%s,%s)""")
+        self.assertEqual(args, ["fie", "fum"])
+
+        sql = []
+        args = []
+
+        clause(fee="fie", foe="fum")
+
+        clause.write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """VALUES
+    (
+      %s,
+      %s
+    ),(
+      %s,
+      %s
+    )""")
+        self.assertEqual(args, ["fie", "fum", "fie", "fum"])
+
@@ -81,6 +81,7 @@ class TestCRITERIA(unittest.TestCase):
         criteria = SPACE()
 
         criteria.add("people")
+        self.assertEqual(criteria.expressions[0].parent, criteria)
         self.assertEqual(len(criteria.expressions), 1)
         self.assertIsInstance(criteria.expressions[0], relations_sql.SQL)
         self.assertEqual(criteria.expressions[0].sql, """people""")
@@ -187,6 +188,59 @@ class TestCRITERIA(unittest.TestCase):
       )
     )""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(LOGIC().shape(args), (LOGIC,))
+        self.assertEqual(LOGIC(test_criterion.EQ("totes", "maigoats")).shape(args), (LOGIC,
+            (test_criterion.EQ, False, (test_expression.COLUMN_NAME, "totes", False, False), (test_expression.VALUE, False))
+        ))
+        self.assertEqual(args, ["maigoats"])
+
+    def test_normal(self):
+
+        totes = test_criterion.EQ("totes", "maigoats")
+        toast = test_criterion.EQ("toast", "myghost")
+
+        self.assertEqual(LOGIC.normal(LOGIC(totes, toast).shape([])), ("LOGIC",
+            ("EQ", False, ("COLUMN_NAME", "totes", False, False), ("VALUE", False)),
+            ("EQ", False, ("COLUMN_NAME", "toast", False, False), ("VALUE", False))
+        ))
+        self.assertEqual(LOGIC.normal(LOGIC(totes, totes).shape([])), ("LOGIC",
+            ("EQ", False, ("COLUMN_NAME", "totes", False, False), ("VALUE", False)),
+            ("EQ", False, ("COLUMN_NAME", "totes", False, False), ("VALUE", False))
+        ))
+        self.assertEqual(AND.normal(AND(totes, toast).shape([])), AND.normal(AND(toast, totes).shape([])))
+        self.assertEqual(AND.normal(AND(totes, toast).shape([])), ("AND", *sorted([
+            ("EQ", False, ("COLUMN_NAME", "toast", False, False), ("VALUE", False)),
+            ("EQ", False, ("COLUMN_NAME", "totes", False, False), ("VALUE", False))
+        ], key=relations_sql.NORMAL.of)))
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        SPACE().write(sql, args)
+        self.assertEqual(sql, [])
+
+        criteria = LOGIC(test_criterion.EQ("totes", "maigoats"), test_criterion.EQ("toast", "myghost", invert=True))
+
+        criteria.write(sql, args)
+        self.assertEqual("".join(sql), """(`totes`=%s LOGIC `toast`!=%s)""")
+        self.assertEqual(args, ["maigoats", "myghost"])
+
+        sql = []
+        args = []
+
+        criteria.write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """(
+    `totes`=%s LOGIC
+    `toast`!=%s
+  )""")
+        self.assertEqual(args, ["maigoats", "myghost"])
+
 class AND(relations_sql.AND):
 
     ARGS = test_expression.VALUE
@@ -220,6 +274,61 @@ class TestAND(unittest.TestCase):
       `toast`!=%s
     )""")
 
+    def test_generate_args(self):
+
+        args = []
+        criteria = AND(test_criterion.EQ("totes", "maigoats"), OR(test_criterion.EQ("toast", "myghost"), test_criterion.IN("yin", [1, 2])))
+
+        criteria.generate(args=args)
+        self.assertEqual(criteria.sql, """(`totes`=%s AND (`toast`=%s OR `yin` IN (%s,%s)))""")
+        self.assertIs(criteria.args, args)
+        self.assertEqual(args, ["maigoats", "myghost", 1, 2])
+
+        class REGENERATED(AND):
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+
+        args = []
+        criteria = REGENERATED(test_criterion.EQ("totes", "maigoats"), REGENERATED(test_criterion.EQ("toast", "myghost")))
+
+        criteria.generate(args=args)
+        self.assertEqual(criteria.sql, """(`totes`=%s AND (`toast`=%s))""")
+        self.assertIsNone(criteria.expressions[1].sql)
+        self.assertEqual(args, ["maigoats", "myghost"])
+
+    def test_generate_deep(self):
+
+        criteria = test_criterion.EQ("totes", "maigoats")
+
+        for level in range(5000):
+            criteria = (AND if level % 2 else OR)(test_criterion.EQ("toast", level), criteria)
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, "(`toast`=%s AND (`toast`=%s OR " * 2500 + "`totes`=%s" + "))" * 2500)
+        self.assertEqual(criteria.args, list(reversed(range(5000))) + ["maigoats"])
+
+    def test_normalize_deep(self):
+
+        criteria = test_criterion.EQ("totes", "maigoats")
+        swapped = test_criterion.EQ("totes", "yaks")
+
+        for level in range(5000):
+            criteria = (AND if level % 2 else OR)(test_criterion.EQ("toast", level), criteria)
+            swapped = (AND if level % 2 else OR)(swapped, test_criterion.EQ("toast", -level))
+
+        args = []
+        criteria.shape(args)
+        self.assertEqual(args, list(reversed(range(5000))) + ["maigoats"])
+
+        normal = criteria.normalize()
+        for _ in range(5000):
+            self.assertIn(normal[0], ["AND", "OR"])
+            normal = normal[1] if normal[2][0] == "EQ" else normal[2]
+
+        self.assertEqual(normal, ("EQ", False, ("COLUMN_NAME", "totes", False, False), ("VALUE", False)))
+
+        self.assertEqual(criteria.fingerprint(), swapped.fingerprint())
+
 
 class OR(relations_sql.OR):
 
@@ -255,6 +364,27 @@ class TestOR(unittest.TestCase):
     )""")
 
 
+class ROW(relations_sql.ROW):
+
+    ARGS = test_expression.COLUMN_NAME
+
+class TestROW(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_generate(self):
+
+        criteria = ROW("totes", "maigoats")
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`totes`,`maigoats`)""")
+        self.assertEqual(criteria.args, [])
+
+        criteria = test_criterion.GT(criteria, test_expression.LIST([1, 2]))
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`totes`,`maigoats`)>(%s,%s)""")
+        self.assertEqual(criteria.args, [1, 2])
+
+
 class SETS(test_criterion.SQL, relations_sql.SETS):
 
     def __init__(self, left=None, right=None, jsonify=False, **kwargs):
@@ -285,6 +415,24 @@ class TestSETS(unittest.TestCase):
         self.assertEqual(criteria.sql, """(`totes` AND JSON(%s))""")
         self.assertEqual(criteria.args, ['["mai", "goats"]'])
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(SETS("totes", ["mai", "goats"]).shape(args), (SETS,
+            (AND, (test_expression.COLUMN_NAME, "totes", False, False), (test_expression.VALUE, True))
+        ))
+        self.assertEqual(args, ['["mai", "goats"]'])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        SETS("totes", ["mai", "goats"]).write(sql, args)
+        self.assertEqual("".join(sql), """(`totes` AND JSON(%s))""")
+        self.assertEqual(args, ['["mai", "goats"]'])
+
 
 class HAS(test_criterion.SQL, relations_sql.HAS):
 
@@ -422,6 +570,7 @@ class OP(test_criterion.SQL, relations_sql.OP):
         'start': test_criterion.START,
         'end': test_criterion.END,
         'in': test_criterion.IN,
+        'exists': test_criterion.EXISTS,
         "has": HAS,
         "any": ANY,
         "all": ALL
@@ -463,6 +612,38 @@ class TestOP(unittest.TestCase):
 
         self.assertRaisesRegex(relations_sql.SQLError, "need single pair", OP, "nope")
 
+        criteria = OP(exists=relations_sql.SQL("SELECT 1"))
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """EXISTS (SELECT 1)""")
+        self.assertEqual(criteria.args, [])
+
+        criteria = OP(not_exists=relations_sql.SQL("SELECT 1"))
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """NOT EXISTS (SELECT 1)""")
+        self.assertEqual(criteria.args, [])
+
+        criteria = OP(exists=True)
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """`exists`=%s""")
+        self.assertEqual(criteria.args, [True])
+
+        criteria = OP(not_exists=test_expression.COLUMN_NAME("stuff.exists"))
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """`not_exists`=(`stuff`.`exists`)""")
+        self.assertEqual(criteria.args, [])
+
+        criteria = OP(exists__not_eq=1)
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """`exists`!=%s""")
+        self.assertEqual(criteria.args, [1])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "nothing goes on the left of EXISTS, not stuff", OP, stuff__exists=relations_sql.SQL("SELECT 1"))
+
         criteria = OP(totes__a__null=False, EXTRACTED=True)
 
         criteria.generate()
@@ -488,3 +669,15 @@ class TestOP(unittest.TestCase):
         self.assertEqual(criteria.args, ['[1, 2]', '[1, 2]'])
 
         self.assertRaisesRegex(relations_sql.SQLError, "need single pair", OP, "nope")
+
+        criteria = OP(exists=relations_sql.SQL("SELECT 1"))
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """EXISTS (SELECT 1)""")
+        self.assertEqual(criteria.args, [])
+
+        criteria = OP(not_exists=relations_sql.SQL("SELECT 1"))
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """NOT EXISTS (SELECT 1)""")
+        self.assertEqual(criteria.args, [])
@@ -1,6 +1,8 @@
 import unittest
 import unittest.mock
 
+import sqlite3
+
 import test_sql
 import test_expression
 
@@ -188,6 +190,54 @@ class TestCRITERION(unittest.TestCase):
       %s
     )""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(CRITERION("totes", "maigoats").shape(args), (CRITERION, False,
+            (test_expression.COLUMN_NAME, "totes", False, False),
+            (test_expression.VALUE, False)
+        ))
+        self.assertEqual(CRITERIONREVERSE("totes__a", "maigoats", invert=True).shape(args), (CRITERIONREVERSE, True,
+            (test_expression.COLUMN_NAME, "totes", True, False),
+            (test_expression.VALUE, False)
+        ))
+        self.assertEqual(args, ["maigoats", "maigoats", '$."a"'])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        CRITERION("totes", "maigoats", invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes` CRIERIOFF %s""")
+        self.assertEqual(args, ["maigoats"])
+
+        sql = []
+        args = []
+
+        CRITERIONREVERSE(relations_sql.SQL("totes", ["mai"]), "goats").write(sql, args)
+        self.assertEqual("".join(sql), """%s CRITERION totes""")
+        self.assertEqual(args, ["goats", "mai"])
+
+        sql = []
+        args = []
+
+        CRITERIONCAST(totes__a="maigoats").write(sql, args)
+        self.assertEqual("".join(sql), """CAST(`totes`#>>%s) CRITERION CAST(%s)""")
+        self.assertEqual(args, ['$."a"', 'maigoats'])
+
+        sql = []
+        args = []
+
+        CRITERION(totes=test_expression.LIST([1, 2, 3])).write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """`totes` CRITERION (
+    %s,
+    %s,
+    %s
+  )""")
+        self.assertEqual(args, [1, 2, 3])
+
 
 class NULL(SQL, relations_sql.NULL):
     pass
@@ -230,6 +280,29 @@ class TestNULL(unittest.TestCase):
         self.assertEqual(criterion.sql, """JSONNULL(`totes`#>>%s) IS NOT NULL""")
         self.assertEqual(criterion.args, ['$."a"'])
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NULL("totes", True).shape(args), (NULL, False, (test_expression.COLUMN_NAME, "totes", False, False)))
+        self.assertEqual(NULL("totes", False).shape(args), (NULL, True, (test_expression.COLUMN_NAME, "totes", False, False)))
+        self.assertEqual(args, [])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        NULL("totes", True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes` IS NULL""")
+        self.assertEqual(args, [])
+
+        sql = []
+
+        JSONNULL(totes__a=False).write(sql, args)
+        self.assertEqual("".join(sql), """JSONNULL(`totes`#>>%s) IS NOT NULL""")
+        self.assertEqual(args, ['$."a"'])
+
 
 class EQ(SQL, relations_sql.EQ):
     pass
@@ -420,8 +493,105 @@ class IN(SQL, relations_sql.IN):
     RIGHT = test_expression.LIST
     VALUE = test_expression.VALUE
 
+class CHUNKS(IN):
+
+    STRATEGY = "CHUNKS"
+    THRESHOLD = 3
+    CHUNK = 2
+
+class ARRAY(IN):
+
+    STRATEGY = "ARRAY"
+    THRESHOLD = 3
+    ARRAY = ("%s=ANY(%s)", "%s!=ALL(%s)")
+
+class ROWS(IN):
+
+    STRATEGY = "VALUES"
+    THRESHOLD = 3
+
+class BUCKETED(IN):
+
+    BUCKETS = "POWERS"
+
 class TestIN(unittest.TestCase):
 
+    def test___init__(self):
+
+        self.assertIsNone(IN("totes", [1, 2, 3]).right.buckets)
+        self.assertEqual(BUCKETED("totes", [1, 2, 3]).right.buckets, "POWERS")
+
+    def test_strategy(self):
+
+        self.assertIsNone(IN("totes", [1, 2, 3]).strategy())
+        self.assertIsNone(CHUNKS("totes", [1, 2]).strategy())
+        self.assertIsNone(CHUNKS("totes", [1, 2, {"a": 1}]).strategy())
+        self.assertEqual(CHUNKS("totes", [1, 2, 3]).strategy(), "CHUNKS")
+        self.assertEqual(ARRAY("totes", [1, 2, 3]).strategy(), "ARRAY")
+        self.assertEqual(ROWS("totes", [1, 2, 3]).strategy(), "VALUES")
+
+        class NOARRAY(ARRAY):
+            ARRAY = None
+
+        self.assertRaisesRegex(relations_sql.SQLError, "no ARRAY strategy without ARRAY operands", NOARRAY("totes", [1, 2, 3]).strategy)
+
+        class NOPE(ARRAY):
+            STRATEGY = "NOPE"
+
+        self.assertRaisesRegex(relations_sql.SQLError, "unknown STRATEGY NOPE", NOPE("totes", [1, 2, 3]).strategy)
+
+    def test_chunks(self):
+
+        chunks = CHUNKS("totes", [1, 2, 3]).chunks()
+
+        self.assertEqual(len(chunks), 2)
+        self.assertIsInstance(chunks[0], test_expression.LIST)
+        self.assertEqual([expression.value for expression in chunks[0].expressions], [1, 2])
+        self.assertEqual([expression.value for expression in chunks[1].expressions], [3])
+
+        class BUCKETED_CHUNKS(CHUNKS):
+            BUCKETS = "POWERS"
+            CHUNK = 4
+
+        chunks = BUCKETED_CHUNKS("totes", [1, 2, 3, 4, 5, 6, 7]).chunks()
+
+        self.assertEqual([expression.value for expression in chunks[0].expressions], [1, 2, 3, 4])
+        self.assertEqual([expression.value for expression in chunks[1].expressions], [5, 6, 7, 7])
+
+        chunks = BUCKETED_CHUNKS("totes", [1, 2, 3, 4, 5]).chunks()
+
+        self.assertEqual([expression.value for expression in chunks[1].expressions], [5])
+
+        class UNEVEN(BUCKETED_CHUNKS):
+            CHUNK = 3
+
+        chunks = UNEVEN("totes", [1, 2, 3, 4, 5]).chunks()
+
+        self.assertEqual([expression.value for expression in chunks[0].expressions], [1, 2, 3])
+        self.assertEqual([expression.value for expression in chunks[1].expressions], [4, 5])
+
+    def test_array(self):
+
+        array = ARRAY("totes", [1, 2, 3]).array()
+
+        self.assertEqual(array.sql, "%s")
+        self.assertEqual(array.args, [[1, 2, 3]])
+
+    def test_rows(self):
+
+        rows = ROWS("totes", [1, 2, 3]).rows()
+
+        self.assertEqual(rows.sql, "VALUES (%s),(%s),(%s)")
+        self.assertEqual(rows.args, [1, 2, 3])
+
+        class BUCKETED_ROWS(ROWS):
+            BUCKETS = "POWERS"
+
+        rows = BUCKETED_ROWS("totes", [1, 2, 3]).rows()
+
+        self.assertEqual(rows.sql, "VALUES (%s),(%s),(%s),(%s)")
+        self.assertEqual(rows.args, [1, 2, 3, 3])
+
     def test_generate(self):
 
         criterion = IN("totes", ["mai", "goats"])
@@ -448,6 +618,202 @@ class TestIN(unittest.TestCase):
         self.assertEqual(criterion.sql, """%s""")
         self.assertEqual(criterion.args, [False])
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(IN("totes", ["mai", "goats"]).shape(args), (IN, False,
+            (test_expression.COLUMN_NAME, "totes", False, False),
+            (test_expression.LIST, 2, (test_expression.VALUE, False))
+        ))
+        self.assertEqual(IN("totes", [], invert=True).shape(args), (IN, (test_expression.VALUE, False)))
+        self.assertEqual(args, ["mai", "goats", True])
+
+        args = []
+
+        self.assertEqual(CHUNKS(totes__a=[1, 2, 3]).shape(args), (CHUNKS, False, "CHUNKS",
+            ((test_expression.COLUMN_NAME, "totes", True, False), (test_expression.LIST, 2, (test_expression.VALUE, False))),
+            ((test_expression.COLUMN_NAME, "totes", True, False), (test_expression.LIST, (test_expression.VALUE, False)))
+        ))
+        self.assertEqual(args, ['$."a"', 1, 2, '$."a"', 3])
+
+        args = []
+
+        self.assertEqual(ARRAY("totes", [1, 2, 3]).shape(args), (ARRAY, False, "ARRAY", (test_expression.COLUMN_NAME, "totes", False, False)))
+        self.assertEqual(ARRAY("totes", [1, 2, 3, 4]).shape(args), (ARRAY, False, "ARRAY", (test_expression.COLUMN_NAME, "totes", False, False)))
+        self.assertEqual(args, [[1, 2, 3], [1, 2, 3, 4]])
+
+        args = []
+
+        self.assertEqual(ROWS("totes", [1, 2, 3], invert=True).shape(args), (ROWS, True, "VALUES", 3, (test_expression.COLUMN_NAME, "totes", False, False)))
+        self.assertEqual(args, [1, 2, 3])
+
+    def test_normal(self):
+
+        self.assertEqual(IN.normal(IN("totes", ["mai", "goats"]).shape([])), ("IN", False,
+            ("COLUMN_NAME", "totes", False, False),
+            ("LIST", "*", ("VALUE", False))
+        ))
+
+        self.assertEqual(ROWS.normal(ROWS("totes", [1, 2, 3], invert=True).shape([])), ("ROWS", True, "VALUES",
+            ("COLUMN_NAME", "totes", False, False)
+        ))
+
+        self.assertEqual(CHUNKS.normal(CHUNKS("totes", [1, 2, 3, 4, 5]).shape([])), ("CHUNKS", False, "CHUNKS", "*", (
+            ("COLUMN_NAME", "totes", False, False),
+            ("LIST", "*", ("VALUE", False))
+        )))
+
+        self.assertEqual(CHUNKS.normal(CHUNKS("totes", [1, 2, {"a": 1}]).shape([])), ("CHUNKS", False,
+            ("COLUMN_NAME", "totes", False, False),
+            ("LIST", ("VALUE", False), ("VALUE", False), ("VALUE", True))
+        ))
+
+    def test_fingerprint(self):
+
+        self.assertEqual(IN("totes", [1, 2]).fingerprint(), IN("totes", [1, 2, 3]).fingerprint())
+        self.assertEqual(ROWS("totes", [1, 2, 3]).fingerprint(), ROWS("totes", [1, 2, 3, 4]).fingerprint())
+        self.assertEqual(CHUNKS("totes", [1, 2, 3]).fingerprint(), CHUNKS("totes", [1, 2, 3, 4, 5, 6, 7]).fingerprint())
+        self.assertNotEqual(ROWS("totes", [1, 2, 3]).fingerprint(), ROWS("totes", [1, 2, 3], invert=True).fingerprint())
+        self.assertNotEqual(ROWS("totes", [1, 2, 3]).fingerprint(), CHUNKS("totes", [1, 2, 3]).fingerprint())
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        IN("totes", ["mai", "goats"], invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes` NOT IN (%s,%s)""")
+        self.assertEqual(args, ["mai", "goats"])
+
+        sql = []
+        args = []
+
+        IN(totes__a=[]).write(sql, args)
+        self.assertEqual("".join(sql), """%s""")
+        self.assertEqual(args, [False])
+
+        sql = []
+        args = []
+
+        BUCKETED("totes", [1, 2, 3], invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes` NOT IN (%s,%s,%s,%s)""")
+        self.assertEqual(args, [1, 2, 3, 3])
+
+        sql = []
+        args = []
+
+        CHUNKS(totes__a=[1, 2, 3]).write(sql, args)
+        self.assertEqual("".join(sql), """(`totes`#>>%s IN (%s,%s) OR `totes`#>>%s IN (%s))""")
+        self.assertEqual(args, ['$."a"', 1, 2, '$."a"', 3])
+
+        sql = []
+        args = []
+
+        CHUNKS("totes", [1, 2, 3], invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """(`totes` NOT IN (%s,%s) AND `totes` NOT IN (%s))""")
+        self.assertEqual(args, [1, 2, 3])
+
+        sql = []
+        args = []
+
+        ARRAY("totes", [1, 2, 3]).write(sql, args)
+        ARRAY("totes", [1, 2, 3], invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes`=ANY(%s)`totes`!=ALL(%s)""")
+        self.assertEqual(args, [[1, 2, 3], [1, 2, 3]])
+
+        sql = []
+        args = []
+
+        ROWS("totes", [1, 2, 3], invert=True).write(sql, args)
+        self.assertEqual("".join(sql), """`totes` NOT IN (VALUES (%s),(%s),(%s))""")
+        self.assertEqual(args, [1, 2, 3])
+
+        sql = []
+        args = []
+
+        ROWS("totes", [1, 2, 3]).write(sql, args, indent=2)
+        self.assertEqual("".join(sql), """`totes` IN (
+  VALUES (%s),(%s),(%s)
+)""")
+
+    def test_steps_matches(self):
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`totes` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?)", [(value,) for value in [None, *range(10)]])
+
+        def matches(criterion):
+            sql = []
+            args = []
+            criterion.write(sql, args)
+            return connection.execute(f"SELECT `totes` FROM `people` WHERE {''.join(sql).replace('%s', '?')}", args).fetchall()
+
+        for values in [[1, 3, 5, 7], [2, None, 4, 6, 8]]:
+            for invert in [False, True]:
+                expected = matches(IN("totes", values, invert=invert))
+                self.assertEqual(matches(CHUNKS("totes", values, invert=invert)), expected)
+                self.assertEqual(matches(ROWS("totes", values, invert=invert)), expected)
+                self.assertEqual(matches(BUCKETED("totes", values, invert=invert)), expected)
+
+
+class EXISTS(SQL, relations_sql.EXISTS):
+
+    pass
+
+class TestEXISTS(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        subquery = relations_sql.SQL("SELECT 1")
+
+        criterion = EXISTS(subquery)
+        self.assertIsNone(criterion.left)
+        self.assertIs(criterion.right, subquery)
+        self.assertFalse(criterion.invert)
+
+        criterion = EXISTS(subquery, invert=True)
+        self.assertIsNone(criterion.left)
+        self.assertIs(criterion.right, subquery)
+        self.assertTrue(criterion.invert)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "nothing goes on the left of EXISTS, not stuff", EXISTS, "stuff", subquery)
+        self.assertRaisesRegex(relations_sql.SQLError, "nothing goes on the left of EXISTS, not stuff", EXISTS, stuff=subquery)
+        self.assertRaisesRegex(relations_sql.SQLError, "need a subquery not nope", EXISTS, "nope")
+
+    def test___len__(self):
+
+        self.assertEqual(len(EXISTS(relations_sql.SQL("SELECT 1"))), 1)
+
+    def test_generate(self):
+
+        criterion = EXISTS(relations_sql.SQL("SELECT 1 WHERE %s", ["totes"]))
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """EXISTS (SELECT 1 WHERE %s)""")
+        self.assertEqual(criterion.args, ["totes"])
+
+        criterion = EXISTS(relations_sql.SQL("SELECT 1 WHERE %s", ["totes"]), invert=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """NOT EXISTS (SELECT 1 WHERE %s)""")
+        self.assertEqual(criterion.args, ["totes"])
+
+        criterion.generate(indent=2, count=1)
+        self.assertEqual(criterion.sql, """NOT EXISTS (
+    SELECT 1 WHERE %s
+  )""")
+
+    def test_shape(self):
+
+        args = []
+        criterion = EXISTS(relations_sql.SQL("SELECT 1 WHERE %s", ["totes"]), invert=True)
+
+        self.assertEqual(criterion.shape(args), (EXISTS, True, (relations_sql.SQL, "SELECT 1 WHERE %s")))
+        self.assertEqual(args, ["totes"])
+
 
 class CONTAINS(SQL, relations_sql.CONTAINS):
 
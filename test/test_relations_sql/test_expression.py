@@ -44,6 +44,28 @@ class TestEXPRESSION(unittest.TestCase):
         self.assertEqual(sql, ["fee", "foe"])
         self.assertEqual(expression.args, ["fie", "fum"])
 
+        sql = []
+        expression.args = ["fee"]
+        value = VALUE("fie")
+
+        expression.express(value, sql, args=expression.args)
+        self.assertEqual(sql, ["%s"])
+        self.assertEqual(expression.args, ["fee", "fie"])
+        self.assertIsNone(value.sql)
+
+    def test_pieces(self):
+
+        self.assertEqual(relations_sql.EXPRESSION.pieces("%s=%s", 2), ["", "=", ""])
+        self.assertEqual(relations_sql.EXPRESSION.pieces("JSON(%s)", 1), ["JSON(", ")"])
+
+    def test_delimit(self):
+
+        kwargs = {"count": 1}
+        fee = relations_sql.SQL("fee")
+        foe = relations_sql.SQL("foe")
+
+        self.assertEqual(relations_sql.EXPRESSION.delimit([fee, None, foe], ",", kwargs), [(fee, kwargs), ",", (foe, kwargs)])
+
 
 class VALUE(test_sql.SQL, relations_sql.VALUE):
     pass
@@ -66,6 +88,20 @@ class TestVALUE(unittest.TestCase):
         self.assertEqual(expression.value, {"a": 1})
         self.assertTrue(expression.jsonify)
 
+    def test_jsonifies(self):
+
+        self.assertFalse(VALUE.jsonifies(None))
+        self.assertFalse(VALUE.jsonifies("unit"))
+        self.assertFalse(VALUE.jsonifies(1.5))
+        self.assertTrue(VALUE.jsonifies({"a": 1}))
+        self.assertTrue(VALUE.jsonifies({1}))
+
+    def test_arg(self):
+
+        self.assertEqual(VALUE.arg("unit", False), "unit")
+        self.assertEqual(VALUE.arg("unit", True), '"unit"')
+        self.assertEqual(VALUE.arg({2, 1}, True), '[1, 2]')
+
     def test_generate(self):
 
         expression = VALUE(None)
@@ -93,6 +129,37 @@ class TestVALUE(unittest.TestCase):
         self.assertEqual(expression.sql, """JSON(%s)""")
         self.assertEqual(expression.args, ['["a", "b"]'])
 
+        args = ["unit"]
+        expression = VALUE("test")
+        expression.generate(args=args)
+        self.assertEqual(expression.sql, """%s""")
+        self.assertIs(expression.args, args)
+        self.assertEqual(args, ["unit", "test"])
+
+    def test_argument(self):
+
+        self.assertEqual(VALUE("unit").argument(), "unit")
+        self.assertEqual(VALUE("test", jsonify=True).argument(), '"test"')
+        self.assertEqual(VALUE({'a', 'b'}).argument(), '["a", "b"]')
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(VALUE("unit").shape(args), (VALUE, False))
+        self.assertEqual(VALUE({"a": 1}).shape(args), (VALUE, True))
+        self.assertEqual(args, ["unit", '{"a": 1}'])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        VALUE("unit").write(sql, args)
+        VALUE({"a": 1}).write(sql, args)
+        self.assertEqual("".join(sql), """%sJSON(%s)""")
+        self.assertEqual(args, ["unit", '{"a": 1}'])
+
 
 class NOT(test_sql.SQL, relations_sql.NOT):
 
@@ -126,6 +193,33 @@ class TestNOT(unittest.TestCase):
         expression.generate(indent=2)
         self.assertEqual(expression.sql, """NOT test""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NOT("unit").shape(args), (NOT, (VALUE, False)))
+        self.assertEqual(args, ["unit"])
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        NOT("unit").write(sql, args, indent=2)
+        self.assertEqual("".join(sql), """NOT %s""")
+        self.assertEqual(args, ["unit"])
+
+    def test_generate_deep(self):
+
+        expression = relations_sql.SQL("unit", ["test"])
+
+        for _ in range(5000):
+            expression = NOT(expression)
+
+        expression.generate()
+        self.assertEqual(expression.sql, f"{'NOT ' * 5000}unit")
+        self.assertEqual(expression.args, ["test"])
+
 
 class LIST(test_sql.SQL, relations_sql.LIST):
 
@@ -161,6 +255,34 @@ class TestLIST(unittest.TestCase):
         self.assertEqual(expression.expressions[1].value, {"b": 2})
         self.assertTrue(expression.expressions[1].jsonify)
 
+    def test_bucket(self):
+
+        self.assertEqual(LIST.bucket(5, None), 5)
+        self.assertEqual(LIST.bucket(0, "POWERS"), 0)
+        self.assertEqual(LIST.bucket(1, "POWERS"), 1)
+        self.assertEqual(LIST.bucket(5, "POWERS"), 8)
+        self.assertEqual(LIST.bucket(8, "POWERS"), 8)
+        self.assertEqual(LIST.bucket(9, "POWERS"), 16)
+        self.assertEqual(LIST.bucket(3, [1, 5, 10]), 5)
+        self.assertEqual(LIST.bucket(10, [1, 5, 10]), 10)
+        self.assertEqual(LIST.bucket(11, [1, 5, 10]), 20)
+
+    def test_padded(self):
+
+        expression = LIST(["unit", "test", "more"])
+        self.assertEqual(expression.padded(), expression.expressions)
+
+        expression.buckets = "POWERS"
+        self.assertEqual(expression.padded(), expression.expressions + expression.expressions[-1:])
+
+        class BUCKETED(LIST):
+            BUCKETS = [5]
+
+        expression = BUCKETED(["unit", "test", "more"])
+        self.assertEqual([each.value for each in expression.padded()], ["unit", "test", "more", "more", "more"])
+        self.assertEqual(len(expression), 3)
+        self.assertEqual(BUCKETED([]).padded(), [])
+
     def test___len__(self):
 
         expression = LIST([])
@@ -198,6 +320,64 @@ JSON(%s)""")
         self.assertEqual(expression.sql, """JSON(%s),
     JSON(%s)""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(LIST([]).shape(args), (LIST,))
+        self.assertEqual(LIST(["unit"]).shape(args), (LIST, (VALUE, False)))
+        self.assertEqual(LIST(["unit", "test"]).shape(args), (LIST, 2, (VALUE, False)))
+        self.assertEqual(LIST(["unit", {"a": 1}]).shape(args), (LIST, (VALUE, False), (VALUE, True)))
+        self.assertEqual(args, ["unit", "unit", "test", "unit", '{"a": 1}'])
+
+        args = []
+        expression = LIST(["unit", "test", "more"])
+        expression.buckets = "POWERS"
+
+        self.assertEqual(expression.shape(args), (LIST, 4, (VALUE, False)))
+        self.assertEqual(args, ["unit", "test", "more", "more"])
+
+    def test_items(self):
+
+        self.assertEqual(LIST.items((LIST,)), [])
+        self.assertEqual(LIST.items((LIST, (VALUE, False))), [(VALUE, False)])
+        self.assertEqual(LIST.items((LIST, 3, (VALUE, False))), [(VALUE, False)] * 3)
+        self.assertEqual(LIST.items((LIST, (VALUE, False), (VALUE, True))), [(VALUE, False), (VALUE, True)])
+
+    def test_normal(self):
+
+        self.assertEqual(LIST.normal(LIST([]).shape([])), ("LIST",))
+        self.assertEqual(LIST.normal(LIST(["unit"]).shape([])), ("LIST", "*", ("VALUE", False)))
+        self.assertEqual(LIST.normal(LIST(["unit", "test", "more"]).shape([])), ("LIST", "*", ("VALUE", False)))
+        self.assertEqual(LIST.normal(LIST(["unit", {"a": 1}]).shape([])), ("LIST", ("VALUE", False), ("VALUE", True)))
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        LIST(["unit", "test"]).write(sql, args)
+        self.assertEqual("".join(sql), """%s,%s""")
+        self.assertEqual(args, ["unit", "test"])
+
+        sql = []
+        args = []
+
+        LIST([{"a": 1}, {"b": 2}]).write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """JSON(%s),
+  JSON(%s)""")
+        self.assertEqual(args, ['{"a": 1}', '{"b": 2}'])
+
+        sql = []
+        args = []
+
+        expression = LIST(["unit", "test", "more"])
+        expression.buckets = "POWERS"
+
+        expression.write(sql, args)
+        self.assertEqual("".join(sql), """%s,%s,%s,%s""")
+        self.assertEqual(args, ["unit", "test", "more", "more"])
+
 
 class NAME(test_sql.SQL, relations_sql.NAME):
     pass
@@ -220,8 +400,13 @@ class TestNAME(unittest.TestCase):
     def test_set(self):
 
         expression = NAME("")
+        clause = relations_sql.CLAUSE()
+        clause.adopt(expression)
+        stamp = clause.dirty
+
         expression.set("people")
         self.assertEqual(expression.name, "people")
+        self.assertGreater(clause.dirty, stamp)
 
     def test___len__(self):
 
@@ -235,6 +420,22 @@ class TestNAME(unittest.TestCase):
         self.assertEqual(expression.sql, """`people`""")
         self.assertEqual(expression.args, [])
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NAME("people").shape(args), (NAME, "people"))
+        self.assertEqual(args, [])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        NAME("unit").write(sql, args)
+        self.assertEqual(sql, ["`unit`"])
+        self.assertEqual(args, [])
+
 
 class SCHEMA_NAME(test_sql.SQL, relations_sql.SCHEMA_NAME):
     pass
@@ -382,6 +583,36 @@ class TestTABLE_NAME(unittest.TestCase):
         expression.generate(indent=2, count=2)
         self.assertEqual(expression.sql, """  `people`.`stuff`""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(TABLE_NAME("people").shape(args), (TABLE_NAME, "people", None))
+        self.assertEqual(TABLE_NAME("stuff.people", prefix="FROM").shape(args),
+            (TABLE_NAME, "people", "FROM", (SCHEMA_NAME, "stuff"))
+        )
+        self.assertEqual(args, [])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        TABLE_NAME("stuff", schema=relations_sql.SQL("unit", ["test"])).write(sql, args)
+        self.assertEqual("".join(sql), """unit.`stuff`""")
+        self.assertEqual(args, ["test"])
+
+        sql = []
+
+        TABLE_NAME("people.stuff", prefix="PRE").write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """PRE
+    `people`.`stuff`""")
+
+        sql = []
+
+        TABLE_NAME("people.stuff", prefix="").write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """  `people`.`stuff`""")
+
 
 class COLUMN_NAME(test_sql.SQL, relations_sql.COLUMN_NAME):
 
@@ -513,6 +744,61 @@ class TestCOLUMN_NAME(unittest.TestCase):
         self.assertEqual(expression.sql, """unit.`stuff`.`things`#>>%s""")
         self.assertEqual(expression.args, ["test", '$."a"[0][-1]."2"."-3"'])
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(COLUMN_NAME("people.stuff").shape(args),
+            (COLUMN_NAME, "stuff", False, False, (TABLE_NAME, "people", None))
+        )
+        self.assertEqual(args, [])
+
+        self.assertEqual(COLUMN_NAME("stuff__a", jsonify=True).shape(args), (COLUMN_NAME, "stuff", True, True))
+        self.assertEqual(args, ['$."a"'])
+
+    def test_outline(self):
+
+        args = []
+
+        self.assertEqual(COLUMN_NAME("stuff__a").outline(args), (COLUMN_NAME, "stuff", True, False))
+        self.assertEqual(args, ['$."a"'])
+
+        self.assertIsInstance(COLUMN_NAME("people.stuff").outline(args), relations_sql.GENERATOR)
+
+    def test_tabled(self):
+
+        args = []
+        tabled = COLUMN_NAME("people.stuff__a").tabled(args)
+
+        self.assertIsInstance(next(tabled), TABLE_NAME)
+
+        with self.assertRaises(StopIteration) as stop:
+            tabled.send([(TABLE_NAME, "people", None)])
+
+        self.assertEqual(stop.exception.value, (COLUMN_NAME, "stuff", True, False, (TABLE_NAME, "people", None)))
+        self.assertEqual(args, ['$."a"'])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        COLUMN_NAME("*").write(sql, args)
+        self.assertEqual("".join(sql), """*""")
+
+        sql = []
+
+        COLUMN_NAME("people.stuff.things", jsonify=True).write(sql, args)
+        self.assertEqual("".join(sql), """JSON(`people`.`stuff`.`things`)""")
+        self.assertEqual(args, [])
+
+        sql = []
+        table = relations_sql.SQL("test", ["unit"])
+
+        COLUMN_NAME("people.stuff.things__a__0___1____2_____3", table=table).write(sql, args)
+        self.assertEqual("".join(sql), """test.`things`#>>%s""")
+        self.assertEqual(args, ["unit", '$."a"[0][-1]."2"."-3"'])
+
 
 class NAMES(test_sql.SQL, relations_sql.NAMES):
 
@@ -581,6 +867,32 @@ class TestCOLUMN_NAMES(unittest.TestCase):
         test
       )""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(COLUMN_NAMES(["unit", "test"]).shape(args),
+            (COLUMN_NAMES, (COLUMN_NAME, "unit", False, False), (COLUMN_NAME, "test", False, False))
+        )
+        self.assertEqual(args, [])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        COLUMN_NAMES(["unit", relations_sql.SQL("test")]).write(sql, args)
+        self.assertEqual("".join(sql), """(`unit`,test)""")
+        self.assertEqual(args, [])
+
+        sql = []
+
+        COLUMN_NAMES(["unit", relations_sql.SQL("test")]).write(sql, args, indent=2, count=1)
+        self.assertEqual("".join(sql), """  (
+      `unit`,
+      test
+    )""")
+
 
 class AS(test_sql.SQL, relations_sql.AS):
 
@@ -631,6 +943,24 @@ class TestAS(unittest.TestCase):
         expression.generate(indent=2)
         self.assertEqual(expression.sql, """test AS unit""")
 
+    def test_shape(self):
+
+        args = []
+        column = relations_sql.SQL("test", ["unit"])
+
+        self.assertEqual(AS("people", column).shape(args), (AS, (relations_sql.SQL, "test"), (NAME, "people")))
+        self.assertEqual(args, ["unit"])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+        column = relations_sql.SQL("test", ["unit"])
+
+        AS("people", column).write(sql, args)
+        self.assertEqual("".join(sql), """test AS `people`""")
+        self.assertEqual(args, ["unit"])
+
 
 ASC = relations_sql.ASC
 DESC = relations_sql.DESC
@@ -703,6 +1033,34 @@ class TestORDER(unittest.TestCase):
         expression = ORDER(column)
         self.assertFalse(expression.generate())
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(ORDER("people").shape(args), (ORDER, (COLUMN_NAME, "people", False, False), None))
+        self.assertEqual(ORDER(people=DESC).shape(args), (ORDER, (COLUMN_NAME, "people", False, False), "DESC"))
+        self.assertEqual(ORDER(relations_sql.SQL("", [])).shape(args), (ORDER,))
+        self.assertEqual(args, [])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        ORDER(people=DESC).write(sql, args)
+        self.assertEqual("".join(sql), """`people` DESC""")
+
+        sql = []
+
+        ORDER(relations_sql.SQL("test", ["unit"])).write(sql, args)
+        self.assertEqual("".join(sql), """test""")
+        self.assertEqual(args, ["unit"])
+
+        sql = []
+
+        ORDER(relations_sql.SQL("", [])).write(sql, args)
+        self.assertEqual("".join(sql), "")
+
 
 class ASSIGN(test_sql.SQL, relations_sql.ASSIGN):
 
@@ -750,3 +1108,20 @@ class TestASSIGN(unittest.TestCase):
 
         expression.generate(indent=2)
         self.assertEqual(expression.sql, """unit=test""")
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(ASSIGN("people", "stuff").shape(args), (ASSIGN, (NAME, "people"), (VALUE, False)))
+        self.assertEqual(args, ["stuff"])
+
+    def test_write(self):
+
+        sql = []
+        args = []
+
+        ASSIGN("people", "stuff").write(sql, args)
+        self.assertEqual("".join(sql), """`people`=%s""")
+        self.assertEqual(args, ["stuff"])
+
@@ -3,14 +3,66 @@ import unittest.mock
 
 import test_expression
 import test_criterion
+import test_criteria
 import test_clause
 
 import copy
+import sqlite3
 import collections
+import concurrent.futures
 
 import relations_sql
 
 
+class TestCACHE(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        cache = relations_sql.CACHE(2)
+
+        self.assertEqual(cache.size, 2)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+
+        cache = relations_sql.CACHE(2)
+        cache.set("unit", "test")
+        cache.get("unit")
+
+        cache.clear()
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_get(self):
+
+        cache = relations_sql.CACHE(2)
+
+        self.assertIsNone(cache.get("unit"))
+        self.assertEqual(cache.misses, 1)
+
+        cache.set("unit", "test")
+        self.assertEqual(cache.get("unit"), "test")
+        self.assertEqual(cache.hits, 1)
+
+    def test_set(self):
+
+        cache = relations_sql.CACHE(2)
+
+        cache.set("fee", "fie")
+        cache.set("foe", "fum")
+        cache.get("fee")
+        cache.set("yin", "yang")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("fee"), "fie")
+        self.assertIsNone(cache.get("foe"))
+        self.assertEqual(cache.get("yin"), "yang")
+
+
 class QUERY(relations_sql.QUERY):
 
     NAME = "QUERY"
@@ -36,6 +88,7 @@ class TestQUERY(unittest.TestCase):
         self.assertEqual(query.SELECT.expressions[0].table.name, "people")
         self.assertEqual(query.SELECT.expressions[0].name, "stuff")
         self.assertEqual(query.FROM.expressions[0].name, "things")
+        self.assertEqual(query.FROM.parent, query)
 
         self.assertRaisesRegex(TypeError, "'nope' is an invalid keyword argument for QUERY", QUERY, nope=False)
 
@@ -147,6 +200,35 @@ FROM
       `things`""")
 
 
+    def test_generate_cached(self):
+
+        class CACHED(QUERY):
+            CACHED = 2
+
+        CACHED.cache().clear()
+
+        query = CACHED(SELECT="people.stuff", FROM="things")
+        query.generate()
+        self.assertEqual(query.sql, """QUERY `people`.`stuff` FROM `things`""")
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (0, 1))
+
+        query = CACHED(SELECT="people.stuff", FROM="things")
+        query.generate()
+        self.assertEqual(query.sql, """QUERY `people`.`stuff` FROM `things`""")
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (1, 1))
+
+        query.generate(indent=2)
+        self.assertEqual(query.sql, """QUERY
+  `people`.`stuff`
+FROM
+  `things`""")
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (1, 2))
+
+        query.SELECT("yin")
+        query.generate()
+        self.assertEqual(query.sql, """QUERY `people`.`stuff`,`yin` FROM `things`""")
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (1, 3))
+
     def test_copy(self):
 
         query = QUERY(SELECT="people.stuff", FROM="things")
@@ -163,15 +245,120 @@ FROM
         self.assertIsNone(clone.clauses["FROM"].sql)
         self.assertIsNone(clone.clauses["FROM"].args)
 
+        where = test_clause.FROM("stuff")
+        clone = query.copy(FROM=where)
+
+        self.assertIsInstance(clone, QUERY)
+        self.assertIsNot(clone.SELECT, query.SELECT)
+        self.assertEqual(clone.SELECT.expressions, query.SELECT.expressions)
+        self.assertIs(clone.SELECT.query, clone)
+        self.assertIs(query.SELECT.query, query)
+        self.assertIs(clone.FROM, where)
+        self.assertIs(clone.FROM.query, clone)
+        self.assertIsNot(query.FROM, where)
+
+        clone.SELECT("people.things")
+        self.assertEqual(len(clone.SELECT.expressions), 2)
+        self.assertEqual(len(query.SELECT.expressions), 1)
+
+    def test_estimate(self):
+
+        self.assertEqual(QUERY.estimate("unit"), 4)
+        self.assertEqual(QUERY.estimate(b"unit"), 4)
+        self.assertEqual(QUERY.estimate(1), 8)
+
+    def test_fits(self):
+
+        class LIMITS(QUERY):
+            MAX_ARGS = 2
+            MAX_SQL_BYTES = 20
+
+        self.assertTrue(QUERY().fits(relations_sql.COMPILED("x" * 100, (1, 2, 3))))
+        self.assertTrue(LIMITS().fits(relations_sql.COMPILED("xx", (1, 2))))
+        self.assertFalse(LIMITS().fits(relations_sql.COMPILED("xx", (1, 2, 3))))
+        self.assertFalse(LIMITS().fits(relations_sql.COMPILED("xxxxx", (1, 2))))
+
+    def test_cache(self):
+
+        class UNCACHED(QUERY):
+            CACHED = None
+
+        class REGENERATED(QUERY):
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+
+        self.assertIsInstance(QUERY.cache(), relations_sql.CACHE)
+        self.assertIs(QUERY.cache(), QUERY.cache())
+        self.assertIsNot(QUERY.cache(), SELECT.cache())
+        self.assertIsNone(UNCACHED.cache())
+        self.assertIsNone(REGENERATED.cache())
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(QUERY(SELECT="people.stuff", FROM="things").shape(args), (QUERY,
+            (test_clause.FIELDS, (test_expression.COLUMN_NAME, "stuff", False, False, (test_expression.TABLE_NAME, "people", None))),
+            (test_clause.FROM, (test_expression.TABLE_NAME, "things", None))
+        ))
+        self.assertEqual(args, [])
+
+    def test_steps(self):
+
+        class CACHED(QUERY):
+            CACHED = 2
+
+        class REGENERATED(QUERY):
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+
+        CACHED.cache().clear()
+
+        sql = ["("]
+        args = []
+
+        CACHED(SELECT="people.stuff", FROM="things").write(sql, args, indent=2, count=1)
+        sql.append(")")
+        self.assertEqual("".join(sql), """(QUERY
+    `people`.`stuff`
+  FROM
+    `things`)""")
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (0, 1))
+
+        sql = []
+
+        CACHED(SELECT="people.stuff", FROM="things").write(sql, args, indent=2, count=1)
+        self.assertEqual(sql, ["""QUERY
+    `people`.`stuff`
+  FROM
+    `things`"""])
+        self.assertEqual((CACHED.cache().hits, CACHED.cache().misses), (1, 1))
+
+        query = REGENERATED(SELECT="people.stuff", FROM="things")
+
+        query.generate()
+        self.assertEqual(query.sql, """QUERY `people`.`stuff` FROM `things`""")
+        self.assertEqual(query.args, [])
+
+        sql = []
+
+        query.write(sql, args)
+        self.assertEqual(sql, ["""QUERY `people`.`stuff` FROM `things`"""])
+
 ASC = test_expression.ASC
 DESC = test_expression.DESC
 
 class SELECT(relations_sql.SELECT):
 
+    EQ = test_criterion.EQ
+    TABLE_NAME = test_expression.TABLE_NAME
+    COLUMN_NAME = test_expression.COLUMN_NAME
+
     CLAUSES = collections.OrderedDict([
         ("OPTIONS", test_clause.OPTIONS),
         ("FIELDS", test_clause.FIELDS),
         ("FROM", test_clause.FROM),
+        ("JOIN", test_clause.JOIN),
         ("WHERE", test_clause.WHERE),
         ("GROUP_BY", test_clause.GROUP_BY),
         ("HAVING", test_clause.HAVING),
@@ -370,6 +557,508 @@ LIMIT %s OFFSET %s""")
       `yang` DESC
     LIMIT %s OFFSET %s""")
 
+    def test_generate_cached(self):
+
+        SELECT.cache().clear()
+
+        def query(value, values):
+            return SELECT("*").FROM("people").WHERE(stuff__gt=value, things__in=values).LIMIT(5, value)
+
+        first = query(1, [1, 2])
+        first.generate()
+
+        second = query(3, [4, 5])
+        second.generate()
+        self.assertEqual(second.sql, first.sql)
+        self.assertEqual(second.args, [3, 4, 5, 5, 3])
+
+        third = query(3, [4, 5, 6])
+        third.generate()
+        self.assertEqual(third.sql, "SELECT * FROM `people` WHERE `stuff`>%s AND `things` IN (%s,%s,%s) LIMIT %s OFFSET %s")
+        self.assertEqual(third.args, [3, 4, 5, 6, 5, 3])
+
+        self.assertEqual((SELECT.cache().hits, SELECT.cache().misses), (1, 2))
+
+    def test_generate_recorded(self):
+
+        subquery = SELECT("id").FROM("stuff")
+        query = SELECT("*").FROM("people").WHERE(id__in=subquery)
+
+        self.assertEqual(query.compile().sql, "SELECT * FROM `people` WHERE `id` IN (SELECT `id` FROM `stuff`)")
+
+        subquery.WHERE(things=1)
+        self.assertEqual(query.compile().sql, "SELECT * FROM `people` WHERE `id` IN (SELECT `id` FROM `stuff` WHERE `things`=%s)")
+
+        subquery.WHERE.expressions[0].left.set("others")
+        self.assertEqual(query.compile().sql, "SELECT * FROM `people` WHERE `id` IN (SELECT `id` FROM `stuff` WHERE `others`=%s)")
+
+        subquery.WHERE = test_clause.WHERE(y=2)
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `id` IN (SELECT `id` FROM `stuff` WHERE `y`=%s)", (2,)))
+
+        subquery.LIMIT = test_clause.LIMIT(1, 5)
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `id` IN (SELECT `id` FROM `stuff` WHERE `y`=%s LIMIT %s OFFSET %s)", (2, 1, 5)))
+
+    def test_fingerprint(self):
+
+        fingerprint = SELECT("*").FROM("people").WHERE(stuff__in=[1, 2, 3], things__gt=2).LIMIT(5).fingerprint()
+
+        self.assertEqual(SELECT("*").FROM("people").WHERE(things__gt=9).WHERE(stuff__in=[4]).LIMIT(7).fingerprint(), fingerprint)
+        self.assertNotEqual(SELECT("*").FROM("people").WHERE(things__gt=9).LIMIT(7).fingerprint(), fingerprint)
+        self.assertNotEqual(SELECT("*").FROM("people").WHERE(stuff__in=[1, 2, 3], things__lt=2).LIMIT(5).fingerprint(), fingerprint)
+        self.assertNotEqual(SELECT("*").FROM("people").WHERE(stuff__in=[1, 2, 3], things__gt=2).LIMIT(5, 10).fingerprint(), fingerprint)
+
+    def test_normalize(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff__in=SELECT("id").FROM("things").WHERE(a=1), b__gt=2).LIMIT(5)
+
+        self.assertEqual(query.normalize(), query.normals(query.shape([])))
+        self.assertIs(query.normalize()[3], query.WHERE.normalize())
+
+    def test_seek(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff="things").ORDER_BY("id").LIMIT(2)
+
+        self.assertEqual(query.seek([5]), query)
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `stuff`=%s AND `id`>%s ORDER BY `id` LIMIT %s", ("things", 5, 2)))
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER, `name` TEXT, `age` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?,?,?)", [
+            (id, f"name{id % 3}", id % 4) for id in range(20)
+        ])
+
+        columns = {"id": 0, "name": 1, "age": 2}
+
+        def pages(orders, expand=False):
+
+            rows = []
+            last = None
+
+            while True:
+                query = SELECT("*").FROM("people").ORDER_BY(*[test_expression.ORDER(**{column: order}) for column, order in orders]).LIMIT(3)
+                if last is not None:
+                    query.seek(last, expand=expand)
+                compiled = query.compile()
+                page = connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+                if not page:
+                    return rows
+                rows.extend(page)
+                last = [page[-1][columns[column]] for column, order in orders]
+
+        for orders in [
+            [("id", None)],
+            [("name", None), ("id", None)],
+            [("name", test_clause.DESC), ("age", test_clause.ASC), ("id", None)],
+            [("age", test_clause.DESC), ("id", test_clause.DESC)]
+        ]:
+            expected = connection.execute(
+                SELECT("*").FROM("people").ORDER_BY(*[test_expression.ORDER(**{column: order}) for column, order in orders]).compile().sql
+            ).fetchall()
+            self.assertEqual(len(expected), 20)
+            self.assertEqual(pages(orders), expected)
+            self.assertEqual(pages(orders, expand=True), expected)
+
+    def test_qualify(self):
+
+        table = test_expression.TABLE_NAME("people")
+
+        column = test_expression.COLUMN_NAME("stuff")
+        qualified = SELECT.qualify(column, table)
+        self.assertIsNot(qualified, column)
+        self.assertIsNone(column.table)
+        self.assertIs(qualified.table, table)
+
+        column = test_expression.COLUMN_NAME("things.stuff")
+        self.assertIs(SELECT.qualify(column, table), column)
+
+        qualified = SELECT.qualify(test_expression.AS("yin", test_expression.COLUMN_NAME("stuff")), table)
+        qualified.generate()
+        self.assertEqual(qualified.sql, "`people`.`stuff` AS `yin`")
+
+        qualified = SELECT.qualify(test_expression.ORDER(stuff=test_clause.DESC), table)
+        qualified.generate()
+        self.assertEqual(qualified.sql, "`people`.`stuff` DESC")
+
+        value = test_expression.VALUE(1)
+        self.assertIs(SELECT.qualify(value, table), value)
+
+        column = test_expression.COLUMN_NAME("total")
+        self.assertIs(SELECT.qualify(column, table, ["total"]), column)
+
+        qualified = SELECT.qualify(test_expression.ORDER(total=test_clause.DESC), table, ["total"])
+        qualified.generate()
+        self.assertEqual(qualified.sql, "`total` DESC")
+
+    def test_deferred(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff="things").ORDER_BY(name=test_clause.DESC).LIMIT(2, 4)
+        deferred = query.deferred()
+
+        self.assertEqual(deferred.compile(), (
+            "SELECT `people`.* FROM `people`,(SELECT `id` FROM `people` WHERE `stuff`=%s ORDER BY `name` DESC LIMIT %s OFFSET %s) AS `deferred` "
+            "WHERE `people`.`id`=(`deferred`.`id`) ORDER BY `people`.`name` DESC",
+            ("things", 2, 4)
+        ))
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `stuff`=%s ORDER BY `name` DESC LIMIT %s OFFSET %s", ("things", 2, 4)))
+
+        self.assertEqual(SELECT("name").FROM(p="people").LIMIT(2).deferred("key", "page").compile(), (
+            "SELECT `p`.`name` FROM `people` AS `p`,(SELECT `key` FROM `people` AS `p` LIMIT %s) AS `page` WHERE `p`.`key`=(`page`.`key`)",
+            (2,)
+        ))
+
+        self.assertRaisesRegex(relations_sql.SQLError, "can't defer with GROUP_BY", SELECT("*").FROM("people").GROUP_BY("name").LIMIT(2).deferred)
+        self.assertRaisesRegex(relations_sql.SQLError, "can't defer with JOIN", SELECT("*").FROM("people").JOIN("stuff").LIMIT(2).deferred)
+        self.assertRaisesRegex(relations_sql.SQLError, "need LIMIT to defer", SELECT("*").FROM("people").deferred)
+        self.assertRaisesRegex(relations_sql.SQLError, "need a single table to defer", SELECT("*").FROM("people", "things").LIMIT(2).deferred)
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY, `name` TEXT, `age` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?,?,?)", [
+            (id, f"name{id % 3}", id % 4) for id in range(20)
+        ])
+
+        def fetch(query):
+            compiled = query.compile()
+            return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        for offset in [0, 5, 18]:
+            query = SELECT("*", "age").FROM("people").WHERE(age__gt=0).ORDER_BY(name=test_clause.DESC).ORDER_BY("id").LIMIT(4, offset)
+            self.assertEqual(fetch(query.deferred()), fetch(query))
+
+        query = SELECT("*", total=relations_sql.SQL("age * 2")).FROM("people").ORDER_BY(total=test_clause.DESC).ORDER_BY("id").LIMIT(4, 2)
+
+        self.assertEqual(query.deferred().compile(), (
+            "SELECT `people`.*,age * 2 AS `total` FROM `people`,"
+            "(SELECT `id`,age * 2 AS `total` FROM `people` ORDER BY `total` DESC,`id` LIMIT %s OFFSET %s) AS `deferred` "
+            "WHERE `people`.`id`=(`deferred`.`id`) ORDER BY `total` DESC,`people`.`id`",
+            (4, 2)
+        ))
+        self.assertEqual(fetch(query.deferred()), fetch(query))
+
+    def test_copy(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff=1).ORDER_BY("id").LIMIT(5)
+        compiled = query.compile()
+
+        for derived in [query.counted(), query.deferred(), *query.totaled()]:
+            derived.WHERE(things=2)
+            derived.ORDER_BY("name")
+            derived.LIMIT.add(10)
+
+        rows = query.copy()
+        rows.FIELDS("name")
+        rows.WHERE.expressions[0].left.set("others")
+
+        self.assertEqual(query.compile().args, compiled.args)
+        self.assertEqual(query.compile().sql, compiled.sql.replace("`stuff`", "`others`"))
+
+    def test_distinct(self):
+
+        self.assertFalse(SELECT("*").distinct())
+        self.assertFalse(SELECT("*").OPTIONS("FAST").distinct())
+        self.assertTrue(SELECT("*").OPTIONS("distinct").distinct())
+
+    def test_counted(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff="things").ORDER_BY("name").LIMIT(2, 4)
+
+        self.assertEqual(query.counted().compile(), ("SELECT COUNT(*) AS `total` FROM `people` WHERE `stuff`=%s", ("things",)))
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `stuff`=%s ORDER BY `name` LIMIT %s OFFSET %s", ("things", 2, 4)))
+
+        self.assertEqual(query.counted("id", "count").compile(), ("SELECT COUNT(DISTINCT `id`) AS `count` FROM `people` WHERE `stuff`=%s", ("things",)))
+
+        self.assertEqual(SELECT("name").OPTIONS("DISTINCT").FROM("people").ORDER_BY("name").counted().compile(), (
+            "SELECT COUNT(*) AS `total` FROM (SELECT DISTINCT `name` FROM `people`) AS `counted`",
+            ()
+        ))
+
+        self.assertEqual(SELECT("name").FROM("people").GROUP_BY("name").LIMIT(2).counted().compile(), (
+            "SELECT COUNT(*) AS `total` FROM (SELECT 1 FROM `people` GROUP BY `name`) AS `counted`",
+            ()
+        ))
+
+        self.assertEqual(SELECT(number=relations_sql.SQL("COUNT(*)")).FROM("people").GROUP_BY("name").HAVING(number__gt=1).counted().compile(), (
+            "SELECT COUNT(*) AS `total` FROM (SELECT COUNT(*) AS `number` FROM `people` GROUP BY `name` HAVING `number`>%s) AS `counted`",
+            (1,)
+        ))
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY, `name` TEXT, `age` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?,?,?)", [
+            (id, f"name{id % 3}", id % 4) for id in range(20)
+        ])
+
+        def fetch(query):
+            compiled = query.compile()
+            return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        for query in [
+            SELECT("*").FROM("people").WHERE(age__gt=0).ORDER_BY("name").LIMIT(3, 2),
+            SELECT("name").OPTIONS("DISTINCT").FROM("people").WHERE(age__gt=1),
+            SELECT("name", "age").FROM("people").GROUP_BY("name", "age"),
+            SELECT(number=relations_sql.SQL("COUNT(*)")).FROM("people").GROUP_BY("age").HAVING(number__gt=4)
+        ]:
+            self.assertEqual(fetch(query.counted()), [(len(fetch(query.copy(LIMIT=test_clause.LIMIT()))),)])
+
+    def test_totaled(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff="things").ORDER_BY("name").LIMIT(2, 4)
+
+        self.assertEqual([each.compile() for each in query.totaled()], [(
+            "SELECT *,COUNT(*) OVER () AS `total` FROM `people` WHERE `stuff`=%s ORDER BY `name` LIMIT %s OFFSET %s",
+            ("things", 2, 4)
+        )])
+        self.assertEqual(query.compile(), ("SELECT * FROM `people` WHERE `stuff`=%s ORDER BY `name` LIMIT %s OFFSET %s", ("things", 2, 4)))
+
+        class UNWINDOWED(SELECT):
+            WINDOW = False
+
+        query = UNWINDOWED("*").FROM("people").WHERE(stuff="things").ORDER_BY("name").LIMIT(2, 4)
+        totaled = query.totaled("count")
+
+        self.assertIs(totaled[0], query)
+        self.assertEqual(totaled[1].compile(), ("SELECT COUNT(*) AS `count` FROM `people` WHERE `stuff`=%s", ("things",)))
+
+        query = SELECT("name").OPTIONS("DISTINCT").FROM("people").LIMIT(2)
+        self.assertEqual([each.compile() for each in query.totaled()], [
+            ("SELECT DISTINCT `name` FROM `people` LIMIT %s", (2,)),
+            ("SELECT COUNT(*) AS `total` FROM (SELECT DISTINCT `name` FROM `people`) AS `counted`", ())
+        ])
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY, `name` TEXT, `age` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?,?,?)", [
+            (id, f"name{id % 3}", id % 4) for id in range(20)
+        ])
+
+        def fetch(query):
+            compiled = query.compile()
+            return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        for query in [
+            SELECT("id", "name").FROM("people").WHERE(age__gt=0).ORDER_BY("id").LIMIT(3, 2),
+            SELECT("name", "age").FROM("people").GROUP_BY("name", "age").ORDER_BY("name", "age").LIMIT(5)
+        ]:
+            total = fetch(query.counted())[0][0]
+            self.assertEqual(fetch(query.totaled()[0]), [(*row, total) for row in fetch(query)])
+
+    def test_generate_joins(self):
+
+        query = SELECT("people.name", "stuff.value").FROM("people").JOIN(
+            "stuff", {"stuff.people_id": test_expression.COLUMN_NAME("people.id")}
+        ).LEFT_JOIN(
+            {"other": "things"}, {"other.stuff_id": test_expression.COLUMN_NAME("stuff.id"), "other.value__gt": 1}
+        ).WHERE(
+            {"people.name__not_eq": "Bob"}
+        )
+
+        self.assertEqual(query.compile(), (
+            "SELECT `people`.`name`,`stuff`.`value` FROM `people` "
+            "JOIN `stuff` ON `stuff`.`people_id`=(`people`.`id`) "
+            "LEFT JOIN `things` AS `other` ON `other`.`stuff_id`=(`stuff`.`id`) AND `other`.`value`>%s "
+            "WHERE `people`.`name`!=%s",
+            (1, "Bob")
+        ))
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY, `name` TEXT)")
+        connection.execute("CREATE TABLE `stuff` (`id` INTEGER PRIMARY KEY, `people_id` INTEGER, `value` INTEGER)")
+        connection.execute("CREATE TABLE `things` (`id` INTEGER PRIMARY KEY, `stuff_id` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?,?)", [(1, "Bob"), (2, "Sue"), (3, "Joe")])
+        connection.executemany("INSERT INTO `stuff` VALUES (?,?,?)", [(1, 1, 10), (2, 2, 20), (3, 2, 30)])
+        connection.executemany("INSERT INTO `things` VALUES (?,?)", [(1, 2), (2, 3)])
+
+        compiled = SELECT(
+            "people.name", "stuff.value", "things.id"
+        ).FROM(
+            "people"
+        ).JOIN(
+            "stuff", {"stuff.people_id": test_expression.COLUMN_NAME("people.id")}
+        ).LEFT_JOIN(
+            "things", {"things.stuff_id": test_expression.COLUMN_NAME("stuff.id")}
+        ).ORDER_BY(
+            "stuff.value"
+        ).compile()
+
+        self.assertEqual(connection.execute(compiled.sql, compiled.args).fetchall(), [
+            ("Bob", 10, None), ("Sue", 20, 1), ("Sue", 30, 2)
+        ])
+
+        query = SELECT("people.name").FROM("people").LEFT_JOIN(
+            "stuff", {"stuff.people_id": test_expression.COLUMN_NAME("people.id")}
+        ).JOIN(
+            "things", {"things.stuff_id": test_expression.COLUMN_NAME("stuff.id")}
+        )
+
+        self.assertEqual(query.compile(), (
+            "SELECT `people`.`name` FROM `people` "
+            "LEFT JOIN `stuff` ON `stuff`.`people_id`=(`people`.`id`) "
+            "JOIN `things` ON `things`.`stuff_id`=(`stuff`.`id`)",
+            ()
+        ))
+
+    def test_generate_exists(self):
+
+        query = SELECT("*").FROM("people").WHERE(
+            not_exists=SELECT(relations_sql.SQL("1")).FROM("stuff").WHERE({"stuff.people_id": test_expression.COLUMN_NAME("people.id")})
+        )
+
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `people` WHERE NOT EXISTS (SELECT 1 FROM `stuff` WHERE `stuff`.`people_id`=(`people`.`id`))",
+            ()
+        ))
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE `people` (`id` INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE `stuff` (`people_id` INTEGER)")
+        connection.executemany("INSERT INTO `people` VALUES (?)", [(1,), (2,), (3,)])
+        connection.executemany("INSERT INTO `stuff` VALUES (?)", [(1,), (None,)])
+
+        def fetch(query):
+            compiled = query.compile()
+            return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        # a NULL in the subquery has NOT IN match nothing, NOT EXISTS doesn't care
+
+        self.assertEqual(fetch(SELECT("id").FROM("people").WHERE(id__not_in=SELECT("people_id").FROM("stuff"))), [])
+        self.assertEqual(fetch(SELECT("id").FROM("people").WHERE(
+            not_exists=SELECT("people_id").FROM("stuff").WHERE({"stuff.people_id": test_expression.COLUMN_NAME("people.id")})
+        ).ORDER_BY("id")), [(2,), (3,)])
+
+    def test_splits(self):
+
+        class SPLIT(SELECT):
+            MAX_ARGS = 3
+
+        query = SPLIT("*").FROM("people").WHERE(stuff__in=[1, 2], things__in=[1, 2, 3, 3], yin__not_in=[1, 2, 3, 4, 5])
+
+        self.assertEqual([each.compile() for each in query.splits()], [
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things` IN (%s) AND `yin` NOT IN (%s,%s,%s,%s,%s)", (1, 2, 1, 1, 2, 3, 4, 5)),
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things` IN (%s,%s) AND `yin` NOT IN (%s,%s,%s,%s,%s)", (1, 2, 2, 3, 1, 2, 3, 4, 5))
+        ])
+        self.assertEqual(len(query.WHERE.expressions[1].right.expressions), 4)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and can't split with LIMIT", SPLIT("*").WHERE(stuff__in=[1, 2]).LIMIT(1).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and no IN to split", SPLIT("*").WHERE(stuff__in=[1, 1]).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and no IN to split", SPLIT("*").WHERE(stuff__not_in=[1, 2]).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and can't split with GROUP_BY", SPLIT("*").WHERE(stuff__in=[1, 2]).GROUP_BY("stuff").splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and can't split with HAVING", SPLIT("*").WHERE(stuff__in=[1, 2]).HAVING(stuff=1).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and can't split with DISTINCT", SPLIT("*").OPTIONS("DISTINCT").WHERE(stuff__in=[1, 2]).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "can't split with FIELDS that aren't columns", SPLIT(relations_sql.SQL("COUNT(*)")).WHERE(stuff__in=[1, 2]).splits)
+        self.assertRaisesRegex(relations_sql.SQLError, "can't split with FIELDS that aren't columns", SPLIT(total=relations_sql.SQL("COUNT(*)")).WHERE(stuff__in=[1, 2]).splits)
+        self.assertEqual(len(SPLIT("stuff", things="yin").WHERE(stuff__in=[1, 2]).splits()), 2)
+
+    def test_fitted(self):
+
+        class SPLIT(SELECT):
+            MAX_ARGS = 3
+
+        self.assertEqual(SPLIT("*").FROM("people").WHERE(stuff__in=[1, 2, 3]).fitted(), [
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s,%s,%s)", (1, 2, 3))
+        ])
+
+        self.assertEqual(SPLIT("*").FROM("people").WHERE(stuff__in=[1, 2, 3, 4, 5], things=6).fitted(), [
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`=%s", (1, 2, 6)),
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s) AND `things`=%s", (3, 6)),
+            ("SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`=%s", (4, 5, 6))
+        ])
+
+        class BYTES(SELECT):
+            MAX_SQL_BYTES = 70
+
+        for statement in BYTES("*").FROM("people").WHERE(stuff__in=list(range(20))).fitted():
+            self.assertLessEqual(len(statement.sql) + 8 * len(statement.args), 70)
+
+    def test_compile(self):
+
+        query = SELECT("*").FROM("people").WHERE(
+            stuff__in=SELECT("f").FROM("g").WHERE(things__a__gt=5),
+            yin__not_in=[1, 2]
+        ).HAVING(yang=3).LIMIT(4)
+
+        compiled = query.compile()
+        self.assertEqual(compiled.sql, "SELECT * FROM `people` WHERE `stuff` IN (SELECT `f` FROM `g` WHERE `things`#>>%s>%s) AND `yin` NOT IN (%s,%s) HAVING `yang`=%s LIMIT %s")
+        self.assertEqual(compiled.args, ('$."a"', 5, 1, 2, 3, 4))
+        self.assertIsNone(query.sql)
+        self.assertIsNone(query.WHERE.sql)
+        self.assertIsNone(query.WHERE.expressions[0].sql)
+
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            compileds = list(pool.map(lambda indent: query.compile(indent=indent % 2), range(200)))
+
+        self.assertEqual(set(compileds), {compiled, query.compile(indent=1)})
+
+        query.generate()
+        self.assertEqual((query.sql, tuple(query.args)), compiled)
+
+    def test_generate_args(self):
+
+        query = SELECT("*").FROM("people").WHERE(
+            stuff__in=SELECT("f").FROM("g").WHERE(things__a__gt=5),
+            yin__not_in=[1, 2]
+        ).HAVING(yang=3).LIMIT(4)
+
+        query.generate()
+        sql, args = query.sql, query.args
+
+        self.assertIsNone(query.WHERE.sql)
+        self.assertIsNone(query.WHERE.expressions[0].right.sql)
+        self.assertIsNone(query.WHERE.expressions[0].right.WHERE.sql)
+
+        args = []
+        query.generate(args=args)
+        self.assertEqual(query.sql, sql)
+        self.assertIs(query.args, args)
+        self.assertEqual(args, ['$."a"', 5, 1, 2, 3, 4])
+
+        args = ["before"]
+        query.generate(args=args)
+        self.assertEqual(args, ["before", '$."a"', 5, 1, 2, 3, 4])
+
+    def test_generate_deep(self):
+
+        criteria = test_criterion.EQ("totes", "maigoats")
+
+        for level in range(2000):
+            criteria = test_criteria.AND(test_criterion.EQ("toast", level), criteria)
+
+        misses = SELECT.cache().misses
+
+        query = SELECT("*").FROM("people").WHERE(criteria)
+
+        query.generate()
+        self.assertEqual(query.sql, "SELECT * FROM `people` WHERE " + "(`toast`=%s AND " * 2000 + "`totes`=%s" + ")" * 2000)
+        self.assertEqual(query.args, list(reversed(range(2000))) + ["maigoats"])
+        self.assertEqual(SELECT.cache().misses, misses + 1)
+
+        hits = SELECT.cache().hits
+        deeper = test_criterion.EQ("totes", "yaks")
+
+        for level in range(2000):
+            deeper = test_criteria.AND(test_criterion.EQ("toast", -level), deeper)
+
+        self.assertEqual(SELECT("*").FROM("people").WHERE(deeper).compile().sql, query.sql)
+        self.assertEqual(SELECT.cache().hits, hits + 1)
+        self.assertEqual(SELECT("*").FROM("people").WHERE(deeper).fingerprint(), query.fingerprint())
+
+
+class TestINTERSECT(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_generate(self):
+
+        query = SELECT("*").FROM("people").WHERE(id__in=relations_sql.INTERSECT(
+            SELECT("people_id").FROM("stuff").WHERE(value=1),
+            SELECT("people_id").FROM("stuff").WHERE(value=2)
+        ))
+
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `people` WHERE `id` IN "
+            "(SELECT `people_id` FROM `stuff` WHERE `value`=%s INTERSECT SELECT `people_id` FROM `stuff` WHERE `value`=%s)",
+            (1, 2)
+        ))
+
 
 class INSERT(relations_sql.INSERT):
 
@@ -444,6 +1133,167 @@ class TestINSERT(unittest.TestCase):
         query.column(["thingies"])
         self.assertEqual(query.COLUMNS.expressions[0].name, "things")
 
+    def test_row(self):
+
+        query = INSERT("people")
+
+        self.assertEqual(query.row({"stuff": 1, "things": 2}, ["things", "stuff"]), [2, 1])
+        self.assertEqual(query.row([1, 2], ["stuff", "things"]), [1, 2])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "missing column things in {'stuff': 1}", query.row, {"stuff": 1}, ["stuff", "things"])
+        self.assertRaisesRegex(relations_sql.SQLError, r"wrong values \[1\] for columns \['stuff', 'things'\]", query.row, [1], ["stuff", "things"])
+
+    def test_prepare(self):
+
+        columns, jsonifies, tuples = INSERT("people").prepare([{"stuff": 1, "things": {"a": 1}}, {"stuff": 2, "things": None}])
+
+        self.assertEqual(columns, ["stuff", "things"])
+        self.assertEqual(jsonifies, [False, True])
+        self.assertEqual(list(tuples), [(1, '{"a": 1}'), (2, 'null')])
+
+        columns, jsonifies, tuples = INSERT("people", "stuff", "things").prepare([], jsonify=["stuff"])
+
+        self.assertEqual(columns, ["stuff", "things"])
+        self.assertEqual(jsonifies, [True, False])
+        self.assertEqual(list(tuples), [])
+
+        columns, jsonifies, tuples = INSERT("people").prepare(iter([]))
+
+        self.assertEqual(columns, [])
+        self.assertEqual(jsonifies, [])
+        self.assertEqual(list(tuples), [])
+
+    def test_columnar(self):
+
+        class ARRAY:
+
+            def __init__(self, values, kind):
+                self.values = values
+                self.dtype = unittest.mock.MagicMock(kind=kind)
+
+            def __len__(self):
+                return len(self.values)
+
+            def tolist(self):
+                return list(self.values)
+
+        data = {"things": ARRAY([{"a": 1}, None], "O"), "stuff": ARRAY([1, 2], "i")}
+
+        columns, jsonifies, tuples = INSERT("people").columnar(data)
+
+        self.assertEqual(columns, ["stuff", "things"])
+        self.assertEqual(jsonifies, [False, True])
+        self.assertEqual(list(tuples), [(1, '{"a": 1}'), (2, 'null')])
+
+        columns, jsonifies, tuples = INSERT("people", "things", "stuff").prepare({"stuff": [1, 2], "things": ["a", "b"], "extra": [3, 4]})
+
+        self.assertEqual(columns, ["things", "stuff"])
+        self.assertEqual(jsonifies, [False, False])
+        self.assertEqual(list(tuples), [("a", 1), ("b", 2)])
+
+        columns, jsonifies, tuples = INSERT("people", "stuff").columnar({"stuff": []}, jsonify=["stuff"])
+
+        self.assertEqual(jsonifies, [True])
+        self.assertEqual(list(tuples), [])
+
+        self.assertEqual(list(INSERT("people").batches({"stuff": [1, 2, 3], "things": ["a", "b", "c"]}, total=2)), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", (1, "a", 2, "b")),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", (3, "c"))
+        ])
+
+        self.assertRaisesRegex(relations_sql.SQLError, r"missing column things in \['stuff'\]", INSERT("people", "stuff", "things").columnar, {"stuff": [1]})
+        self.assertRaisesRegex(relations_sql.SQLError, r"columns \['stuff', 'things'\] not all the same length", INSERT("people").columnar, {"stuff": [1], "things": [1, 2]})
+        self.assertRaisesRegex(relations_sql.SQLError, "column stuff needs jsonify", INSERT("people").columnar, {"stuff": [1, {"a": 1}]})
+
+    def test_template(self):
+
+        self.assertEqual(INSERT("people").OPTIONS("FAST").template(["stuff", "things"], [False, True]), (
+            "INSERT FAST INTO `people` (`stuff`,`things`) VALUES ", "%s,JSON(%s)"
+        ))
+
+    def test_many(self):
+
+        query = INSERT("people")
+
+        self.assertEqual(query.many(row for row in [{"stuff": 1, "things": {"a": 1}}, {"stuff": 2, "things": [2]}]), (
+            "INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))",
+            ((1, '{"a": 1}'), (2, '[2]'))
+        ))
+        self.assertIsNone(query.sql)
+        self.assertFalse(query.COLUMNS)
+        self.assertFalse(query.VALUES)
+
+        query = INSERT("people", "stuff", "things")
+
+        self.assertEqual(query.many([[1, None], (2, {"a": 1})], jsonify=["things"]), (
+            "INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))",
+            ((1, 'null'), (2, '{"a": 1}'))
+        ))
+        self.assertEqual(query.many([]), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", ()))
+
+        self.assertRaisesRegex(relations_sql.SQLError, "column things needs jsonify for {'a': 1}", query.many, [[1, None], (2, {"a": 1})])
+        self.assertRaisesRegex(relations_sql.SQLError, "rows need COLUMNS or to be dicts", INSERT("people").many, [[1, 2]])
+        self.assertEqual(INSERT("people").many([]), ("INSERT INTO `people` VALUES ()", ()))
+
+    def test_batches(self):
+
+        rows = [{"stuff": index, "things": "a" * index} for index in range(5)]
+
+        self.assertEqual(list(INSERT("people").batches(rows, total=2)), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", (0, "", 1, "a")),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", (2, "aa", 3, "aaa")),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", (4, "aaaa"))
+        ])
+
+        self.assertEqual([len(batch.args) for batch in INSERT("people").batches(rows, params=5)], [4, 4, 2])
+        self.assertEqual([len(batch.args) for batch in INSERT("people").batches(rows, params=1)], [2, 2, 2, 2, 2])
+        self.assertEqual([len(batch.args) for batch in INSERT("people").batches(rows)], [10])
+
+        sizes = [len(batch.sql) + sum(INSERT.estimate(arg) for arg in batch.args) for batch in INSERT("people").batches(rows, size=80)]
+        self.assertGreater(len(sizes), 1)
+        self.assertTrue(all(size <= 80 for size in sizes))
+
+        def forever():
+            index = 0
+            while True:
+                yield [index, index]
+                index += 1
+
+        batches = INSERT("people", "stuff", "things").batches(forever(), total=3)
+        self.assertEqual(next(batches).args, (0, 0, 1, 1, 2, 2))
+        self.assertEqual(next(batches).args, (3, 3, 4, 4, 5, 5))
+
+        self.assertEqual(list(INSERT("people", "stuff").batches([])), [])
+        self.assertEqual(list(INSERT("people").batches([])), [])
+        self.assertEqual(list(INSERT("people").batches(iter([]))), [])
+        self.assertEqual(list(INSERT("people").batches([{}, {}, {}], params=2)), [
+            ("INSERT INTO `people` VALUES (),()", ()),
+            ("INSERT INTO `people` VALUES ()", ())
+        ])
+
+    def test_splits(self):
+
+        class SPLIT(INSERT):
+            MAX_ARGS = 4
+
+        query = SPLIT("people").VALUES(stuff=1, things=2).VALUES(3, 4).VALUES(5, 6)
+
+        self.assertEqual([each.compile() for each in query.splits()], [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", (1, 2)),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", (3, 4, 5, 6))
+        ])
+        self.assertEqual(query.fitted(), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", (1, 2)),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", (3, 4, 5, 6))
+        ])
+        self.assertEqual(len(query.VALUES.expressions), 3)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "too big to fit and no VALUES to split", SPLIT("people").VALUES(1, 2, 3, 4, 5).splits)
+
+    def test_batch(self):
+
+        self.assertEqual(INSERT.batch("INSERT VALUES ", "%s,%s", [(1, 2), (3, 4)]), ("INSERT VALUES (%s,%s),(%s,%s)", (1, 2, 3, 4)))
+
     def test_generate(self):
 
         query = INSERT("people").VALUES(stuff=1, things=2).VALUES(3, 4)
@@ -551,6 +1401,12 @@ FROM
 
         self.assertRaisesRegex(relations_sql.SQLError, "set VALUES or SELECT but not both", query.generate)
 
+    def test_steps(self):
+
+        query = INSERT("people", SELECT=SELECT("*").FROM("stuff"), VALUES=[[1]])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "set VALUES or SELECT but not both", query.write, [], [])
+
 
 class LIMITED(relations_sql.LIMITED):
 
@@ -606,6 +1462,21 @@ class TestLIMITED(unittest.TestCase):
 
         self.assertRaisesRegex(relations_sql.SQLError, "LIMIT can only be total", query.generate)
 
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        query = LIMITED("people", SELECT=test_clause.FIELDS("*"), LIMIT=5)
+
+        query.write(sql, args)
+        self.assertEqual("".join(sql), """LIMITED `people` * LIMIT %s""")
+        self.assertEqual(args, [5])
+
+        query.LIMIT(10)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "LIMIT can only be total", query.write, [], [])
+
 
 class UPDATE(relations_sql.UPDATE):
 
@@ -1,5 +1,8 @@
 import unittest
 
+import sqlite3
+import collections
+
 import relations
 import relations.unittest
 import relations_sql
@@ -15,6 +18,7 @@ class Source(relations_sql.SOURCE):
     """
 
     SELECT = test_query.SELECT
+    INSERT = test_query.INSERT
     TABLE_NAME = test_expression.TABLE_NAME
     COLUMN_NAME = test_expression.COLUMN_NAME
     OP = test_criteria.OP
@@ -22,6 +26,8 @@ class Source(relations_sql.SOURCE):
     SQL = relations_sql.SQL
     schema = "test"
 
+    TIES_STAGED = ("DROP TABLE IF EXISTS %s", "CREATE TEMPORARY TABLE %s (%s)")
+
 
 class Base(relations.Model):
     SOURCE = "TieTest"
@@ -105,39 +111,413 @@ class TestSOURCE(unittest.TestCase):
         # no tie criteria -> query untouched
         self.assertNotIn("sis_bro", self.sql(Sis.many(name="x")))
 
+    def test_collate_ties_query_exists(self):
+
+        self.source.TIES = "EXISTS"
+
+        # has / any -> correlated EXISTS (subquery) on the tie
+        self.assertIn(
+            "WHERE EXISTS (SELECT `sis_id` FROM `test`.`sis_bro` WHERE `bro_id` IN (%s) AND `sis_bro`.`sis_id`=(`sis`.`id`))",
+            self.sql(Sis.many(bro_id__has=1))
+        )
+
+        # all -> still grouped, per correlated model
+        self.assertIn(
+            "WHERE EXISTS (SELECT `sis_id` FROM `test`.`sis_bro` WHERE `bro_id` IN (%s,%s) AND `sis_bro`.`sis_id`=(`sis`.`id`) "
+            "GROUP BY `sis_id` HAVING COUNT(DISTINCT bro_id) = 2)",
+            self.sql(Sis.many(bro_id__all=[1, 2]))
+        )
+
+        # negation -> NOT EXISTS, NULL safe unlike NOT IN
+        self.assertIn(
+            "WHERE NOT EXISTS (SELECT `bro_id` FROM `test`.`sis_bro` WHERE `sis_id` IN (%s) AND `sis_bro`.`bro_id`=(`bro`.`id`))",
+            self.sql(Bro.many(sis_id__not_any=1))
+        )
+
+    def test_collate_ties_query_strategies(self):
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("ATTACH DATABASE ':memory:' AS `test`")
+        connection.execute("CREATE TABLE `sis` (`id` INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE `test`.`sis_bro` (`bro_id` INTEGER, `sis_id` INTEGER)")
+        connection.executemany("INSERT INTO `sis` VALUES (?)", [(id,) for id in range(8)])
+        connection.executemany("INSERT INTO `test`.`sis_bro` VALUES (?,?)", [
+            (bro_id, sis_id) for sis_id in range(8) for bro_id in range(4) if (sis_id >> bro_id) & 1
+        ])
+
+        def fetch(strategy, **criteria):
+
+            self.source.TIES = strategy
+            model = Sis.many(**criteria)
+            query = test_query.SELECT("sis.id").FROM("sis").ORDER_BY("sis.id")
+            self.source.collate_ties_query(model, query)
+
+            if model._distinct:
+                query.OPTIONS("DISTINCT")
+
+            for stage in model._stages:
+                connection.execute(stage.sql.replace("%s", "?"), stage.args)
+
+            compiled = query.compile()
+            rows = connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+            for unstage in model._unstages:
+                connection.execute(unstage.sql, unstage.args)
+
+            return rows
+
+        for criteria, expected in [
+            ({"bro_id__has": 0}, [1, 3, 5, 7]),
+            ({"bro_id__any": [0, 1]}, [1, 2, 3, 5, 6, 7]),
+            ({"bro_id__all": [0, 1]}, [3, 7]),
+            ({"bro_id__not_any": [0, 1]}, [0, 4]),
+            ({"bro_id__not_all": [0, 1]}, [0, 1, 2, 4, 5, 6])
+        ]:
+            for stage in [None, 2]:
+                self.source.TIES_STAGE = stage
+                for strategy in ["IN", "EXISTS", "JOIN", "INTERSECT", "AUTO"]:
+                    self.assertEqual(fetch(strategy, **criteria), [(id,) for id in expected], (stage, strategy, criteria))
+
+        self.source.TIES_STAGE = None
+
+        self.source.TIES = "NOPE"
+        self.assertRaisesRegex(relations_sql.SQLError, "unknown TIES NOPE", self.source.collate_ties_query, Sis.many(bro_id__has=1), test_query.SELECT("*"))
+
+    def test_ties_metadata(self):
+
+        metadata = self.source.ties_metadata(Sis.many())
+
+        self.assertEqual(metadata["store"], "sis")
+        self.assertEqual(
+            metadata["sides"],
+            [("bro_id", (("sis_bro", "test"), "sis_bro", "sis_id", "bro_id"))]
+        )
+
+        tie_table, sib_table, sib_store, sibling_id = metadata["siblings"]["bro"]
+        self.assertIs(tie_table, metadata["sides"][0][1])
+        self.assertEqual((sib_table, sib_store, sibling_id), (("bro", "test"), "bro", "id"))
+
+        # resolved once per model class
+
+        self.assertIs(self.source.ties_metadata(Sis.many()), metadata)
+        self.assertIs(self.source.ties_metadata(Sis.one(1)), metadata)
+        self.assertIsNot(self.source.ties_metadata(Bro.many()), metadata)
+
+        # again when the schema changes
+
+        self.source.schema = "other"
+        self.assertEqual(self.source.ties_metadata(Sis.many())["sides"][0][1][0], ("sis_bro", "other"))
+
+        # or the relations do
+
+        self.source.schema = "test"
+        metadata = self.source.ties_metadata(Sis.many())
+        relation = Sis.BROTHERS.pop("bro")
+
+        try:
+            self.assertEqual(self.source.ties_metadata(Sis.many()), {"store": "sis", "sides": [], "siblings": {}})
+        finally:
+            Sis.BROTHERS["bro"] = relation
+
+        self.assertIsNot(self.source.ties_metadata(Sis.many()), metadata)
+
+        # or a tie's or sibling's store or schema does
+
+        for attr, table in [("STORE", ("ties", "test")), ("SCHEMA", ("sis_bro", "ties"))]:
+
+            metadata = self.source.ties_metadata(Sis.many())
+            setattr(SisBro, attr, "ties")
+
+            try:
+                self.assertIsNot(self.source.ties_metadata(Sis.many()), metadata)
+                self.assertEqual(self.source.ties_metadata(Sis.many())["sides"][0][1][0], table)
+            finally:
+                delattr(SisBro, attr)
+
+        metadata = self.source.ties_metadata(Sis.many())
+        Bro.STORE = "brothers"
+
+        try:
+            self.assertEqual(self.source.ties_metadata(Sis.many())["siblings"]["bro"][1], ("brothers", "test"))
+        finally:
+            del Bro.STORE
+
+        self.assertIsNot(self.source.ties_metadata(Sis.many()), metadata)
+
+        # or its own store does
+
+        metadata = self.source.ties_metadata(Sis.many())
+        Sis.STORE = "sisters"
+
+        try:
+            self.assertEqual(self.source.ties_metadata(Sis.many())["store"], "sisters")
+        finally:
+            del Sis.STORE
+
+        self.assertEqual(self.source.ties_metadata(Sis.many())["store"], "sis")
+
+        # and no two queries share a table
+
+        first, second = [test_query.SELECT("*").FROM("sis") for _ in range(2)]
+        self.source.collate_ties_query(Sis.many(bro__name="Tom"), first)
+        self.source.collate_ties_query(Sis.many(bro__name="Tom"), second)
+
+        self.assertEqual(first.compile(), second.compile())
+        self.assertIsNot(first.JOIN.expressions[0].table, second.JOIN.expressions[0].table)
+        self.assertIs(first.JOIN.expressions[0].table.parent, first.JOIN.expressions[0])
+
+    def test_ties_key(self):
+
+        relation = Sis.BROTHERS["bro"]
+
+        self.assertEqual(self.source.ties_key(Sis), ("test", None, (relation, None, None), (relation, None, None)))
+        self.assertEqual(self.source.ties_key(SisBro), ("test", None))
+
+        Sis.STORE = "sisters"
+
+        try:
+            self.assertEqual(self.source.ties_key(Sis)[:2], ("test", "sisters"))
+        finally:
+            del Sis.STORE
+
+    def test_ties_table(self):
+
+        table = self.source.ties_table(("sis_bro", "test"))
+
+        self.assertIsInstance(table, test_expression.TABLE_NAME)
+        self.assertEqual(table.compile().sql, "`test`.`sis_bro`")
+        self.assertIsNot(self.source.ties_table(("sis_bro", "test")), table)
+
+    def test_ties_strategy(self):
+
+        self.assertEqual(self.source.ties_strategy("any", True, [1]), "IN")
+
+        self.source.TIES = "AUTO"
+        self.assertEqual(self.source.ties_strategy("any", True, [1]), "EXISTS")
+        self.assertEqual(self.source.ties_strategy("all", False, list(range(10))), "JOIN")
+        self.assertEqual(self.source.ties_strategy("all", False, list(range(11))), "IN")
+
+        self.source.TIES = "JOIN"
+        self.assertEqual(self.source.ties_strategy("any", False, [1]), "JOIN")
+        self.assertEqual(self.source.ties_strategy("any", True, [1]), "EXISTS")
+
+        self.source.TIES = "INTERSECT"
+        self.assertEqual(self.source.ties_strategy("all", True, [1, 2]), "INTERSECT")
+        self.assertEqual(self.source.ties_strategy("any", False, [1, 2]), "IN")
+
+        self.source.TIES_STAGE = 2
+        self.assertEqual(self.source.ties_strategy("all", True, [1, 2]), "IN")
+        self.assertEqual(self.source.ties_strategy("all", True, [1]), "INTERSECT")
+
+        self.source.TIES = "JOIN"
+        self.assertEqual(self.source.ties_strategy("any", False, [1, 2]), "IN")
+        self.assertEqual(self.source.ties_strategy("any", True, [1, 2]), "EXISTS")
+
+        self.source.TIES = "AUTO"
+        self.assertEqual(self.source.ties_strategy("all", False, [1, 2]), "IN")
+        self.assertEqual(self.source.ties_strategy("all", True, [1, 2]), "EXISTS")
+
+    def test_ties_staging(self):
+
+        self.assertFalse(self.source.ties_staging(list(range(1000))))
+
+        self.source.TIES_STAGE = 3
+        self.assertFalse(self.source.ties_staging([1, 2]))
+        self.assertTrue(self.source.ties_staging([1, 2, 3]))
+
+    def test_ties_stage(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+
+        model = Sis.many()
+        model._stages = []
+        model._unstages = []
+
+        self.assertIsNone(self.source.ties_stage(model, tie_table, [1, 2, 3]))
+        self.assertEqual((model._stages, model._unstages), ([], []))
+
+        self.source.TIES_STAGE = 2
+        self.source.INSERT.BATCH = 2
+
+        try:
+            self.assertEqual(self.source.ties_stage(model, tie_table, [1, 2, 3]), "sis_bro_staged_0")
+            self.assertEqual(self.source.ties_stage(model, tie_table, [4, 5]), "sis_bro_staged_1")
+        finally:
+            del self.source.INSERT.BATCH
+
+        self.assertEqual(model._stages, [
+            ("DROP TABLE IF EXISTS `sis_bro_staged_0`", ()),
+            ("CREATE TEMPORARY TABLE `sis_bro_staged_0` (`value`)", ()),
+            ("INSERT INTO `sis_bro_staged_0` (`value`) VALUES (%s),(%s)", (1, 2)),
+            ("INSERT INTO `sis_bro_staged_0` (`value`) VALUES (%s)", (3,)),
+            ("DROP TABLE IF EXISTS `sis_bro_staged_1`", ()),
+            ("CREATE TEMPORARY TABLE `sis_bro_staged_1` (`value`)", ()),
+            ("INSERT INTO `sis_bro_staged_1` (`value`) VALUES (%s),(%s)", (4, 5))
+        ])
+        self.assertEqual(model._unstages, [
+            ("DROP TABLE IF EXISTS `sis_bro_staged_0`", ()),
+            ("DROP TABLE IF EXISTS `sis_bro_staged_1`", ())
+        ])
+
+        self.source.TIES_STAGED = None
+        self.assertRaisesRegex(relations_sql.SQLError, "no staging ties without TIES_STAGED sql", self.source.ties_stage, model, tie_table, [1, 2])
+
+    def test_ties_subquery(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+
+        self.assertEqual(self.source.ties_subquery(tie_table, "any", [1, 2]).compile(), (
+            "SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s,%s)", (1, 2)
+        ))
+        self.assertEqual(self.source.ties_subquery(tie_table, "all", [1, 2]).compile(), (
+            "SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s,%s) GROUP BY `sis_id` HAVING COUNT(DISTINCT bro_id) = 2", (1, 2)
+        ))
+        self.assertEqual(self.source.ties_subquery(tie_table, "all", [1, 2], "staged").compile(), (
+            "SELECT `sis_id` FROM `sis_bro` JOIN `staged` ON `staged`.`value`=(`sis_bro`.`bro_id`) "
+            "GROUP BY `sis_id` HAVING COUNT(DISTINCT bro_id) = 2", ()
+        ))
+
+    def test_ties_in(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+        query = test_query.SELECT("*").FROM("sis")
+
+        self.assertIsNone(self.source.ties_in(Sis.many(), query, tie_table, ("any", True, [1])))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` WHERE `id` NOT IN (SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s))", (1,)
+        ))
+
+    def test_ties_exists(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+        query = test_query.SELECT("*").FROM("sis")
+
+        self.assertIsNone(self.source.ties_exists(Sis.many(), query, tie_table, ("any", False, [1])))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` WHERE EXISTS (SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s) AND `sis_bro`.`sis_id`=(`sis`.`id`))", (1,)
+        ))
+
+    def test_ties_join(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+
+        query = test_query.SELECT("*").FROM("sis")
+
+        self.assertTrue(self.source.ties_join(Sis.many(), query, tie_table, ("any", False, [1, 2])))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` JOIN `sis_bro` AS `sis_bro_0` ON `sis_bro_0`.`bro_id` IN (%s,%s) AND `sis_bro_0`.`sis_id`=(`sis`.`id`)",
+            (1, 2)
+        ))
+
+        query = test_query.SELECT("*").FROM("sis")
+
+        self.assertFalse(self.source.ties_join(Sis.many(), query, tie_table, ("all", False, [1, 2])))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` "
+            "JOIN `sis_bro` AS `sis_bro_0` ON `sis_bro_0`.`bro_id` IN (%s) AND `sis_bro_0`.`sis_id`=(`sis`.`id`) "
+            "JOIN `sis_bro` AS `sis_bro_1` ON `sis_bro_1`.`bro_id` IN (%s) AND `sis_bro_1`.`sis_id`=(`sis`.`id`)",
+            (1, 2)
+        ))
+
+    def test_ties_intersect(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+        query = test_query.SELECT("*").FROM("sis")
+
+        self.assertIsNone(self.source.ties_intersect(Sis.many(), query, tie_table, ("all", False, [1, 2])))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` WHERE `id` IN "
+            "(SELECT `sis_id` FROM `sis_bro` WHERE `bro_id`=%s INTERSECT SELECT `sis_id` FROM `sis_bro` WHERE `bro_id`=%s)",
+            (1, 2)
+        ))
+
+    def test_ties_merged(self):
+
+        tie_table = (("sis_bro", None), "sis_bro", "sis_id", "bro_id")
+
+        query = test_query.SELECT("*").FROM("sis")
+        self.assertIsNone(self.source.ties_merged(Sis.many(), query, tie_table, [("any", False, [1, 2]), ("all", True, [2, 3])]))
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` WHERE `id` IN (SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s,%s,%s) GROUP BY `sis_id` "
+            "HAVING COUNT(DISTINCT CASE WHEN `bro_id` IN (%s,%s) THEN `bro_id` END) > 0 "
+            "AND COUNT(DISTINCT CASE WHEN `bro_id` IN (%s,%s) THEN `bro_id` END) < 2)",
+            (1, 2, 3, 1, 2, 2, 3)
+        ))
+
+        query = test_query.SELECT("*").FROM("sis")
+        self.source.ties_merged(Sis.many(), query, tie_table, [("has", True, [1]), ("all", True, [2, 3])])
+        self.assertEqual(query.compile(), (
+            "SELECT * FROM `sis` WHERE `id` NOT IN (SELECT `sis_id` FROM `sis_bro` WHERE `bro_id` IN (%s,%s,%s) GROUP BY `sis_id` "
+            "HAVING (COUNT(DISTINCT CASE WHEN `bro_id` IN (%s) THEN `bro_id` END) > 0 "
+            "OR COUNT(DISTINCT CASE WHEN `bro_id` IN (%s,%s) THEN `bro_id` END) = 2))",
+            (1, 2, 3, 1, 2, 3)
+        ))
+
+        connection = sqlite3.connect(":memory:")
+        connection.execute("ATTACH DATABASE ':memory:' AS `test`")
+        connection.execute("CREATE TABLE `sis` (`id` INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE `test`.`sis_bro` (`bro_id` INTEGER, `sis_id` INTEGER)")
+        connection.executemany("INSERT INTO `sis` VALUES (?)", [(id,) for id in range(16)])
+        connection.executemany("INSERT INTO `test`.`sis_bro` VALUES (?,?)", [
+            (bro_id, sis_id) for sis_id in range(16) for bro_id in range(4) if (sis_id >> bro_id) & 1
+        ])
+
+        def fetch(merge, **criteria):
+
+            self.source.TIES_MERGE = merge
+            query = test_query.SELECT("sis.id").FROM("sis").ORDER_BY("sis.id")
+            self.source.collate_ties_query(Sis.many(**criteria), query)
+
+            compiled = query.compile()
+            return compiled.sql.count("sis_bro"), connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        for criteria in [
+            {"bro_id__has": 0, "bro_id__any": [1, 2]},
+            {"bro_id__any": [0, 1], "bro_id__all": [2, 3]},
+            {"bro_id__all": [0, 1], "bro_id__not_any": [2]},
+            {"bro_id__has": 3, "bro_id__not_all": [0, 1]},
+            {"bro_id__not_any": [0], "bro_id__not_all": [1, 2]},
+            {"bro_id__has": 0, "bro_id__any": [1], "bro_id__all": [2, 3], "bro_id__not_has": 1}
+        ]:
+            scans, expected = fetch(False, **criteria)
+            merged, rows = fetch(True, **criteria)
+            self.assertEqual(scans, len(criteria))
+            self.assertEqual(merged, 1)
+            self.assertEqual(rows, expected, criteria)
+
     def test_collate_attr_query(self):
 
-        # bro__name -> FLAT join: tie + sibling added to FROM, joins + criteria in WHERE, NO subquery
+        # bro__name -> FLAT join: tie + sibling JOIN'd ON their keys, criteria in WHERE, NO subquery
         flat = self.sql(Sis.many(bro__name="Tom"))
         self.assertIn(
-            "FROM `sis`,`test`.`sis_bro`,`test`.`bro` "
-            "WHERE `sis`.`id`=(`sis_bro`.`sis_id`) AND `sis_bro`.`bro_id`=(`bro`.`id`) AND `bro`.`name`=%s",
+            "FROM `sis` JOIN `test`.`sis_bro` ON `sis`.`id`=(`sis_bro`.`sis_id`) "
+            "JOIN `test`.`bro` ON `sis_bro`.`bro_id`=(`bro`.`id`) WHERE `bro`.`name`=%s",
             flat
         )
         self.assertNotIn("(SELECT", flat)
 
         # a field operator lands straight on the sibling: in (any of), like
         self.assertIn(
-            "AND `bro`.`name` IN (%s,%s)",
+            "WHERE `bro`.`name` IN (%s,%s)",
             self.sql(Sis.many(bro__name__in=["Tom", "Dick"]))
         )
         self.assertIn(
-            "AND `bro`.`name` LIKE %s",
+            "WHERE `bro`.`name` LIKE %s",
             self.sql(Sis.many(bro__name__like="ar"))
         )
 
         # criteria on the same relation filter the same tied sibling (one join, AND'd)
         self.assertIn(
-            "FROM `sis`,`test`.`sis_bro`,`test`.`bro` "
-            "WHERE `sis`.`id`=(`sis_bro`.`sis_id`) AND `sis_bro`.`bro_id`=(`bro`.`id`) "
-            "AND `bro`.`name`=%s AND `bro`.`id`>%s",
+            "FROM `sis` JOIN `test`.`sis_bro` ON `sis`.`id`=(`sis_bro`.`sis_id`) "
+            "JOIN `test`.`bro` ON `sis_bro`.`bro_id`=(`bro`.`id`) "
+            "WHERE `bro`.`name`=%s AND `bro`.`id`>%s",
             self.sql(Sis.many(bro__name="Tom", bro__id__gt=5))
         )
 
         # symmetric: brothers filtered by a tied sister's attribute
         self.assertIn(
-            "FROM `bro`,`test`.`sis_bro`,`test`.`sis` "
-            "WHERE `bro`.`id`=(`sis_bro`.`bro_id`) AND `sis_bro`.`sis_id`=(`sis`.`id`) AND `sis`.`name`=%s",
+            "FROM `bro` JOIN `test`.`sis_bro` ON `bro`.`id`=(`sis_bro`.`bro_id`) "
+            "JOIN `test`.`sis` ON `sis_bro`.`sis_id`=(`sis`.`id`) WHERE `sis`.`name`=%s",
             self.sql(Bro.many(sis__name="Sue"))
         )
 
@@ -150,3 +530,85 @@ class TestSOURCE(unittest.TestCase):
         plain = Sis.many(bro_id__has=1)
         self.assertNotIn("`bro`.`name`", self.sql(plain))
         self.assertFalse(getattr(plain, "_distinct", False))
+
+    def test_collate_attr_query_semi(self):
+
+        # IN -> tie JOIN sibling in a subquery, no DISTINCT
+        self.source.TIES_ATTRS = "IN"
+        model = Sis.many(bro__name="Tom", bro__id__gt=5)
+        self.assertEqual(
+            self.sql(model),
+            "SELECT * FROM `sis` WHERE `id` IN (SELECT `sis_bro`.`sis_id` FROM `test`.`sis_bro` "
+            "JOIN `test`.`bro` ON `sis_bro`.`bro_id`=(`bro`.`id`) WHERE `bro`.`name`=%s AND `bro`.`id`>%s)"
+        )
+        self.assertFalse(model._distinct)
+
+        # EXISTS -> the same, correlated on the model's id
+        self.source.TIES_ATTRS = "EXISTS"
+        model = Bro.many(sis__name="Sue")
+        self.assertEqual(
+            self.sql(model),
+            "SELECT * FROM `bro` WHERE EXISTS (SELECT `sis_bro`.`bro_id` FROM `test`.`sis_bro` "
+            "JOIN `test`.`sis` ON `sis_bro`.`sis_id`=(`sis`.`id`) WHERE `sis`.`name`=%s AND `bro`.`id`=(`sis_bro`.`bro_id`))"
+        )
+        self.assertFalse(model._distinct)
+
+        # a dialect without JOIN gets the tables in FROM and their keys in WHERE
+        class UNJOINED(test_query.SELECT):
+            CLAUSES = collections.OrderedDict(
+                (name, clause) for name, clause in test_query.SELECT.CLAUSES.items() if name != "JOIN"
+            )
+
+        self.source.SELECT = UNJOINED
+        self.source.TIES_ATTRS = "JOIN"
+        model = Sis.many(bro__name="Tom")
+        self.assertEqual(
+            self.sql(model),
+            "SELECT * FROM `sis`,`test`.`sis_bro`,`test`.`bro` WHERE `sis`.`id`=(`sis_bro`.`sis_id`) "
+            "AND `sis_bro`.`bro_id`=(`bro`.`id`) AND `bro`.`name`=%s"
+        )
+        self.assertTrue(model._distinct)
+
+        self.source.TIES_ATTRS = "IN"
+        self.assertEqual(
+            self.sql(Sis.many(bro__name="Tom")),
+            "SELECT * FROM `sis` WHERE `id` IN (SELECT `sis_bro`.`sis_id` FROM `test`.`sis_bro`,`test`.`bro` "
+            "WHERE `sis_bro`.`bro_id`=(`bro`.`id`) AND `bro`.`name`=%s)"
+        )
+
+        del self.source.SELECT
+
+        self.source.TIES_ATTRS = "NOPE"
+        self.assertRaisesRegex(relations_sql.SQLError, "unknown TIES_ATTRS NOPE", self.sql, Sis.many(bro__name="Tom"))
+        self.assertEqual(self.sql(Sis.many(name="Sue")), "SELECT * FROM `sis`")
+
+        # all match the same sisters, and the same tied brother
+        connection = sqlite3.connect(":memory:")
+        connection.execute("ATTACH DATABASE ':memory:' AS `test`")
+        connection.execute("CREATE TABLE `sis` (`id` INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE `test`.`bro` (`id` INTEGER PRIMARY KEY, `name` TEXT)")
+        connection.execute("CREATE TABLE `test`.`sis_bro` (`bro_id` INTEGER, `sis_id` INTEGER)")
+        connection.executemany("INSERT INTO `sis` VALUES (?)", [(id,) for id in range(4)])
+        connection.executemany("INSERT INTO `test`.`bro` VALUES (?,?)", [(1, "Tom"), (2, "Tom"), (7, "Tom"), (8, "Dick")])
+        connection.executemany("INSERT INTO `test`.`sis_bro` VALUES (?,?)", [(1, 0), (2, 0), (7, 1), (8, 2), (1, 2), (8, 3)])
+
+        def fetch(attrs, **criteria):
+
+            self.source.TIES_ATTRS = attrs
+            model = Sis.many(**criteria)
+            query = test_query.SELECT("sis.id").FROM("sis").ORDER_BY("sis.id")
+            self.source.collate_ties_query(model, query)
+
+            if model._distinct:
+                query.OPTIONS("DISTINCT")
+
+            compiled = query.compile()
+            return connection.execute(compiled.sql.replace("%s", "?"), compiled.args).fetchall()
+
+        for criteria, expected in [
+            ({"bro__name": "Tom"}, [0, 1, 2]),
+            ({"bro__name": "Tom", "bro__id__gt": 5}, [1]),
+            ({"bro__name": "Dick", "bro__id__lt": 5}, [])
+        ]:
+            for attrs in ["JOIN", "IN", "EXISTS"]:
+                self.assertEqual(fetch(attrs, **criteria), [(id,) for id in expected], (attrs, criteria))
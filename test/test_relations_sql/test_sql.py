@@ -1,11 +1,14 @@
 import unittest
 import unittest.mock
+import concurrent.futures
 
 import relations_sql
 
 
 class SQL:
 
+    __slots__ = ()
+
     QUOTE = '`'
     STR = "'"
     SEPARATOR = '.'
@@ -39,6 +42,37 @@ class TestSQLError(unittest.TestCase):
         self.assertEqual(error.message, "oops")
 
 
+class TestNORMAL(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___new__(self):
+
+        normal = relations_sql.NORMAL(("SQL", "unit"))
+
+        self.assertEqual(normal, ("SQL", "unit"))
+        self.assertEqual(len(normal.digest), 32)
+        self.assertEqual(relations_sql.NORMAL(("SQL", "unit")).digest, normal.digest)
+        self.assertNotEqual(relations_sql.NORMAL(("SQL", "test")).digest, normal.digest)
+        self.assertNotEqual(relations_sql.NORMAL(("SQL", ("unit",))).digest, normal.digest)
+
+    def test_digests(self):
+
+        normal = relations_sql.NORMAL(("unit",))
+
+        self.assertEqual(list(relations_sql.NORMAL.digests(("SQL", 1, normal, ("unit",)))), [
+            "'SQL'", "1", f"#{normal.digest}", f"#{normal.digest}"
+        ])
+
+    def test_of(self):
+
+        normal = relations_sql.NORMAL(("SQL", "unit"))
+
+        self.assertEqual(relations_sql.NORMAL.of(normal), normal.digest)
+        self.assertEqual(relations_sql.NORMAL.of(("SQL", "unit")), normal.digest)
+        self.assertEqual(relations_sql.NORMAL.of("unit"), "'unit'")
+
+
 class TestSQL(unittest.TestCase):
 
     maxDiff = None
@@ -50,6 +84,17 @@ class TestSQL(unittest.TestCase):
         self.assertEqual(sql.sql, """unit""")
         self.assertEqual(sql.args, "test")
 
+    def test___init_subclass__(self):
+
+        class BASE(relations_sql.SQL):
+            __slots__ = {"unit": "test"}
+
+        class SUB(BASE):
+            __slots__ = ()
+
+        self.assertEqual(BASE.SLOTS, {"sql", "args", "parent", "unit"})
+        self.assertEqual(SUB.SLOTS, BASE.SLOTS)
+
     def test___len__(self):
 
         sql = relations_sql.SQL()
@@ -58,6 +103,54 @@ class TestSQL(unittest.TestCase):
         sql.sql = True
         self.assertEqual(len(sql), 1)
 
+    def test_touch(self):
+
+        class CLAUSED(relations_sql.SQL):
+            __slots__ = {"dirty": "test"}
+
+        clause = CLAUSED()
+        middle = relations_sql.SQL()
+        sql = relations_sql.SQL()
+
+        clause.adopt(middle)
+        middle.adopt(sql)
+
+        sql.touch()
+        stamp = clause.dirty
+        self.assertIsNotNone(stamp)
+        self.assertNotIn("dirty", middle.SLOTS)
+
+        clause.touch()
+        self.assertGreater(clause.dirty, stamp)
+
+        stamp = clause.dirty
+        shared = relations_sql.SHARED.dirty
+        CLAUSED().adopt(sql)
+        self.assertEqual(sql.parent, relations_sql.SHARED)
+
+        sql.touch()
+        self.assertGreater(relations_sql.SHARED.dirty, shared)
+        self.assertEqual(clause.dirty, stamp)
+
+    def test_adopt(self):
+
+        parent = relations_sql.SQL()
+        sql = relations_sql.SQL()
+
+        self.assertEqual(parent.adopt(sql), sql)
+        self.assertEqual(sql.parent, parent)
+
+        parent.adopt(sql)
+        self.assertEqual(sql.parent, parent)
+
+        relations_sql.SQL().adopt(sql)
+        self.assertEqual(sql.parent, relations_sql.SHARED)
+
+        parent.adopt(sql)
+        self.assertEqual(sql.parent, relations_sql.SHARED)
+
+        self.assertEqual(parent.adopt("nope"), "nope")
+
     def test_split(self):
 
         self.assertEqual(relations_sql.SQL.split("people.stuff.things"), ("people.stuff.things", []))
@@ -68,3 +161,300 @@ class TestSQL(unittest.TestCase):
 
         sql = relations_sql.SQL()
         sql.generate()
+        self.assertEqual(sql.sql, "")
+        self.assertEqual(sql.args, [])
+
+        sql = relations_sql.SQL("unit", ["test"])
+        sql.generate()
+        self.assertEqual(sql.sql, "unit")
+        self.assertEqual(sql.args, ["test"])
+
+        class NODE(relations_sql.SQL):
+
+            def steps(self, sql, args, **kwargs):
+                args.append(kwargs["unit"])
+                return ["(", (self.child, {}), ")"]
+
+        args = ["before"]
+        sql = NODE()
+        sql.child = relations_sql.SQL("child", ["arg"])
+
+        sql.generate(unit="test", args=args)
+        self.assertEqual(sql.sql, "(child)")
+        self.assertIs(sql.args, args)
+        self.assertEqual(args, ["before", "test", "arg"])
+        self.assertEqual(sql.child.sql, "child")
+
+    def test_shape(self):
+
+        args = []
+        sql = relations_sql.SQL("unit", ["test"])
+
+        self.assertEqual(sql.shape(args), (relations_sql.SQL, "unit"))
+        self.assertEqual(args, ["test"])
+
+        class NODE(relations_sql.SQL):
+
+            __slots__ = {"under": "what's under"}
+
+            def __len__(self):
+                return 1
+
+            def outline(self, args):
+                args.append("node")
+                return (self.__class__, *(yield [None, self.under]))
+
+        node = relations_sql.SQL("leaf", ["leaf"])
+
+        for _ in range(5000):
+            under, node = node, NODE()
+            node.under = under
+
+        args = []
+        shape = node.shape(args)
+
+        self.assertEqual(args, ["node"] * 5000 + ["leaf"])
+
+        for _ in range(5000):
+            self.assertEqual(shape[0], NODE)
+            shape = shape[1]
+
+        self.assertEqual(shape, (relations_sql.SQL, "leaf"))
+
+        flat = node.shape([], flat=True)
+        self.assertEqual(flat, (relations_sql.OPEN, NODE) * 5000 + (relations_sql.OPEN, relations_sql.SQL, "leaf") + (relations_sql.CLOSE,) * 5001)
+        self.assertEqual(flat, node.shape([], flat=True))
+
+        self.assertEqual(node.under.under.shape([], flat=True)[:2], (relations_sql.OPEN, NODE))
+
+        under = node
+        for _ in range(4950):
+            under = under.under
+
+        self.assertEqual(under.shape([], flat=True)[0], NODE)
+
+    def test_flatten(self):
+
+        self.assertEqual(relations_sql.SQL.flatten(("a", ("b", ()), "c")), (
+            relations_sql.OPEN, "a", relations_sql.OPEN, "b", relations_sql.OPEN, relations_sql.CLOSE, relations_sql.CLOSE, "c", relations_sql.CLOSE
+        ))
+
+    def test_outline(self):
+
+        class GENERATED(relations_sql.SQL):
+
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+                self.sql = f"generated {self.sql}"
+
+        args = []
+        sql = GENERATED("unit", ["test"])
+
+        self.assertEqual(sql.outline(args), (GENERATED, "generated unit"))
+        self.assertEqual(args, ["test"])
+        self.assertEqual(sql.sql, "unit")
+
+    def test_unders(self):
+
+        fee = relations_sql.SQL("fee")
+        foe = relations_sql.SQL("foe")
+
+        self.assertEqual(relations_sql.SQL.unders(None), [])
+        self.assertEqual(relations_sql.SQL.unders(fee), [fee])
+        self.assertEqual(relations_sql.SQL.unders([fee, None, relations_sql.SQL(), [foe]]), [foe, fee])
+
+    def test_normal(self):
+
+        self.assertEqual(relations_sql.SQL.normal((relations_sql.SQL, "unit", (relations_sql.SQL, 1))), ("SQL", "unit", ("SQL", 1)))
+
+    def test_normals(self):
+
+        self.assertEqual(relations_sql.SQL.normals("unit"), "unit")
+        self.assertEqual(relations_sql.SQL.normals((relations_sql.SQL, "unit")), ("SQL", "unit"))
+        self.assertEqual(relations_sql.SQL.normals(((relations_sql.SQL, "unit"), 1)), (("SQL", "unit"), 1))
+        self.assertEqual(relations_sql.SQL.normals((int, 1)), (int, 1))
+
+        shape = (relations_sql.SQL, "unit")
+        for _ in range(5000):
+            shape = (relations_sql.SQL, shape)
+
+        normal = relations_sql.SQL.normals(shape)
+        for _ in range(5000):
+            self.assertEqual(normal[0], "SQL")
+            normal = normal[1]
+        self.assertEqual(normal, ("SQL", "unit"))
+
+    def test_normalize(self):
+
+        self.assertEqual(relations_sql.SQL("unit", ["test"]).normalize(), ("SQL", "unit"))
+
+    def test_fingerprint(self):
+
+        fingerprint = relations_sql.SQL("unit", ["test"]).fingerprint()
+
+        self.assertEqual(len(fingerprint), 32)
+        self.assertEqual(relations_sql.SQL("unit", ["more"]).fingerprint(), fingerprint)
+        self.assertNotEqual(relations_sql.SQL("test", ["test"]).fingerprint(), fingerprint)
+
+        class NODE(relations_sql.SQL):
+
+            __slots__ = {"under": "what's under"}
+
+            def __len__(self):
+                return 1
+
+            def outline(self, args):
+                return (self.__class__, *(yield self.under))
+
+        def deep(leaf):
+
+            node = relations_sql.SQL(leaf)
+
+            for _ in range(5000):
+                under, node = node, NODE()
+                node.under = under
+
+            return node
+
+        self.assertEqual(deep("unit").fingerprint(), deep("unit").fingerprint())
+        self.assertNotEqual(deep("unit").fingerprint(), deep("test").fingerprint())
+
+    def test___getattr__(self):
+
+        class SLOTTED(relations_sql.SQL):
+            __slots__ = {"unit": "test"}
+
+        sql = SLOTTED()
+
+        self.assertIsNone(sql.unit)
+        self.assertEqual(SLOTTED.SLOTS, {"sql", "args", "parent", "unit"})
+        self.assertFalse(hasattr(sql, "__dict__"))
+        self.assertFalse(hasattr(relations_sql.LIST([1]), "__dict__"))
+        self.assertRaisesRegex(AttributeError, "'SLOTTED' object has no attribute 'nope'", getattr, sql, "nope")
+
+        sql.unit = "test"
+        self.assertEqual(sql.unit, "test")
+
+        class DIALECT(SQL, SLOTTED):
+            __slots__ = ()
+
+        self.assertFalse(hasattr(DIALECT(), "__dict__"))
+        self.assertEqual(DIALECT().QUOTE, "`")
+
+        class UNSLOTTED(SQL, SLOTTED):
+            pass
+
+        sql = UNSLOTTED()
+        sql.extra = True
+
+        self.assertIsNone(sql.unit)
+        self.assertTrue(sql.extra)
+
+    def test_steps(self):
+
+        sql = []
+        args = []
+
+        self.assertEqual(relations_sql.SQL().steps(sql, args), [])
+        self.assertEqual(sql, [])
+        self.assertEqual(args, [])
+
+        self.assertEqual(relations_sql.SQL("unit", ["test"]).steps(sql, args), [])
+        self.assertEqual(sql, ["unit"])
+        self.assertEqual(args, ["test"])
+
+    def test_compile(self):
+
+        class NODE(relations_sql.SQL):
+
+            def steps(self, sql, args, **kwargs):
+                return ["(", (relations_sql.SQL("sql", ["arg"]), {}), ")"]
+
+        class GENERATED(relations_sql.SQL):
+
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+                self.sql = f"generated {self.sql}"
+
+        sql = NODE()
+
+        compiled = sql.compile()
+        self.assertEqual(compiled, ("(sql)", ("arg",)))
+        self.assertEqual(compiled.sql, "(sql)")
+        self.assertEqual(compiled.args, ("arg",))
+        self.assertIsNone(sql.sql)
+        self.assertEqual(sql.args, [])
+
+        sql = GENERATED("sql", ["arg"])
+
+        self.assertEqual(sql.compile(), ("generated sql", ("arg",)))
+        self.assertEqual(sql.sql, "sql")
+
+        class INDENTED(relations_sql.SQL):
+
+            def generate(self, indent=0, **kwargs):
+                super().generate(**kwargs)
+                self.sql = f"indented {indent}"
+
+        sql = INDENTED()
+
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            compileds = list(pool.map(lambda indent: (indent % 2, sql.compile(indent=indent % 2)), range(200)))
+
+        self.assertTrue(all(compiled.sql == f"indented {indent}" for indent, compiled in compileds))
+        self.assertIsNone(sql.sql)
+
+    def test_write(self):
+
+        class LEAF(relations_sql.SQL):
+
+            def steps(self, sql, args, **kwargs):
+                sql.append(f"leaf{kwargs['count']}")
+
+        class GENERATED(relations_sql.SQL):
+
+            def generate(self, **kwargs):
+                super().generate(**kwargs)
+                self.sql = "generated"
+
+        class NODE(relations_sql.SQL):
+
+            def steps(self, sql, args, count=0, **kwargs):
+                return ["(", (LEAF(), {"count": count}), ",", (GENERATED("sql", ["arg"]), {}), ")"]
+
+        sql = []
+        args = ["before"]
+
+        NODE().write(sql, args)
+        self.assertEqual("".join(sql), "(leaf0,generated)")
+        self.assertEqual(args, ["before", "arg"])
+
+        sql = []
+        args = []
+
+        GENERATED("sql", ["arg"]).write(sql, args)
+        self.assertEqual(sql, ["generated"])
+        self.assertEqual(args, ["arg"])
+
+    def test_render(self):
+
+        class LEAF(relations_sql.SQL):
+
+            def steps(self, sql, args, **kwargs):
+                sql.append(f"leaf{kwargs['count']}")
+
+        class NODE(relations_sql.SQL):
+
+            def steps(self, sql, args, count=0, **kwargs):
+
+                if count > 2000:
+                    return ["LEAF", (LEAF(), {"count": count}), (relations_sql.SQL("sql", ["arg"]), {})]
+
+                return ["(", (NODE(), {"count": count + 1}), ")", lambda sql: sql.append("!") if count == 0 else None]
+
+        sql = []
+        args = []
+
+        NODE().render(sql, args)
+        self.assertEqual("".join(sql), f"{'(' * 2001}LEAFleaf2001sql{')' * 2001}!")
+        self.assertEqual(args, ["arg"])